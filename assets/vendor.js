@@ -0,0 +1,13 @@
+// Copy the browser builds of third-party scripts next to the stylesheet, so nothing loads from a CDN.
+const fs = require("fs");
+const path = require("path");
+
+const root = path.join(__dirname, "..");
+const target = path.join(root, "tracker", "static", "tracker", "build", "flatpickr");
+const source = path.join(root, "node_modules", "flatpickr", "dist");
+
+fs.mkdirSync(target, { recursive: true });
+for (const name of ["flatpickr.min.js", "flatpickr.min.css"]) {
+  fs.copyFileSync(path.join(source, name), path.join(target, name));
+  console.log(`Copied ${name} to ${path.relative(root, target)}`);
+}
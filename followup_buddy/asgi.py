@@ -2,6 +2,8 @@
 ASGI config for followup_buddy project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with ``uvicorn followup_buddy.asgi:application`` or with
+``gunicorn followup_buddy.asgi:application -k uvicorn_worker.UvicornWorker``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
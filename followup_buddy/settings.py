@@ -48,12 +48,14 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'tracker.middleware.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'tracker.middleware.ReplicaRoutingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -85,12 +87,38 @@ WSGI_APPLICATION = 'followup_buddy.wsgi.application'
 # Database configuration for Heroku deployment
 DATABASE_URL = os.getenv('DATABASE_URL')
 
+# PostgreSQL: with DATABASE_POOL=True each process keeps a psycopg pool of connections
+# (needs psycopg-pool) instead of one persistent connection per thread. Size the pools so
+# workers x DATABASE_POOL_MAX_SIZE stays under the server's connection limit.
+DATABASE_POOL = os.getenv('DATABASE_POOL', 'False').lower() == 'true'
+DATABASE_POOL_OPTIONS = {
+    'min_size': int(os.getenv('DATABASE_POOL_MIN_SIZE', '1')),
+    'max_size': int(os.getenv('DATABASE_POOL_MAX_SIZE', '4')),
+    'timeout': float(os.getenv('DATABASE_POOL_TIMEOUT', '10')),
+}
+
+# SQLite: WAL lets readers run alongside the writer, IMMEDIATE transactions take the write
+# lock up front and the timeout makes a writer wait that many seconds for it, so concurrent
+# workers queue up instead of failing with "database is locked". The pragmas are per connection.
+SQLITE_OPTIONS = {
+    'transaction_mode': 'IMMEDIATE',
+    'timeout': float(os.getenv('SQLITE_BUSY_TIMEOUT', '20')),
+    'init_command': (
+        'PRAGMA journal_mode=WAL;'
+        'PRAGMA synchronous=NORMAL;'
+        'PRAGMA mmap_size=134217728;'
+        'PRAGMA cache_size=-20000;'
+        'PRAGMA temp_store=MEMORY;'
+    ),
+}
+
 if DATABASE_URL:
     # Production database (Heroku PostgreSQL)
     DATABASES = {
         'default': dj_database_url.config(
             default=DATABASE_URL,
-            conn_max_age=600,
+            # Django refuses persistent connections alongside a pool
+            conn_max_age=0 if DATABASE_POOL else 600,
             conn_health_checks=True,
         )
     }
@@ -106,6 +134,86 @@ else:
     print("Using SQLite database")
 
 
+def _tune(database):
+    if database['ENGINE'] == 'django.db.backends.sqlite3':
+        database.setdefault('OPTIONS', {}).update(SQLITE_OPTIONS)
+    elif database['ENGINE'] == 'django.db.backends.postgresql' and DATABASE_POOL:
+        database.setdefault('OPTIONS', {})['pool'] = DATABASE_POOL_OPTIONS
+    return database
+
+
+_tune(DATABASES['default'])
+
+# Read replicas: comma separated database URLs, added as replica1, replica2, ... Read-only
+# pages read the tracker tables from one of them (see tracker.routers); a user who just wrote
+# reads from the primary for READ_YOUR_WRITES_SECONDS, which should exceed the replication lag.
+# Locally a copy of db.sqlite3 works as a stand-in: DATABASE_REPLICA_URLS=sqlite:///replica.sqlite3
+DATABASE_REPLICAS = []
+for number, url in enumerate(filter(None, os.getenv('DATABASE_REPLICA_URLS', '').split(',')), 1):
+    replica = _tune(dj_database_url.parse(url.strip(), conn_max_age=0 if DATABASE_POOL else 600,
+                                          conn_health_checks=True))
+    replica['TEST'] = {'MIRROR': 'default'}
+    DATABASES[f'replica{number}'] = replica
+    DATABASE_REPLICAS.append(f'replica{number}')
+
+DATABASE_ROUTERS = ['tracker.routers.ReplicaRouter']
+READ_YOUR_WRITES_SECONDS = float(os.getenv('READ_YOUR_WRITES_SECONDS', '10'))
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Used for per-user recommendation caching (tracker.cache). No external service is needed:
+# locmem is per-process, so multi-worker deployments should use 'file' or 'database'
+# (the latter needs `python manage.py createcachetable`).
+
+CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'locmem')
+CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'followup-buddy',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('CACHE_LOCATION', os.path.join(BASE_DIR, '.django_cache')),
+    },
+    'database': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': os.getenv('CACHE_LOCATION', 'django_cache'),
+    },
+}
+CACHES = {
+    'default': CACHE_BACKENDS[CACHE_BACKEND],
+}
+
+
+# Sessions and the logged-in user are read on every authenticated request. cached_db sessions
+# are read from the cache and written through to the database (which is still read on a miss);
+# user.backends.CachedModelBackend keeps the user for USER_CACHE_TIMEOUT seconds and drops it
+# whenever the user is saved. Both only work when every worker shares the cache: with the
+# per-process locmem cache a logout or password change would only clear the entries of the worker
+# that served it, so there sessions stay in the database and the backend does not cache users.
+# That saves a database query per lookup only with a memory cache; with CACHE_BACKEND=database
+# (as app.json sets) each lookup is a query on the cache table instead.
+SESSION_ENGINE = os.getenv(
+    'SESSION_ENGINE',
+    'django.contrib.sessions.backends.' + ('db' if CACHE_BACKEND == 'locmem' else 'cached_db'),
+)
+AUTHENTICATION_BACKENDS = [
+    'user.backends.CachedModelBackend',
+    # Sessions store the backend that logged them in: keeps sessions from before the cached
+    # backend valid (their users are fetched uncached until they log in again)
+    'django.contrib.auth.backends.ModelBackend',
+]
+USER_CACHE_TIMEOUT = int(os.getenv('USER_CACHE_TIMEOUT', '300'))
+
+
+# Request performance metrics (tracker.middleware.PerformanceMiddleware)
+# Sampled requests get a Server-Timing header and feed the per-view histograms
+# staff can scrape in Prometheus format at /stats/metrics/.
+PERFORMANCE_SAMPLE_RATE = float(os.getenv('PERFORMANCE_SAMPLE_RATE', '1.0'))
+PERFORMANCE_SERVER_TIMING = os.getenv('PERFORMANCE_SERVER_TIMING', 'True').lower() == 'true'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -163,8 +271,21 @@ LOGIN_URL = "login"
 LOGIN_REDIRECT_URL = "home"
 LOGOUT_REDIRECT_URL = "home"
 
-# WhiteNoise configuration for static files
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# Static files are served by WhiteNoise. Outside DEBUG, collectstatic writes content-hashed copies
+# plus brotli (with the Brotli package) and gzip versions, served with far-future immutable cache
+# headers; DEBUG serves the app directories as they are, so no collectstatic run is needed.
+# The stylesheet bundle is built with `npm run build` (see tracker/templatetags/tracker_assets.py).
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'django.contrib.staticfiles.storage.StaticFilesStorage' if DEBUG
+            else 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+        ),
+    },
+}
 
 # Security settings for production
 if not DEBUG:
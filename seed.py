@@ -20,16 +20,28 @@ Environment variables (optional):
 	SEED_PAST_DAYS=90                # Randomize evangelism date within this many past days
 	SEED_CLEAR=false                 # If 'true', will delete existing Evangelism & FollowUp first
 
+	Bulk / high-volume mode (for load testing):
+	SEED_BULK=false                  # If 'true', build rows in memory and insert them with bulk_create
+	SEED_USERS=1                     # Evangelist users to seed (extra ones are named <username>-2, -3, ...)
+	SEED_PROCESSES=1                 # Worker processes; users are spread across them
+	SEED_BATCH_SIZE=5000             # Evangelisms per bulk_create batch / transaction
+
 Idempotency:
 	Without SEED_CLEAR the script only adds new evangelisms until the count
 	of existing (for the evangelist) >= SEED_EVANGELISMS. Names are generated
 	uniquely per run to avoid constraint collisions.
+
+Bulk mode example (1M evangelisms, ~3M followups across 10 users):
+	SEED_BULK=true SEED_USERS=10 SEED_EVANGELISMS=100000 SEED_PROCESSES=4 python seed.py
+	Several processes only help on PostgreSQL; SQLite serializes writers.
 """
 
 import os
 import sys
+import time
 import random
 import datetime
+import multiprocessing
 import django
 from django.core.exceptions import ImproperlyConfigured
 
@@ -89,6 +101,23 @@ def create_evangelist_user(
 	return user
 
 
+def clear_tracker_data():
+	"""Delete every Evangelism & FollowUp (and the daily activity rollup) with plain DELETE statements.
+
+	QuerySet.delete() loads each row to send signals, which does not scale to
+	millions of rows; cached per-user results are dropped instead.
+	"""
+	from tracker.models import DailyActivity, Evangelism, FollowUp
+	from django.core.cache import cache
+	from django.db import connection, transaction
+
+	print("[seed] Clearing existing Evangelism & FollowUp data ...")
+	with transaction.atomic(), connection.cursor() as cursor:
+		for model in (FollowUp, Evangelism, DailyActivity):
+			cursor.execute(f"DELETE FROM {connection.ops.quote_name(model._meta.db_table)}")
+	cache.clear()
+
+
 def seed_tracker_data(
 	evangelist,
 	target_evangelisms: int = 25,
@@ -145,7 +174,6 @@ def seed_tracker_data(
 			description = fake.paragraph(nb_sentences=3)
 			course = fake.word().title() if random.random() < 0.6 else None
 			location = fake.city()
-			# Relevance auto-set in save() based on faith.
 			e = Evangelism(
 				evangelist=evangelist,
 				person_name=person_name,
@@ -154,7 +182,6 @@ def seed_tracker_data(
 				date=ev_date,
 				description=description,
 				faith=faith,
-				relevance=0,  # placeholder; model save() recalculates
 				completed=False,
 			)
 			e.save()
@@ -195,6 +222,163 @@ def seed_tracker_data(
 	)
 
 
+def _name_pool(fake, size):
+	"""Pre-generate name parts once; combining them is much faster than fake.name() per row."""
+	return [fake.first_name() for _ in range(size)], [fake.last_name() for _ in range(size)]
+
+
+def _unique_names(first_names, last_names, taken):
+	"""Yield person names not in ``taken`` (updated in place), without touching the database."""
+	while True:
+		base_name = f"{random.choice(first_names)} {random.choice(last_names)}"
+		person_name = base_name
+		attempt = 1
+		while person_name in taken:
+			attempt += 1
+			person_name = f"{base_name} #{attempt}"
+		taken.add(person_name)
+		yield person_name
+
+
+def seed_tracker_data_bulk(
+	evangelist,
+	target_evangelisms: int = 25,
+	followups_min: int = 0,
+	followups_max: int = 5,
+	past_days: int = 90,
+	batch_size: int = 5000,
+):
+	"""High-volume variant of seed_tracker_data built on bulk_create.
+
+	Rows are generated in memory batch by batch: names are de-duplicated
+	against a set loaded once, the denormalized follow-up stats are computed
+	up front (Evangelism.save() is never called; the database derives
+	relevance), and each batch is inserted in its own transaction.
+
+	Returns the number of (evangelisms, followups) created.
+	"""
+	from tracker.models import Evangelism, FollowUp
+	from faker import Faker
+	from django.db import transaction
+
+	fake = Faker()
+	FOLLOWUP_TARGET = 7  # Mirror constant in utils (avoid import side-effects)
+
+	taken = set(Evangelism.objects.filter(evangelist=evangelist).values_list("person_name", flat=True))
+	remaining = target_evangelisms - len(taken)
+	if remaining <= 0:
+		print(f"[seed] {evangelist.username}: evangelism count ({len(taken)}) already >= target ({target_evangelisms}); skipping.")
+		return 0, 0
+
+	faith_keys = list(Evangelism.FAITH_STATUS)
+	first_names, last_names = _name_pool(fake, 500)
+	names = _unique_names(first_names, last_names, taken)
+	descriptions = [fake.paragraph(nb_sentences=3) for _ in range(200)]
+	sentences = [fake.sentence() for _ in range(200)]
+	courses = [fake.word().title() for _ in range(50)]
+	cities = [fake.city() for _ in range(200)]
+	today = datetime.date.today()
+
+	created_evangelisms = created_followups = 0
+	started = time.perf_counter()
+	while created_evangelisms < remaining:
+		size = min(batch_size, remaining - created_evangelisms)
+		evangelisms, followup_dates = [], []
+		for _ in range(size):
+			ev_date = today - datetime.timedelta(days=random.randint(0, past_days))
+			n_followups = random.randint(followups_min, followups_max)
+			# Same date distribution as seed_tracker_data, minus future-dated followups
+			dates = sorted(
+				d for d in {
+					ev_date + datetime.timedelta(days=random.randint(1, max(1, past_days - (today - ev_date).days + 1)))
+					for _ in range(n_followups)
+				}
+				if d <= today
+			)
+			faith = random.choice(faith_keys)
+			evangelisms.append(Evangelism(
+				evangelist=evangelist,
+				person_name=next(names),
+				course=random.choice(courses) if random.random() < 0.6 else None,
+				location=random.choice(cities),
+				date=ev_date,
+				description=random.choice(descriptions),
+				faith=faith,
+				completed=len(dates) >= FOLLOWUP_TARGET,
+				followup_count=len(dates),
+				last_followup_date=dates[-1] if dates else None,
+			))
+			followup_dates.append(dates)
+
+		with transaction.atomic():
+			Evangelism.objects.bulk_create(evangelisms)
+			followups = [
+				FollowUp(evangelism=e, description=random.choice(sentences), date=d)
+				for e, dates in zip(evangelisms, followup_dates)
+				for d in dates
+			]
+			# Stats were computed above, so skip the per-batch refresh query
+			FollowUp.objects.bulk_create(followups, batch_size=batch_size, refresh_stats=False)
+
+		created_evangelisms += len(evangelisms)
+		created_followups += len(followups)
+		elapsed = time.perf_counter() - started
+		rate = (created_evangelisms + created_followups) / elapsed if elapsed else 0
+		print(
+			f"[seed] {evangelist.username}: {created_evangelisms}/{remaining} evangelisms, "
+			f"{created_followups} followups ({rate:,.0f} rows/s)"
+		)
+
+	return created_evangelisms, created_followups
+
+
+def _seed_users_worker(job):
+	"""Process entry point for bulk mode: seed every username in ``job``."""
+	usernames, password, params = job
+	setup_django()
+	from django.db import connections
+	connections.close_all()  # never share a connection inherited from the parent
+
+	totals = [0, 0]
+	for username in usernames:
+		user = create_evangelist_user(
+			username=username,
+			email=f"{username}@example.com",
+			password=password,
+			make_staff=False,
+		)
+		made = seed_tracker_data_bulk(evangelist=user, **params)
+		totals[0] += made[0]
+		totals[1] += made[1]
+	return totals
+
+
+def seed_bulk(usernames, password, processes: int = 1, **params):
+	"""Seed many evangelist users in bulk mode, optionally spread over several processes."""
+	started = time.perf_counter()
+	processes = max(1, min(processes, len(usernames)))
+	jobs = [(usernames[i::processes], password, params) for i in range(processes)]
+	if processes == 1:
+		results = [_seed_users_worker(jobs[0])]
+	else:
+		from django.db import connections
+		connections.close_all()
+		with multiprocessing.Pool(processes) as pool:
+			results = pool.map(_seed_users_worker, jobs)
+
+	evangelisms = sum(r[0] for r in results)
+	followups = sum(r[1] for r in results)
+	# Fresh table statistics for the query planner and the admin's estimated counts
+	from django.db import connection
+	with connection.cursor() as cursor:
+		cursor.execute("ANALYZE")
+	elapsed = time.perf_counter() - started
+	print(
+		f"[seed] Bulk mode created {evangelisms} evangelisms and {followups} followups for "
+		f"{len(usernames)} users in {elapsed:.1f}s ({(evangelisms + followups) / max(elapsed, 1e-9):,.0f} rows/s)."
+	)
+
+
 def main():
 	print("[seed] Starting seeding process...")
 	setup_django()
@@ -232,10 +416,36 @@ def main():
 	past_days = int(os.getenv("SEED_PAST_DAYS", "90"))
 	clear = os.getenv("SEED_CLEAR", "false").lower() in {"1", "true", "yes"}
 
+	bulk = os.getenv("SEED_BULK", "false").lower() in {"1", "true", "yes"}
+	users = int(os.getenv("SEED_USERS", "1"))
+	processes = int(os.getenv("SEED_PROCESSES", "1"))
+	batch_size = int(os.getenv("SEED_BATCH_SIZE", "5000"))
+
 	# Sanity adjustments
 	if followups_min > followups_max:
 		followups_min, followups_max = followups_max, followups_min
 
+	if bulk:
+		if clear:
+			clear_tracker_data()
+		usernames = [username] + [f"{username}-{i}" for i in range(2, users + 1)]
+		try:
+			seed_bulk(
+				usernames,
+				password,
+				processes=processes,
+				target_evangelisms=target_evangelisms,
+				followups_min=followups_min,
+				followups_max=followups_max,
+				past_days=past_days,
+				batch_size=batch_size,
+			)
+		except Exception as e:
+			print(f"[seed] Error while bulk seeding tracker data: {e}")
+			sys.exit(1)
+		print("[seed] Done.")
+		return
+
 	try:
 		seed_tracker_data(
 			evangelist=evangelist,
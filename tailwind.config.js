@@ -0,0 +1,13 @@
+// Only the classes used in these files end up in tracker/static/tracker/build/app.css.
+// Same default theme as the Play CDN the templates were written against.
+module.exports = {
+  content: [
+    "./tracker/templates/**/*.html",
+    "./user/templates/**/*.html",
+    "./tracker/templatetags/*.py",
+  ],
+  theme: {
+    extend: {},
+  },
+  plugins: [],
+};
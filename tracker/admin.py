@@ -1,38 +1,56 @@
 from django.contrib import admin
-from django.db.models import Count, F
+from django.db.models.expressions import RawSQL
 from .models import Evangelism, FollowUp
+from .pagination import EstimatedCountPaginator
+from . import search
 
 @admin.register(Evangelism)
 class EvangelismAdmin(admin.ModelAdmin):
     list_display = ['person_name', 'date', 'location', 'no_followups', 'completed']
+    # Served by evangelism_admin_date_idx / evangelism_admin_faith_idx, filtered or not
+    list_filter = ['faith', 'date']
+    ordering = ['-date', '-id']
+    # No exact COUNT(*) of the table on every page (see tracker.pagination)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     exclude = ['relevance']
     search_fields = ['person_name', 'location']
+    # A <select> of every user/evangelism would grow with the data
+    autocomplete_fields = ['evangelist']
 
     @admin.display(ordering='followup_count')
     def no_followups(self, evangelism):
         return evangelism.followup_count
-    
-    def get_queryset(self, request):
-        return super().get_queryset(request).annotate(
-            followup_count = Count('followups')
-        )
+
+    def get_search_results(self, request, queryset, search_term):
+        # The search index also covers course, description and follow-ups (see tracker.search)
+        match = search.match_sql(search_term)
+        if match is None:
+            return super().get_search_results(request, queryset, search_term)
+        return queryset.filter(pk__in=RawSQL(*match)), False
 
     
 @admin.register(FollowUp)
 class FollowUpAdmin(admin.ModelAdmin):
     list_display = ['person_name', 'met_first_on', 'date']
-    search_fields = ['person_name']
+    list_select_related = ['evangelism']
+    # Newest first by primary key (Django's default), date ranges by followup_date_evangelism_idx
+    list_filter = ['date']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    autocomplete_fields = ['evangelism']
+    search_fields = ['evangelism__person_name']
 
-    @admin.display(ordering='evangelism')
+    def get_search_results(self, request, queryset, search_term):
+        match = search.match_sql(search_term, name_only=True)
+        if match is None:
+            return super().get_search_results(request, queryset, search_term)
+        return queryset.filter(evangelism__in=RawSQL(*match)), False
+
+    @admin.display(ordering='evangelism__person_name')
     def person_name(self, followup):
-        return followup.person_name
+        return followup.evangelism.person_name
     
     @admin.display(ordering='evangelism__date')
     def met_first_on(self, followup):
         return followup.evangelism.date
-    
-    def get_queryset(self, request):
-        return super().get_queryset(request).annotate(
-            person_name = F('evangelism__person_name')
-        )
-        
\ No newline at end of file
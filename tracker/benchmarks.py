@@ -0,0 +1,173 @@
+"""Benchmarks for the tracker views and the recommender at realistic data sizes.
+
+``run_benchmarks`` builds one evangelist per dataset size, then times every
+view through the Django test client, recording median/min wall time, the
+number of SQL queries and peak Python memory. Results are plain dicts so the
+``benchmark`` management command can write them as JSON and compare them to
+a saved baseline with ``find_regressions``.
+"""
+
+import datetime
+import gc
+import random
+import statistics
+import time
+import tracemalloc
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Evangelism, FollowUp
+from .search import search
+from .utils import recommend_activity
+
+
+DEFAULT_SIZES = [10, 1000, 100000]
+BATCH_SIZE = 5000
+FAITHS = list(Evangelism.FAITH_STATUS)
+
+
+def build_dataset(user, size, seed=0, past_days=365):
+    """Bulk-create ``size`` evangelisms (with 0-12 follow-ups each, skewed low) for ``user``."""
+    rng = random.Random(seed)
+    today = timezone.localdate()
+    for start in range(0, size, BATCH_SIZE):
+        with transaction.atomic():
+            evangelisms = []
+            for i in range(start, min(start + BATCH_SIZE, size)):
+                faith = rng.choice(FAITHS)
+                evangelisms.append(Evangelism(
+                    evangelist=user,
+                    person_name=f"Contact {i}",
+                    course=rng.choice([None, "Physics", "Law", "Medicine"]),
+                    location=rng.choice(["Hostel A", "Library", "Chapel", "Market"]),
+                    date=today - datetime.timedelta(days=rng.randint(0, past_days)),
+                    description="Met on campus and talked about faith.",
+                    faith=faith,
+                    completed=rng.random() < 0.2,
+                ))
+            Evangelism.objects.bulk_create(evangelisms)
+
+            followups = []
+            for evangelism in evangelisms:
+                for _ in range(min(12, int(rng.expovariate(0.3)))):
+                    gap = (today - evangelism.date).days
+                    followups.append(FollowUp(
+                        evangelism=evangelism,
+                        description="Checked in.",
+                        date=evangelism.date + datetime.timedelta(days=rng.randint(0, gap)),
+                    ))
+            FollowUp.objects.bulk_create(followups, batch_size=BATCH_SIZE)
+
+
+def _targets(user):
+    """Return (name, callable) pairs to benchmark for one user."""
+    client = Client()
+    client.force_login(user)
+    today = timezone.localdate()
+    busiest = Evangelism.objects.filter(evangelist=user).order_by("-followup_count").first()
+
+    def get(url, clear_cache=False):
+        def request():
+            if clear_cache:
+                cache.clear()
+            response = client.get(url)
+            assert response.status_code == 200, f"{url} returned {response.status_code}"
+            if hasattr(response, "render") and not response.is_rendered:
+                response.render()
+        return request
+
+    targets = [
+        ("recommend_activity", lambda: recommend_activity(user)),
+        ("home", get(reverse("home"), clear_cache=True)),
+        ("home_cached", get(reverse("home"))),
+        ("calendar", get(reverse("activity_calendar", args=[today.year, today.month]))),
+        ("listing", get(reverse("evangelism-listing"))),
+        ("activities", get(f"{reverse('activities')}?date={today.isoformat()}")),
+        # A typo, so the fuzzy half of the search runs too
+        ("search", lambda: search(user, "Contcat 42 library")),
+        ("search_page", get(f"{reverse('search')}?q=library")),
+    ]
+    if busiest:
+        targets.append(("detail", get(reverse("evangelism-detail", args=[busiest.pk]))))
+    return targets
+
+
+def measure(func, repeat=5):
+    """Time ``func`` and return median/min milliseconds, query count and peak memory."""
+    func()  # warm up (template loading, caches, session)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    connection.queries_log.clear()  # a full log (DEBUG=True) would hide new queries
+    with CaptureQueriesContext(connection) as queries:
+        func()
+    query_count = len(queries.captured_queries)  # read now: the next request resets the log
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "min_ms": round(min(timings), 3),
+        "queries": query_count,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def run_benchmarks(sizes=None, repeat=5, log=None):
+    """Build a dataset per size and benchmark every target; returns a list of result dicts."""
+    User = get_user_model()
+    results = []
+    for size in sizes or DEFAULT_SIZES:
+        user, _ = User.objects.get_or_create(username=f"bench-{size}")
+        if not Evangelism.objects.filter(evangelist=user).exists():
+            started = time.perf_counter()
+            build_dataset(user, size)
+            if log:
+                log(f"Built dataset of {size} evangelisms in {time.perf_counter() - started:.1f}s")
+        for name, func in _targets(user):
+            result = {"size": size, "target": name, **measure(func, repeat=repeat)}
+            results.append(result)
+            if log:
+                log(
+                    f"{size:>8} {name:<20} {result['median_ms']:>10.2f} ms {result['queries']:>5} queries "
+                    f"{result['peak_kib']:>10.1f} KiB"
+                )
+    return results
+
+
+def find_regressions(results, baseline, threshold=0.25, min_ms=1.0):
+    """Compare results against a baseline list; return human readable regression messages.
+
+    A target regresses when its median time grows by more than ``threshold``
+    (ignoring differences under ``min_ms``) or when it runs more queries.
+    """
+    previous = {(r["size"], r["target"]): r for r in baseline}
+    regressions = []
+    for result in results:
+        before = previous.get((result["size"], result["target"]))
+        if before is None:
+            continue
+        label = f"{result['target']} @ {result['size']}"
+        allowed_ms = before["median_ms"] * (1 + threshold)
+        if result["median_ms"] > allowed_ms and result["median_ms"] - before["median_ms"] >= min_ms:
+            regressions.append(
+                f"{label}: {result['median_ms']:.2f} ms vs baseline {before['median_ms']:.2f} ms"
+            )
+        if result["queries"] > before["queries"]:
+            regressions.append(f"{label}: {result['queries']} queries vs baseline {before['queries']}")
+    return regressions
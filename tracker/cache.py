@@ -0,0 +1,142 @@
+"""Per-user caching of derived tracker data (recommendations, home counters).
+
+Cache keys embed a per-user *data version* and the current local date, so an
+entry is never invalidated explicitly: any Evangelism/FollowUp write bumps the
+owner's version once it has committed (see the models and signals.py), and the
+date rolls over on its own. Only Django's cache API is used, so locmem, file-based and
+database caches all work.
+"""
+
+import datetime
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+
+
+VERSION_KEY = "tracker:data-version:{user_id}"
+ENTRY_KEY = "tracker:{name}:{user_id}:{version}:{date}"
+ENTRY_TIMEOUT = 60 * 60 * 24  # entries are keyed by date, so they are useless after a day
+
+_MISSING = object()
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def get_data_version(user_id) -> int:
+    """Return the current data version for a user, creating one if the cache has none."""
+    version = cache.get(VERSION_KEY.format(user_id=user_id))
+    if version is None:
+        version = bump_data_version(user_id)
+    return version
+
+
+async def aget_data_version(user_id) -> int:
+    """Async version of get_data_version."""
+    version = await cache.aget(VERSION_KEY.format(user_id=user_id))
+    if version is None:
+        version = await abump_data_version(user_id)
+    return version
+
+
+def bump_data_version(*user_ids) -> int:
+    """Mark the cached data of the given users as stale.
+
+    Versions are nanosecond timestamps, so they also tell when the data last changed.
+    """
+    version = time.time_ns()
+    cache.set_many(
+        {VERSION_KEY.format(user_id=user_id): version for user_id in user_ids if user_id is not None},
+        timeout=None,
+    )
+    return version
+
+
+def bump_data_version_on_commit(*user_ids):
+    """bump_data_version once the current transaction commits (right away outside one).
+
+    Call it after a write's last statement, follow-up stats included: a reader
+    that sees the new version must also see the data it describes, or it
+    caches stale results under the new version.
+    """
+    user_ids = set(user_ids)
+    transaction.on_commit(lambda: bump_data_version(*user_ids))
+
+
+async def abump_data_version(*user_ids) -> int:
+    """Async version of bump_data_version."""
+    version = time.time_ns()
+    await cache.aset_many(
+        {VERSION_KEY.format(user_id=user_id): version for user_id in user_ids if user_id is not None},
+        timeout=None,
+    )
+    return version
+
+
+async def adata_validators(user_id, *parts):
+    """Return (ETag, Last-Modified) for the user's current data, for conditional GETs.
+
+    The ETag changes whenever the user's data does; ``parts`` name the variant
+    (e.g. a date range). Last-Modified is when the data last changed, as an
+    aware UTC datetime.
+    """
+    version = await aget_data_version(user_id)
+    etag = "-".join(str(part) for part in (user_id, version, *parts))
+    return etag, datetime.datetime.fromtimestamp(version / 1e9, tz=datetime.timezone.utc)
+
+
+def cached_for_user(user, name, compute):
+    """Return ``compute()`` for a user, cached until their data changes or the local date rolls over."""
+    key = ENTRY_KEY.format(
+        name=name,
+        user_id=user.pk,
+        version=get_data_version(user.pk),
+        date=timezone.localdate().isoformat(),
+    )
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        _record("hits")
+        return value
+
+    _record("misses")
+    value = compute()
+    cache.set(key, value, ENTRY_TIMEOUT)
+    return value
+
+
+async def acached_for_user(user, name, compute):
+    """Async version of cached_for_user; ``compute`` is a coroutine function."""
+    key = ENTRY_KEY.format(
+        name=name,
+        user_id=user.pk,
+        version=await aget_data_version(user.pk),
+        date=timezone.localdate().isoformat(),
+    )
+    value = await cache.aget(key, _MISSING)
+    if value is not _MISSING:
+        _record("hits")
+        return value
+
+    _record("misses")
+    value = await compute()
+    await cache.aset(key, value, ENTRY_TIMEOUT)
+    return value
+
+
+def _record(outcome):
+    with _stats_lock:
+        _stats[outcome] += 1
+
+
+def cache_stats() -> dict:
+    """Return hit/miss counters for this process."""
+    with _stats_lock:
+        hits, misses = _stats["hits"], _stats["misses"]
+    lookups = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / lookups, 4) if lookups else None,
+    }
@@ -0,0 +1,133 @@
+"""Streaming export of evangelisms and follow-ups as CSV or JSONL.
+
+``export_rows`` walks one query - evangelisms LEFT JOINed to their follow-ups,
+ordered so each evangelism comes right before its follow-ups - with
+``QuerySet.iterator``, so memory stays flat however many rows a user has.
+``StreamEncoder`` turns those rows into CSV or JSONL bytes, optionally
+gzipped on the fly, in chunks of about ``CHUNK_SIZE`` bytes for a
+StreamingHttpResponse or a file.
+
+The columns are the ones tracker.importer reads, so an export can be imported
+again with ``manage.py import_tracker``.
+"""
+
+import csv
+import io
+import json
+import zlib
+
+from .models import Evangelism
+
+
+FORMATS = ("csv", "jsonl")
+COLUMNS = ["type", "evangelist", "person_name", "course", "location", "date", "faith", "completed", "description"]
+CHUNK_SIZE = 64 * 1024
+QUERY_CHUNK_SIZE = 2000
+
+_FIELDS = [
+    "pk", "evangelist__username", "person_name", "course", "location", "date", "faith", "completed",
+    "description", "followups__pk", "followups__date", "followups__description",
+]
+
+
+def _export_queryset(user=None):
+    queryset = Evangelism.objects.all() if user is None else Evangelism.objects.filter(evangelist=user)
+    # values(), not values_list(): the latter runs its query as soon as aiterator() builds it, in the event loop
+    return queryset.order_by("evangelist_id", "date", "pk", "followups__date", "followups__pk").values(*_FIELDS)
+
+
+class _RowSplitter:
+    """Turn joined (evangelism, follow-up) result rows into export rows, emitting each evangelism once."""
+
+    def __init__(self):
+        self.last_pk = None
+
+    def __call__(self, values):
+        username, person_name = values["evangelist__username"], values["person_name"]
+        rows = []
+        if values["pk"] != self.last_pk:
+            self.last_pk = values["pk"]
+            rows.append(["evangelism", username, person_name, values["course"], values["location"],
+                         values["date"].isoformat(), values["faith"], values["completed"], values["description"]])
+        if values["followups__pk"] is not None:
+            rows.append(["followup", username, person_name, None, None, values["followups__date"].isoformat(),
+                         None, None, values["followups__description"]])
+        return rows
+
+
+def export_rows(user=None):
+    """Yield the export rows (lists in COLUMNS order) of one user, or of everyone."""
+    split = _RowSplitter()
+    for values in _export_queryset(user).iterator(chunk_size=QUERY_CHUNK_SIZE):
+        yield from split(values)
+
+
+async def aexport_rows(user=None):
+    """Async version of export_rows."""
+    split = _RowSplitter()
+    async for values in _export_queryset(user).aiterator(chunk_size=QUERY_CHUNK_SIZE):
+        for row in split(values):
+            yield row
+
+
+class StreamEncoder:
+    """Encode export rows as CSV or JSONL bytes, buffered into chunks and optionally gzipped.
+
+    ``encode`` returns the bytes ready to send (often b"" while a chunk fills
+    up); ``finish`` returns whatever is left and must be called once at the end.
+    """
+
+    def __init__(self, format="csv", compress=False, chunk_size=CHUNK_SIZE):
+        if format not in FORMATS:
+            raise ValueError(f"Unknown format {format!r}; expected one of {', '.join(FORMATS)}.")
+        self.format = format
+        self.chunk_size = chunk_size
+        # wbits=31: a gzip container, not a bare zlib stream
+        self._compressor = zlib.compressobj(wbits=31) if compress else None
+        self._buffer = io.StringIO()
+        self._csv = csv.writer(self._buffer)
+        if format == "csv":
+            self._csv.writerow(COLUMNS)
+
+    def encode(self, row):
+        if self.format == "csv":
+            self._csv.writerow(["" if value is None else value for value in row])
+        else:
+            self._buffer.write(json.dumps(dict(zip(COLUMNS, row))) + "\n")
+        if self._buffer.tell() < self.chunk_size:
+            return b""
+        return self._drain()
+
+    def finish(self):
+        data = self._drain()
+        if self._compressor is not None:
+            data += self._compressor.flush()
+        return data
+
+    def _drain(self):
+        data = self._buffer.getvalue().encode()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        if self._compressor is not None:
+            data = self._compressor.compress(data)
+        return data
+
+
+def stream_export(user=None, format="csv", compress=False):
+    """Yield the encoded export in chunks."""
+    encoder = StreamEncoder(format, compress)
+    for row in export_rows(user):
+        chunk = encoder.encode(row)
+        if chunk:
+            yield chunk
+    yield encoder.finish()
+
+
+async def astream_export(user=None, format="csv", compress=False):
+    """Async version of stream_export."""
+    encoder = StreamEncoder(format, compress)
+    async for row in aexport_rows(user):
+        chunk = encoder.encode(row)
+        if chunk:
+            yield chunk
+    yield encoder.finish()
@@ -1,5 +1,6 @@
 from django import forms
 from .models import FollowUp, Evangelism
+from .utils import decode_cursor
 
 
 class FollowUpForm(forms.ModelForm):
@@ -33,4 +34,37 @@ class EvangelismForm(forms.ModelForm):
                   "date", 
                   "description", 
                   "faith",
-                  "completed"]
\ No newline at end of file
+                  "completed"]
+
+
+class EvangelismFilterForm(forms.Form):
+    STATUS_CHOICES = [("", "All"), ("ongoing", "Ongoing"), ("completed", "Completed")]
+
+    faith = forms.ChoiceField(choices=[("", "All")] + list(Evangelism.FAITH_STATUS.items()), required=False)
+    status = forms.ChoiceField(choices=STATUS_CHOICES, required=False)
+    start = forms.DateField(required=False)
+    end = forms.DateField(required=False)
+    cursor = forms.CharField(required=False)
+
+    def clean_cursor(self):
+        cursor = self.cleaned_data["cursor"]
+        if cursor:
+            try:
+                decode_cursor(cursor)
+            except ValueError:
+                raise forms.ValidationError("Invalid cursor.")
+        return cursor
+
+    def filter(self, queryset):
+        """Apply the valid filters to an Evangelism queryset (invalid ones are ignored)."""
+        self.is_valid()  # fills cleaned_data with every field that did validate
+        data = self.cleaned_data
+        if data.get("faith"):
+            queryset = queryset.filter(faith=data["faith"])
+        if data.get("status"):
+            queryset = queryset.filter(completed=data["status"] == "completed")
+        if data.get("start"):
+            queryset = queryset.filter(date__gte=data["start"])
+        if data.get("end"):
+            queryset = queryset.filter(date__lte=data["end"])
+        return queryset
@@ -0,0 +1,319 @@
+"""Streaming bulk import of evangelisms and follow-ups from CSV or JSONL.
+
+Rows are read one at a time and handled in batches of ``batch_size``: each
+batch is validated in Python, its evangelists and evangelisms are resolved
+with a query or two for the whole batch (remembered in memory for later
+batches), and it is written with bulk_create inside its own transaction.
+Memory use depends on the batch size, not the file size, and a bad row is
+reported and skipped without aborting the rest of the file.
+
+Each row is an evangelism or a follow-up, as given by its ``type`` column (or
+the importer's default kind). Both name their evangelist by username
+(``evangelist`` column, or the default user) and the person by
+``person_name``; a follow-up is attached to that evangelist's evangelism of
+the person, which must already exist or come earlier in the file. An
+evangelism that already exists is skipped, or updated with
+``on_conflict="update"``; an update only writes the columns the row gives,
+so a file without (or with an empty) ``faith`` column leaves faith alone.
+``completed`` accepts true/false, yes/no, on/off, t/f, y/n and 1/0.
+"""
+
+import csv
+import json
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
+
+from .models import Evangelism, FollowUp
+
+
+KINDS = ("evangelism", "followup")
+FORMATS = ("csv", "jsonl")
+EVANGELISM_FIELDS = ["person_name", "course", "location", "date", "description", "faith", "completed"]
+FOLLOWUP_FIELDS = ["date", "description"]
+# Columns written when an existing evangelism is updated, if the row gives them (the database derives relevance from faith)
+UPDATE_FIELDS = ["course", "location", "date", "description", "faith", "completed"]
+TRUE_VALUES = {"1", "true", "t", "yes", "y", "on"}
+FALSE_VALUES = {"0", "false", "f", "no", "n", "off"}
+DEFAULT_BATCH_SIZE = 1000
+# Remembered (evangelist, person_name) -> evangelism id entries before the lookup is reset
+LOOKUP_LIMIT = 100_000
+
+
+@dataclass
+class RowError:
+    line: int
+    message: str
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    evangelisms: int = 0  # inserted
+    existing: int = 0  # evangelisms already in the database (skipped or updated)
+    followups: int = 0
+    errors: int = 0
+    duration: float = 0.0
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.duration if self.duration else 0.0
+
+
+def read_rows(file, format):
+    """Yield (line number, row dict) from a CSV or JSONL file object, one row at a time.
+
+    A JSONL line that is not a JSON object is yielded as a ValueError instead
+    of a dict, so the caller can report it and carry on.
+    """
+    if format == "csv":
+        reader = csv.DictReader(file)
+        for row in reader:
+            yield reader.line_num, row
+    elif format == "jsonl":
+        for line_number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError as e:
+                row = ValueError(f"Invalid JSON: {e}")
+            if not isinstance(row, (dict, ValueError)):
+                row = ValueError("Expected a JSON object.")
+            yield line_number, row
+    else:
+        raise ValueError(f"Unknown format {format!r}; expected one of {', '.join(FORMATS)}.")
+
+
+def _boolean(value):
+    """A CSV or JSON boolean cell as a bool."""
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise ValidationError({"completed": f"{value!r} is not a boolean (use true/false, yes/no or 1/0)."})
+
+
+def _message(error):
+    if isinstance(error, ValidationError) and hasattr(error, "error_dict"):
+        return "; ".join(f"{field}: {' '.join(messages)}" for field, messages in error.message_dict.items())
+    if isinstance(error, ValidationError):
+        return " ".join(error.messages)
+    return str(error)
+
+
+class Importer:
+    """Import rows in bounded batches; see the module docstring.
+
+    ``on_error`` is called with a RowError for every rejected row and
+    ``on_batch`` with the running ImportResult after every batch.
+    """
+
+    def __init__(self, batch_size=DEFAULT_BATCH_SIZE, default_user=None, default_kind=None,
+                 on_conflict="skip", on_error: Optional[Callable] = None, on_batch: Optional[Callable] = None):
+        if on_conflict not in ("skip", "update"):
+            raise ValueError("on_conflict must be 'skip' or 'update'")
+        self.batch_size = batch_size
+        self.default_user = default_user
+        self.default_kind = default_kind
+        self.on_conflict = on_conflict
+        self.on_error = on_error
+        self.on_batch = on_batch
+        self.result = ImportResult()
+        self._users: Dict[str, int] = {}
+        self._evangelisms: Dict[Tuple[int, str], int] = {}
+        if default_user is not None:
+            self._users[default_user.get_username()] = default_user.pk
+
+    def run(self, rows) -> ImportResult:
+        """Import every (line number, row) pair, e.g. from read_rows."""
+        started = time.perf_counter()
+        batch = []
+        for line, row in rows:
+            self.result.rows += 1
+            batch.append((line, row))
+            if len(batch) >= self.batch_size:
+                self._import_batch(batch)
+                batch = []
+                self.result.duration = time.perf_counter() - started
+                if self.on_batch:
+                    self.on_batch(self.result)
+        if batch:
+            self._import_batch(batch)
+        self.result.duration = time.perf_counter() - started
+        return self.result
+
+    def _error(self, line, error):
+        self.result.errors += 1
+        if self.on_error:
+            self.on_error(RowError(line, _message(error)))
+
+    def _import_batch(self, batch):
+        self._resolve_users(row for _, row in batch if isinstance(row, dict))
+        evangelisms, followups, duplicates = self._validate(batch)
+        try:
+            with transaction.atomic():
+                inserted, existing = self._save_evangelisms(evangelisms)
+                saved, unresolved = self._save_followups(followups)
+        except DatabaseError as e:
+            # The batch was rolled back: every row of it failed, and the lookup may hold its ids
+            self._evangelisms.clear()
+            for line, *_ in evangelisms + followups:
+                self._error(line, e)
+            return
+
+        self.result.evangelisms += inserted
+        self.result.existing += existing + duplicates
+        self.result.followups += saved
+        for line, (_, person_name) in unresolved:
+            self._error(line, ValidationError(f"No evangelism of {person_name!r} for this evangelist."))
+
+    def _resolve_users(self, rows):
+        missing = {row.get("evangelist") for row in rows} - set(self._users) - {None, ""}
+        if missing:
+            self._users.update(
+                get_user_model().objects.filter(username__in=missing).values_list("username", "pk")
+            )
+
+    def _validate(self, batch):
+        """Turn the batch into unsaved evangelisms and follow-ups, reporting bad rows.
+
+        Evangelisms are (line, object, key, given update fields) and follow-ups
+        (line, object, key). Also returns how many evangelisms repeat an earlier
+        row of the batch.
+        """
+        evangelisms, followups, seen, duplicates = [], [], {}, 0
+        for line, row in batch:
+            if isinstance(row, Exception):
+                self._error(line, row)
+                continue
+            # Empty cells mean "not given", so model defaults apply
+            row = {field: value for field, value in row.items() if value not in ("", None)}
+            kind = row.get("type", self.default_kind)
+            if kind not in KINDS:
+                self._error(line, ValidationError(f"type must be one of {', '.join(KINDS)}, not {kind!r}."))
+                continue
+
+            username = row.get("evangelist") or (self.default_user and self.default_user.get_username())
+            if not username:
+                self._error(line, ValidationError("evangelist is required."))
+                continue
+            if username not in self._users:
+                self._error(line, ValidationError(f"Unknown evangelist {username!r}."))
+                continue
+            person_name = str(row.get("person_name", "")).strip()
+            if not person_name:
+                self._error(line, ValidationError("person_name is required."))
+                continue
+            key = (self._users[username], person_name)
+
+            try:
+                if kind == "evangelism":
+                    if "completed" in row:
+                        row["completed"] = _boolean(row["completed"])
+                    obj = Evangelism(evangelist_id=key[0], **{
+                        field: row[field] for field in EVANGELISM_FIELDS if field in row
+                    })
+                    obj.person_name = person_name
+                    obj.clean_fields(exclude=["evangelist"])
+                else:
+                    obj = FollowUp(**{field: row[field] for field in FOLLOWUP_FIELDS if field in row})
+                    obj.clean_fields(exclude=["evangelism"])
+            except ValidationError as e:
+                self._error(line, e)
+                continue
+
+            if kind == "evangelism":
+                fields = tuple(field for field in UPDATE_FIELDS if field in row)
+            if kind == "evangelism" and key in seen:
+                # Repeated within the batch: treated like a row that already exists
+                duplicates += 1
+                if self.on_conflict == "update":
+                    evangelisms[seen[key]] = (line, obj, key, fields)
+            elif kind == "evangelism":
+                seen[key] = len(evangelisms)
+                evangelisms.append((line, obj, key, fields))
+            else:
+                followups.append((line, obj, key))
+        return evangelisms, followups, duplicates
+
+    def _lookup(self, keys):
+        """Add the ids of existing evangelisms with the given (evangelist id, person name) keys to the lookup."""
+        keys = set(keys) - set(self._evangelisms)
+        if not keys:
+            return
+        if len(self._evangelisms) + len(keys) > LOOKUP_LIMIT:
+            self._evangelisms.clear()
+        rows = Evangelism.objects.filter(
+            evangelist_id__in={user_id for user_id, _ in keys},
+            person_name__in={name for _, name in keys},
+        ).values_list("evangelist_id", "person_name", "pk")
+        self._evangelisms.update(
+            ((user_id, name), pk) for user_id, name, pk in rows if (user_id, name) in keys
+        )
+
+    def _count(self, keys):
+        # Also counts other people sharing a name or an evangelist with the keys; only differences are used
+        return Evangelism.objects.filter(
+            evangelist_id__in={user_id for user_id, _ in keys},
+            person_name__in={name for _, name in keys},
+        ).count()
+
+    def _save_evangelisms(self, evangelisms):
+        """Insert new evangelisms and skip or update existing ones; return (inserted, existing)."""
+        if not evangelisms:
+            return 0, 0
+        self._lookup(key for _, _, key, _ in evangelisms)
+        new = [(obj, key) for _, obj, key, _ in evangelisms if key not in self._evangelisms]
+        existing = [(obj, key, fields) for _, obj, key, fields in evangelisms if key in self._evangelisms]
+
+        inserted = 0
+        if new:
+            # ignore_conflicts skips rows another writer inserted since the lookup, and they do not count
+            keys = [key for _, key in new]
+            before = self._count(keys)
+            Evangelism.objects.bulk_create([obj for obj, _ in new], ignore_conflicts=True)
+            inserted = self._count(keys) - before
+        if existing and self.on_conflict == "update":
+            # Only the columns each row gives are written, so a file without one leaves it alone
+            by_fields = defaultdict(list)
+            for obj, key, fields in existing:
+                if fields:
+                    by_fields[fields].append((obj, key))
+            for fields, rows in by_fields.items():
+                Evangelism.objects.bulk_create(
+                    [obj for obj, _ in rows],
+                    update_conflicts=True,
+                    unique_fields=["evangelist", "person_name"],
+                    update_fields=list(fields),
+                )
+                if "date" in fields:
+                    # last_touch_date depends on the date
+                    Evangelism.objects.filter(
+                        pk__in=[self._evangelisms[key] for _, key in rows]
+                    ).refresh_followup_stats()
+        return inserted, len(evangelisms) - inserted
+
+    def _save_followups(self, followups):
+        """Insert the follow-ups whose evangelism exists; return (saved, unresolved (line, key) pairs)."""
+        if not followups:
+            return 0, []
+        # Evangelisms inserted by this batch are looked up here, with the ones only follow-ups mention
+        self._lookup(key for _, _, key in followups)
+        resolved, unresolved = [], []
+        for line, followup, key in followups:
+            followup.evangelism_id = self._evangelisms.get(key)
+            if followup.evangelism_id is None:
+                unresolved.append((line, key))
+            else:
+                resolved.append(followup)
+        FollowUp.objects.bulk_create(resolved)
+        return len(resolved), unresolved
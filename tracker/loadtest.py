@@ -0,0 +1,166 @@
+"""Concurrent HTTP load test against a running FollowUp Buddy server.
+
+Unlike tracker.benchmarks, which times views in-process through the test
+client, this drives a real server (gunicorn, uvicorn, runserver) over HTTP,
+so the numbers include the server, its workers and the WSGI/ASGI handler.
+``run_load`` keeps ``concurrency`` keep-alive connections busy for
+``duration`` seconds, cycling through the given paths, and reports requests
+per second and latency percentiles. Running it once against the WSGI entry
+point and once against the ASGI one gives a like-for-like comparison.
+
+The client is thread based; on a single machine check that it is not the
+bottleneck (its CPU use should stay well below one core per 1000 req/s).
+"""
+
+import http.client
+import math
+import threading
+import time
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode, urlsplit
+
+
+DEFAULT_PATHS = ["/", "/activity/calendar/", "/activities/?date={today}"]
+
+
+def _connection(base_url, timeout):
+    parts = urlsplit(base_url)
+    cls = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+    return cls(parts.netloc, timeout=timeout)
+
+
+def _cookies(response):
+    cookie = SimpleCookie()
+    for header in response.headers.get_all("Set-Cookie") or []:
+        cookie.load(header)
+    return {name: morsel.value for name, morsel in cookie.items()}
+
+
+def login(base_url, username, password, path="/user/login/", timeout=10):
+    """Log in through the login form and return the Cookie header for the session."""
+    conn = _connection(base_url, timeout)
+    try:
+        conn.request("GET", path)
+        response = conn.getresponse()
+        response.read()
+        cookies = _cookies(response)
+        if "csrftoken" not in cookies:
+            raise RuntimeError(f"GET {path} did not set a CSRF cookie (status {response.status})")
+
+        body = urlencode({
+            "username": username,
+            "password": password,
+            "csrfmiddlewaretoken": cookies["csrftoken"],
+        })
+        conn.request("POST", path, body=body, headers={
+            "Content-Type": "application/x-www-form-urlencoded",
+            "Cookie": f"csrftoken={cookies['csrftoken']}",
+            "Referer": base_url.rstrip("/") + path,
+        })
+        response = conn.getresponse()
+        response.read()
+        cookies.update(_cookies(response))
+    finally:
+        conn.close()
+
+    if "sessionid" not in cookies:
+        raise RuntimeError(f"Login as {username!r} failed (status {response.status})")
+    return "; ".join(f"{name}={value}" for name, value in cookies.items())
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(fraction * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
+
+
+class _Worker(threading.Thread):
+    def __init__(self, base_url, paths, headers, deadline, timeout, offset):
+        super().__init__(daemon=True)
+        self.base_url = base_url
+        self.paths = paths
+        self.headers = headers
+        self.deadline = deadline
+        self.timeout = timeout
+        self.offset = offset
+        self.latencies = []
+        self.errors = 0
+        self.statuses = {}
+
+    def run(self):
+        conn = _connection(self.base_url, self.timeout)
+        i = self.offset
+        while time.perf_counter() < self.deadline:
+            path = self.paths[i % len(self.paths)]
+            i += 1
+            started = time.perf_counter()
+            try:
+                conn.request("GET", path, headers=self.headers)
+                response = conn.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException):
+                self.errors += 1
+                conn.close()
+                conn = _connection(self.base_url, self.timeout)
+                continue
+            self.latencies.append(time.perf_counter() - started)
+            self.statuses[response.status] = self.statuses.get(response.status, 0) + 1
+            if response.status >= 400:
+                self.errors += 1
+        conn.close()
+
+
+def run_load(base_url, paths=None, concurrency=10, duration=10.0, cookie=None, timeout=30):
+    """Hammer ``base_url`` with ``concurrency`` clients for ``duration`` seconds.
+
+    Returns a dict with the request count, errors (failed connections and 4xx/5xx
+    responses), status counts, requests per second and p50/p90/p99/max latency in
+    milliseconds.
+    """
+    paths = paths or DEFAULT_PATHS
+    headers = {"Cookie": cookie} if cookie else {}
+    started = time.perf_counter()
+    workers = [
+        _Worker(base_url, paths, headers, started + duration, timeout, offset)
+        for offset in range(concurrency)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for worker in workers for latency in worker.latencies)
+    statuses = {}
+    for worker in workers:
+        for status, count in worker.statuses.items():
+            statuses[status] = statuses.get(status, 0) + count
+
+    def ms(value):
+        return round(value * 1000, 2) if value is not None else None
+
+    return {
+        "requests": len(latencies),
+        "errors": sum(worker.errors for worker in workers),
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "duration": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": ms(percentile(latencies, 0.50)),
+        "p90_ms": ms(percentile(latencies, 0.90)),
+        "p99_ms": ms(percentile(latencies, 0.99)),
+        "max_ms": ms(latencies[-1] if latencies else None),
+    }
+
+
+def compare(result, baseline):
+    """Describe ``result`` against ``baseline`` (both from run_load) as report lines."""
+    lines = []
+    for key, better in (("requests_per_second", "higher"), ("p50_ms", "lower"), ("p99_ms", "lower")):
+        new, old = result.get(key), baseline.get(key)
+        if not new or not old:
+            continue
+        change = (new - old) / old * 100
+        lines.append(f"{key}: {old} -> {new} ({change:+.1f}%, {better} is better)")
+    return lines
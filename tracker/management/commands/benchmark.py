@@ -0,0 +1,75 @@
+import json
+import platform
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from tracker.benchmarks import DEFAULT_SIZES, find_regressions, run_benchmarks
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the tracker views and recommender on synthetic datasets. "
+        "Runs in a throwaway test database unless --use-current-db is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+            help="Comma separated evangelisms-per-user dataset sizes.",
+        )
+        parser.add_argument("--repeat", type=int, default=5, help="Timed runs per target.")
+        parser.add_argument("--output", help="Write results as JSON to this file.")
+        parser.add_argument("--baseline", help="JSON file from a previous run to compare against.")
+        parser.add_argument(
+            "--threshold", type=float, default=0.25,
+            help="Allowed relative slowdown against the baseline before failing (0.25 = 25%%).",
+        )
+        parser.add_argument(
+            "--use-current-db", action="store_true",
+            help="Benchmark against the configured database instead of a fresh test database.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options["sizes"].split(",") if size.strip()]
+        except ValueError:
+            raise CommandError("--sizes must be a comma separated list of integers")
+
+        baseline = None
+        if options["baseline"]:
+            with open(options["baseline"]) as f:
+                baseline = json.load(f)["results"]
+
+        old_name = None
+        if not options["use_current_db"]:
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            # Time the production code path: DEBUG=True would log every query
+            with override_settings(DEBUG=False):
+                results = run_benchmarks(sizes, repeat=options["repeat"], log=self.stdout.write)
+        finally:
+            if old_name is not None:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        report = {
+            "meta": {
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "database": connection.vendor,
+                "repeat": options["repeat"],
+            },
+            "results": results,
+        }
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f"Wrote {len(results)} results to {options['output']}")
+
+        if baseline is not None:
+            regressions = find_regressions(results, baseline, threshold=options["threshold"])
+            if regressions:
+                raise CommandError("Benchmark regressions:\n  " + "\n  ".join(regressions))
+            self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
@@ -0,0 +1,86 @@
+import json
+import os
+import platform
+import tempfile
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from tracker.benchmarks import build_dataset
+from tracker.loadtest import compare
+from tracker.writeload import run_writes
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark concurrent AddFollowUp writes from several worker processes in a throwaway database "
+        "and report writes/sec, latency percentiles and 'database is locked' errors. Run it once with "
+        "--untuned to compare against Django's default database options."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, default=8, help="Worker processes writing at once.")
+        parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run for.")
+        parser.add_argument("--evangelisms", type=int, default=200, help="Evangelisms the follow-ups are added to.")
+        parser.add_argument(
+            "--untuned", action="store_true",
+            help="Drop the database OPTIONS from settings (SQLite pragmas, IMMEDIATE transactions, "
+                 "the PostgreSQL pool): the numbers before tuning.",
+        )
+        parser.add_argument("--label", default="", help="Name of this run in the report.")
+        parser.add_argument("--output", help="Write the result as JSON to this file.")
+        parser.add_argument("--baseline", help="JSON file from a previous run to compare against.")
+
+    def handle(self, *args, **options):
+        if options["concurrency"] < 1 or options["duration"] <= 0 or options["evangelisms"] < 1:
+            raise CommandError("--concurrency, --duration and --evangelisms must be positive")
+
+        connection.close()
+        if options["untuned"]:
+            connection.settings_dict["OPTIONS"] = {}
+        label = options["label"] or ("untuned" if options["untuned"] else "tuned")
+
+        with tempfile.TemporaryDirectory() as directory:
+            if connection.vendor == "sqlite":
+                # The workers are separate processes: the usual in-memory test database can't be shared
+                connection.settings_dict["TEST"]["NAME"] = os.path.join(directory, "benchmark_writes.sqlite3")
+            old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+            try:
+                user = get_user_model().objects.create_user("writer", password="password123")
+                build_dataset(user, options["evangelisms"])
+                # Time the production code path: DEBUG=True would log every query
+                with override_settings(DEBUG=False):
+                    result = run_writes(user, options["concurrency"], options["duration"])
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        self.stdout.write(
+            f"{label}: {result['requests']} writes, {result['errors']} errors ({result['locked']} locked), "
+            f"{result['requests_per_second']} writes/s, p50 {result['p50_ms']} ms, "
+            f"p99 {result['p99_ms']} ms, max {result['max_ms']} ms"
+        )
+        report = {
+            "meta": {
+                "label": label,
+                "database": connection.vendor,
+                "options": sorted(connection.settings_dict["OPTIONS"]),
+                "concurrency": options["concurrency"],
+                "python": platform.python_version(),
+                "django": django.get_version(),
+            },
+            "result": result,
+        }
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f"Wrote the result to {options['output']}")
+
+        if options["baseline"]:
+            with open(options["baseline"]) as f:
+                baseline = json.load(f)
+            self.stdout.write(f"Against {baseline['meta']['label'] or options['baseline']}:")
+            for line in compare(result, baseline["result"]):
+                self.stdout.write(f"  {line}")
@@ -0,0 +1,42 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.exporter import FORMATS, stream_export
+
+
+class Command(BaseCommand):
+    help = (
+        "Export evangelisms and follow-ups as CSV or JSONL in constant memory "
+        "(the format import_tracker reads)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Username to export (default: every user).")
+        parser.add_argument("--format", choices=FORMATS, default="csv")
+        parser.add_argument("--gzip", action="store_true", help="Compress the output with gzip.")
+        parser.add_argument("--output", default="-", help="File to write ('-' for stdout, the default).")
+
+    def handle(self, *args, **options):
+        user = None
+        if options["user"]:
+            try:
+                user = get_user_model().objects.get_by_natural_key(options["user"])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f"Unknown user {options['user']!r}")
+
+        chunks = stream_export(user, options["format"], options["gzip"])
+        if options["output"] == "-":
+            out = sys.stdout.buffer
+            for chunk in chunks:
+                out.write(chunk)
+            out.flush()
+            return
+
+        size = 0
+        with open(options["output"], "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+                size += len(chunk)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {size} bytes to {options['output']}."))
@@ -0,0 +1,103 @@
+import json
+import sys
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.importer import DEFAULT_BATCH_SIZE, FORMATS, KINDS, Importer, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Import evangelisms and follow-ups from CSV or JSONL files in constant memory. "
+        "Rows are validated and written in batches; bad rows are reported and skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("files", nargs="+", help="CSV or JSONL files to import ('-' reads stdin).")
+        parser.add_argument(
+            "--format", choices=FORMATS,
+            help="File format (default: from the file extension; required for stdin).",
+        )
+        parser.add_argument(
+            "--kind", choices=KINDS,
+            help="Record type of rows without a 'type' column.",
+        )
+        parser.add_argument("--user", help="Username of the evangelist for rows without an 'evangelist' column.")
+        parser.add_argument(
+            "--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows validated and committed together.",
+        )
+        parser.add_argument(
+            "--on-conflict", choices=["skip", "update"], default="skip",
+            help="What to do with evangelisms that already exist (same evangelist and person_name).",
+        )
+        parser.add_argument("--errors", help="Also write every rejected row as JSON lines to this file.")
+        parser.add_argument(
+            "--show-errors", type=int, default=20, help="Rejected rows printed to stderr (the rest are counted).",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive")
+        default_user = None
+        if options["user"]:
+            try:
+                default_user = get_user_model().objects.get_by_natural_key(options["user"])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f"Unknown user {options['user']!r}")
+
+        errors_file = open(options["errors"], "w") if options["errors"] else None
+        try:
+            for name in options["files"]:
+                self.import_file(name, options, default_user, errors_file)
+        finally:
+            if errors_file:
+                errors_file.close()
+
+    def import_file(self, name, options, default_user, errors_file):
+        format = options["format"] or Path(name).suffix.lstrip(".").lower()
+        if format not in FORMATS:
+            raise CommandError(f"Cannot tell the format of {name}; pass --format {'/'.join(FORMATS)}")
+
+        shown = 0
+
+        def on_error(error):
+            nonlocal shown
+            if shown < options["show_errors"]:
+                self.stderr.write(f"{name}:{error.line}: {error.message}")
+                shown += 1
+            if errors_file:
+                errors_file.write(json.dumps({"file": name, "line": error.line, "error": error.message}) + "\n")
+
+        def on_batch(result):
+            if options["verbosity"] >= 2:
+                self.stdout.write(f"{name}: {result.rows} rows ({result.rows_per_second:.0f} rows/s)")
+
+        importer = Importer(
+            batch_size=options["batch_size"],
+            default_user=default_user,
+            default_kind=options["kind"],
+            on_conflict=options["on_conflict"],
+            on_error=on_error,
+            on_batch=on_batch,
+        )
+        if name == "-":
+            result = importer.run(read_rows(sys.stdin, format))
+        else:
+            try:
+                with open(name, newline="", encoding="utf-8-sig") as f:
+                    result = importer.run(read_rows(f, format))
+            except OSError as e:
+                raise CommandError(f"Cannot read {name}: {e}")
+
+        existing = "updated" if options["on_conflict"] == "update" else "skipped"
+        summary = (
+            f"{name}: imported {result.evangelisms} evangelisms ({result.existing} existing {existing}) "
+            f"and {result.followups} follow-ups from {result.rows} rows in {result.duration:.1f}s "
+            f"({result.rows_per_second:.0f} rows/s)"
+        )
+        if result.errors:
+            self.stdout.write(self.style.WARNING(f"{summary}; {result.errors} rows rejected."))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary + "."))
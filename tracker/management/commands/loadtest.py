@@ -0,0 +1,74 @@
+import json
+import platform
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from tracker.loadtest import DEFAULT_PATHS, compare, login, run_load
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test a running server over HTTP and report requests/sec and latency percentiles. "
+        "Run it against the WSGI and the ASGI entry point (see README) to compare them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000", help="Base URL of the running server.")
+        parser.add_argument(
+            "--path", action="append", dest="paths",
+            help="Path to request (repeatable; {today} is replaced by today's date). "
+                 f"Defaults to {', '.join(DEFAULT_PATHS)}.",
+        )
+        parser.add_argument("--concurrency", type=int, default=20, help="Simultaneous connections.")
+        parser.add_argument("--duration", type=float, default=20.0, help="Seconds to run for.")
+        parser.add_argument("--warmup", type=float, default=2.0, help="Untimed seconds to run first.")
+        parser.add_argument("--username", default="evangelist", help="User to log in as (see seed.py).")
+        parser.add_argument("--password", default="password123")
+        parser.add_argument("--label", default="", help="Name of this run in the report, e.g. wsgi or asgi.")
+        parser.add_argument("--output", help="Write the result as JSON to this file.")
+        parser.add_argument("--baseline", help="JSON file from a previous run to compare against.")
+
+    def handle(self, *args, **options):
+        if options["concurrency"] < 1 or options["duration"] <= 0:
+            raise CommandError("--concurrency and --duration must be positive")
+        today = timezone.localdate().isoformat()
+        paths = [path.format(today=today) for path in options["paths"] or DEFAULT_PATHS]
+
+        try:
+            cookie = login(options["url"], options["username"], options["password"])
+        except (OSError, RuntimeError) as e:
+            raise CommandError(f"Could not log in to {options['url']}: {e}")
+
+        if options["warmup"] > 0:
+            run_load(options["url"], paths, options["concurrency"], options["warmup"], cookie)
+        result = run_load(options["url"], paths, options["concurrency"], options["duration"], cookie)
+
+        self.stdout.write(
+            f"{options['label'] or options['url']}: {result['requests']} requests, {result['errors']} errors, "
+            f"{result['requests_per_second']} req/s, p50 {result['p50_ms']} ms, "
+            f"p99 {result['p99_ms']} ms, max {result['max_ms']} ms"
+        )
+        report = {
+            "meta": {
+                "label": options["label"],
+                "url": options["url"],
+                "paths": paths,
+                "concurrency": options["concurrency"],
+                "python": platform.python_version(),
+                "django": django.get_version(),
+            },
+            "result": result,
+        }
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(report, f, indent=2)
+            self.stdout.write(f"Wrote the result to {options['output']}")
+
+        if options["baseline"]:
+            with open(options["baseline"]) as f:
+                baseline = json.load(f)
+            self.stdout.write(f"Against {baseline['meta']['label'] or options['baseline']}:")
+            for line in compare(result, baseline["result"]):
+                self.stdout.write(f"  {line}")
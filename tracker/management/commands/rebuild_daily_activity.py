@@ -0,0 +1,69 @@
+from collections import defaultdict
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Q
+
+from tracker.models import DailyActivity, daily_activity_counts
+
+
+def _actual_counts(evangelism_filter=Q(), followup_filter=Q()):
+    counts = defaultdict(lambda: [0, 0])
+    for evangelist_id, date, evangelisms, followups in daily_activity_counts(evangelism_filter, followup_filter):
+        counts[evangelist_id, date][0] += evangelisms
+        counts[evangelist_id, date][1] += followups
+    return counts
+
+
+class Command(BaseCommand):
+    help = "Rebuild (or just verify) the per-user daily activity rollup from the evangelism and follow-up tables."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Only report days whose stored counts disagree with the source tables; exit non-zero if any do.",
+        )
+        parser.add_argument("--batch-size", type=int, default=100, help="Evangelists rebuilt per transaction.")
+
+    def handle(self, *args, verify=False, batch_size=100, **options):
+        if verify:
+            return self.verify()
+
+        pks = list(User.objects.order_by("pk").values_list("pk", flat=True))
+        days = 0
+        for start in range(0, len(pks), batch_size):
+            batch = pks[start:start + batch_size]
+            counts = _actual_counts(Q(evangelist_id__in=batch), Q(evangelism__evangelist_id__in=batch))
+            with transaction.atomic():
+                DailyActivity.objects.filter(evangelist_id__in=batch).delete()
+                DailyActivity.objects.bulk_create(
+                    [
+                        DailyActivity(evangelist_id=evangelist_id, date=date, evangelisms=e, followups=f)
+                        for (evangelist_id, date), (e, f) in counts.items()
+                    ],
+                    batch_size=5000,
+                )
+            days += len(counts)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {days} days of activity for {len(pks)} evangelists."))
+
+    def verify(self):
+        actual = _actual_counts()
+        stored = {
+            (evangelist_id, date): [evangelisms, followups]
+            for evangelist_id, date, evangelisms, followups in DailyActivity.objects.values_list(
+                "evangelist_id", "date", "evangelisms", "followups"
+            ).iterator(chunk_size=2000)
+        }
+        mismatched = sorted(day for day in actual.keys() | stored.keys() if actual.get(day) != stored.get(day))
+        for evangelist_id, date in mismatched[:20]:
+            self.stdout.write(
+                f"Evangelist {evangelist_id} on {date}: stored {stored.get((evangelist_id, date))}, "
+                f"actual {actual.get((evangelist_id, date))}"
+            )
+        if mismatched:
+            raise CommandError(
+                f"{len(mismatched)} days have stale activity counts; run rebuild_daily_activity to fix them."
+            )
+        self.stdout.write(self.style.SUCCESS("Daily activity rollup is consistent."))
@@ -0,0 +1,55 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, Max
+from django.db.models.functions import Coalesce
+
+from tracker.models import Evangelism
+
+
+class Command(BaseCommand):
+    help = "Rebuild (or just verify) the denormalized follow-up stats stored on Evangelism."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Only report rows whose stored stats disagree with the follow-up table; exit non-zero if any do.",
+        )
+        parser.add_argument("--batch-size", type=int, default=5000, help="Evangelisms updated per transaction.")
+
+    def handle(self, *args, verify=False, batch_size=5000, **options):
+        if verify:
+            return self.verify()
+
+        pks = list(Evangelism.objects.order_by("pk").values_list("pk", flat=True))
+        for start in range(0, len(pks), batch_size):
+            batch = pks[start:start + batch_size]
+            with transaction.atomic():
+                Evangelism.objects.filter(pk__in=batch).refresh_followup_stats()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt follow-up stats for {len(pks)} evangelisms."))
+
+    def verify(self):
+        rows = (
+            Evangelism.objects.annotate(
+                actual_count=Count("followups"),
+                actual_last_followup=Max("followups__date"),
+            )
+            .annotate(actual_last_touch=Coalesce("actual_last_followup", "date"))
+            .order_by("pk")
+            .values_list(
+                "pk",
+                "followup_count", "last_followup_date", "last_touch_date",
+                "actual_count", "actual_last_followup", "actual_last_touch",
+            )
+        )
+        mismatched = 0
+        for pk, *stats in rows.iterator(chunk_size=2000):
+            if stats[:3] != stats[3:]:
+                mismatched += 1
+                if mismatched <= 20:
+                    self.stdout.write(f"Evangelism {pk}: stored {tuple(stats[:3])}, actual {tuple(stats[3:])}")
+        if mismatched:
+            raise CommandError(
+                f"{mismatched} evangelisms have stale follow-up stats; run rebuild_followup_stats to fix them."
+            )
+        self.stdout.write(self.style.SUCCESS("Follow-up stats are consistent."))
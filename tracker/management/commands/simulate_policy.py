@@ -0,0 +1,78 @@
+import itertools
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+
+def int_list(value):
+    try:
+        return [int(part) for part in value.split(",") if part.strip()]
+    except ValueError:
+        raise CommandError(f"Expected a comma separated list of integers, got {value!r}")
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulate the follow-up recommender over many days for synthetic evangelists and report "
+        "coverage, neglect and follow-up distribution for each parameter set."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--evangelists", type=int, default=1000)
+        parser.add_argument("--contacts", type=int, default=100, help="Average contacts per evangelist.")
+        parser.add_argument("--days", type=int, default=90, help="Days to simulate.")
+        parser.add_argument("--past-days", type=int, default=90, help="Spread of initial evangelism dates.")
+        parser.add_argument("--compliance", type=float, default=1.0,
+                            help="Probability an evangelist acts on the recommendation each day.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--target", type=int_list, help="FOLLOWUP_TARGET values to try, e.g. 5,7,10")
+        parser.add_argument("--interval", type=int_list, help="FOLLOWUP_INTERVAL_DAYS values to try")
+        parser.add_argument("--recent", type=int_list, help="RECENT_TOUCH_WINDOW values to try")
+        parser.add_argument("--min-gap", type=int_list, help="MIN_DAYS_BEFORE_SECOND_TOUCH values to try")
+        parser.add_argument("--json", action="store_true", help="Print one JSON object per parameter set.")
+
+    def handle(self, *args, **options):
+        try:
+            from tracker.simulation import Policy, simulate, synthetic_contacts
+        except ImportError as e:
+            raise CommandError(f"The policy simulator needs NumPy ({e}).")
+
+        current = Policy.current()
+        grid = itertools.product(
+            options["target"] or [current.target],
+            options["interval"] or [current.interval_days],
+            options["recent"] or [current.recent_window],
+            options["min_gap"] or [current.min_days_before_second_touch],
+        )
+        # The date recommend_queue treats as today
+        today = timezone.localdate().toordinal()
+
+        for target, interval, recent, min_gap in grid:
+            try:
+                policy = Policy(target, interval, recent, min_gap)
+            except ValueError as e:
+                raise CommandError(str(e))
+            contacts = synthetic_contacts(
+                options["evangelists"], options["contacts"], today,
+                past_days=options["past_days"], target=target, seed=options["seed"],
+            )
+            started = time.perf_counter()
+            result = simulate(policy, contacts, today, options["days"],
+                              compliance=options["compliance"], seed=options["seed"])
+            elapsed = time.perf_counter() - started
+
+            if options["json"]:
+                self.stdout.write(json.dumps({**result.as_dict(), "seconds": round(elapsed, 3)}))
+                continue
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{policy}"))
+            self.stdout.write(
+                f"  {result.contacts} contacts, {result.days} days, {result.followups} follow-ups, "
+                f"{result.evangelize_days} evangelize-days ({elapsed:.2f}s)"
+            )
+            self.stdout.write(
+                f"  coverage {result.coverage:.1%}, target reached {result.target_reached:.1%}, "
+                f"max neglect {result.max_neglect_days} days"
+            )
+            self.stdout.write(f"  follow-up distribution (0..{target}): {result.distribution}")
@@ -0,0 +1,107 @@
+"""In-process request metrics, rendered in the Prometheus text format.
+
+``PerformanceMiddleware`` calls ``observe`` once per sampled request; the
+staff-only metrics endpoint renders everything with ``render_prometheus``.
+Like the cache counters in tracker.cache, the numbers are per process: each
+worker reports its own, and Prometheus sums them across scrapes.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from .cache import cache_stats
+
+
+# Upper bounds (seconds) of the request duration histogram buckets
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+@dataclass
+class ViewMetrics:
+    buckets: List[int] = field(default_factory=lambda: [0] * len(DURATION_BUCKETS))
+    count: int = 0
+    duration: float = 0.0
+    sql_queries: int = 0
+    sql_duration: float = 0.0
+    template_duration: float = 0.0
+
+
+_lock = threading.Lock()
+_views: Dict[str, ViewMetrics] = {}
+
+
+def observe(view, duration, sql_queries=0, sql_duration=0.0, template_duration=0.0):
+    """Record one request to ``view``; durations are in seconds."""
+    with _lock:
+        metrics = _views.get(view)
+        if metrics is None:
+            metrics = _views[view] = ViewMetrics()
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if duration <= bound:
+                metrics.buckets[i] += 1
+                break
+        metrics.count += 1
+        metrics.duration += duration
+        metrics.sql_queries += sql_queries
+        metrics.sql_duration += sql_duration
+        metrics.template_duration += template_duration
+
+
+def snapshot() -> Dict[str, ViewMetrics]:
+    """Return a consistent copy of the per-view metrics."""
+    with _lock:
+        return {
+            view: ViewMetrics(list(m.buckets), m.count, m.duration, m.sql_queries, m.sql_duration, m.template_duration)
+            for view, m in _views.items()
+        }
+
+
+def reset():
+    with _lock:
+        _views.clear()
+
+
+def _label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus(sample_rate=1.0) -> str:
+    """Render the per-view metrics (and the tracker cache counters) in the Prometheus text format."""
+    views = snapshot()
+    lines = [
+        "# HELP followup_request_duration_seconds Request wall time per view.",
+        "# TYPE followup_request_duration_seconds histogram",
+    ]
+    for view, m in sorted(views.items()):
+        label = f'view="{_label(view)}"'
+        cumulative = 0
+        for bound, n in zip(DURATION_BUCKETS, m.buckets):
+            cumulative += n
+            lines.append(f'followup_request_duration_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+        lines.append(f'followup_request_duration_seconds_bucket{{{label},le="+Inf"}} {m.count}')
+        lines.append(f"followup_request_duration_seconds_sum{{{label}}} {m.duration:.6f}")
+        lines.append(f"followup_request_duration_seconds_count{{{label}}} {m.count}")
+
+    for name, help_text, attr, fmt in [
+        ("followup_sql_queries_total", "SQL queries run per view.", "sql_queries", "{}"),
+        ("followup_sql_duration_seconds_total", "Time spent in SQL per view.", "sql_duration", "{:.6f}"),
+        ("followup_template_duration_seconds_total", "Time spent rendering templates per view.",
+         "template_duration", "{:.6f}"),
+    ]:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} counter")
+        for view, m in sorted(views.items()):
+            lines.append(f'{name}{{view="{_label(view)}"}} {fmt.format(getattr(m, attr))}')
+
+    stats = cache_stats()
+    lines += [
+        "# HELP followup_cache_lookups_total Per-user cache lookups by outcome.",
+        "# TYPE followup_cache_lookups_total counter",
+        f'followup_cache_lookups_total{{outcome="hit"}} {stats["hits"]}',
+        f'followup_cache_lookups_total{{outcome="miss"}} {stats["misses"]}',
+        "# HELP followup_metrics_sample_rate Share of requests recorded by the performance middleware.",
+        "# TYPE followup_metrics_sample_rate gauge",
+        f"followup_metrics_sample_rate {sample_rate}",
+    ]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,181 @@
+import random
+import time
+from contextlib import ExitStack
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+
+from . import metrics, routers
+
+
+class RequestTiming:
+    """Timings collected while one request is served."""
+
+    def __init__(self):
+        self.sql_queries = 0
+        self.sql_duration = 0.0
+        self.template_started = None
+        self.template_duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper hook
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.sql_duration += time.perf_counter() - started
+            self.sql_queries += 1
+
+    def template_rendered(self, response):
+        if self.template_started is not None:
+            self.template_duration += time.perf_counter() - self.template_started
+            self.template_started = None
+
+
+class PerformanceMiddleware:
+    """Record wall time, SQL count/time and template render time of sampled requests.
+
+    Each sampled request is added to the per-view histograms in tracker.metrics
+    and, unless PERFORMANCE_SERVER_TIMING is off, described in a Server-Timing
+    header. PERFORMANCE_SAMPLE_RATE (0.0-1.0) sets the share of requests
+    measured. Template time covers TemplateResponses (all class-based views);
+    place this middleware first so the wall time includes the other middleware.
+
+    Sync and async capable: under ASGI it runs on the event loop, so the async
+    views behind it need no extra thread hop.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            # Django would run a sync hook in a worker thread
+            self.process_template_response = self.aprocess_template_response
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.sampled():
+            return self.get_response(request)
+
+        timing = request._performance_timing = RequestTiming()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timing))
+            response = self.get_response(request)
+        return self.record(request, response, timing, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        if not self.sampled():
+            return await self.get_response(request)
+
+        timing = request._performance_timing = RequestTiming()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timing))
+            response = await self.get_response(request)
+        return self.record(request, response, timing, time.perf_counter() - started)
+
+    def sampled(self):
+        sample_rate = getattr(settings, "PERFORMANCE_SAMPLE_RATE", 1.0)
+        return not (sample_rate <= 0 or (sample_rate < 1 and random.random() >= sample_rate))
+
+    def record(self, request, response, timing, duration):
+        match = request.resolver_match
+        metrics.observe(
+            match.view_name if match else "<unresolved>",
+            duration,
+            sql_queries=timing.sql_queries,
+            sql_duration=timing.sql_duration,
+            template_duration=timing.template_duration,
+        )
+        if getattr(settings, "PERFORMANCE_SERVER_TIMING", True):
+            response["Server-Timing"] = (
+                f"total;dur={duration * 1000:.1f}, "
+                f'db;dur={timing.sql_duration * 1000:.1f};desc="{timing.sql_queries} queries", '
+                f"tpl;dur={timing.template_duration * 1000:.1f}"
+            )
+        return response
+
+    def process_template_response(self, request, response):
+        # Outermost middleware, so this runs right before the handler renders the response
+        timing = getattr(request, "_performance_timing", None)
+        if timing is not None:
+            timing.template_started = time.perf_counter()
+            response.add_post_render_callback(timing.template_rendered)
+        return response
+
+    async def aprocess_template_response(self, request, response):
+        return PerformanceMiddleware.process_template_response(self, request, response)
+
+
+class ReplicaRoutingMiddleware:
+    """Pick the database the tracker reads of each request go to (see tracker.routers).
+
+    GET and HEAD requests to views with ``replica_reads = True`` read from a
+    random replica, unless the user wrote within the last
+    READ_YOUR_WRITES_SECONDS. Place it after the session and authentication
+    middleware: it reads the session and its deadline must be saved with it.
+    Sync and async capable; under ASGI the session is read through its async API.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        with routers.routing() as state:
+            response = self.get_response(request)
+        if state.wrote and hasattr(request, "session"):
+            request.session[routers.PINNED_UNTIL_SESSION_KEY] = time.time() + settings.READ_YOUR_WRITES_SECONDS
+        return response
+
+    async def __acall__(self, request):
+        with routers.routing() as state:
+            response = await self.get_response(request)
+        if state.wrote and hasattr(request, "session"):
+            await request.session.aset(routers.PINNED_UNTIL_SESSION_KEY, time.time() + settings.READ_YOUR_WRITES_SECONDS)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not self.may_use_replica(request, view_func):
+            return None
+        pinned_until = request.session.get(routers.PINNED_UNTIL_SESSION_KEY, 0) if hasattr(request, "session") else 0
+        return self.choose(request, pinned_until)
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        if not self.may_use_replica(request, view_func):
+            return None
+        pinned_until = await request.session.aget(routers.PINNED_UNTIL_SESSION_KEY, 0) if hasattr(request, "session") else 0
+        return self.choose(request, pinned_until)
+
+    def may_use_replica(self, request, view_func):
+        view_class = getattr(view_func, "view_class", None)
+        return bool(routers.replicas() and routers.current_state() is not None
+                    and request.method in ("GET", "HEAD") and getattr(view_class, "replica_reads", False))
+
+    def choose(self, request, pinned_until):
+        view = request.resolver_match.view_name
+        if pinned_until > time.time():
+            routers.logger.info("%s: reading from %s, the user wrote in the last %ss",
+                                view, routers.PRIMARY, settings.READ_YOUR_WRITES_SECONDS)
+            return None
+        state = routers.current_state()
+        state.replica = random.choice(routers.replicas())
+        routers.logger.info("%s: reading from %s", view, state.replica)
+        return None
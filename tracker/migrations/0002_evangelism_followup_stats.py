@@ -0,0 +1,49 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:33
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_followup_stats(apps, schema_editor):
+    Evangelism = apps.get_model('tracker', 'Evangelism')
+    FollowUp = apps.get_model('tracker', 'FollowUp')
+    followups = FollowUp.objects.filter(evangelism=OuterRef('pk')).order_by().values('evangelism')
+    last_followup = Subquery(followups.annotate(last=Max('date')).values('last'))
+    Evangelism.objects.update(
+        followup_count=Coalesce(Subquery(followups.annotate(n=Count('id')).values('n')), 0),
+        last_followup_date=last_followup,
+        last_touch_date=Coalesce(last_followup, F('date')),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='evangelism',
+            name='followup_count',
+            field=models.PositiveIntegerField(db_index=True, default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='evangelism',
+            name='last_followup_date',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='evangelism',
+            name='last_touch_date',
+            field=models.DateField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_followup_stats, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='evangelism',
+            index=models.Index(fields=['evangelist', 'completed', 'last_touch_date'], name='evangelism_last_touch_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0002_evangelism_followup_stats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='evangelism',
+            index=models.Index(fields=['evangelist', 'date'], name='evangelism_evangelist_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='evangelism',
+            index=models.Index(condition=models.Q(('completed', False)), fields=['evangelist', 'date'], name='evangelism_active_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='followup',
+            index=models.Index(fields=['evangelism', 'date'], name='followup_evangelism_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='followup',
+            index=models.Index(fields=['date', 'evangelism'], name='followup_date_evangelism_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.4 on 2026-10-18 12:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0003_composite_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='evangelism',
+            index=models.Index(fields=['evangelist', 'faith', 'date'], name='evangelism_faith_date_idx'),
+        ),
+    ]
@@ -0,0 +1,62 @@
+from django.db import migrations
+
+from ._search_sql import CREATE_TABLE, DROP, FILL, TRIGGERS
+
+
+# SQLite: a trigram FTS5 table holding each evangelism's text and its follow-ups' descriptions,
+# kept in sync by triggers (see tracker.search)
+SQLITE_FORWARD = [CREATE_TABLE, FILL, *TRIGGERS.values()]
+
+SQLITE_BACKWARD = DROP
+
+# PostgreSQL: expression indexes, so there is nothing to keep in sync. The document expression
+# must stay identical to tracker.search.POSTGRES_DOCUMENT (with "e." dropped) for the planner to use it.
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    CREATE INDEX evangelism_search_idx ON tracker_evangelism USING gin ((
+        to_tsvector('simple', coalesce(person_name, '') || ' ' || coalesce(location, '') || ' '
+                    || coalesce(course, '') || ' ' || coalesce(description, ''))
+    ))
+    """,
+    "CREATE INDEX evangelism_name_trgm_idx ON tracker_evangelism USING gin (person_name gin_trgm_ops)",
+    "CREATE INDEX followup_search_idx ON tracker_followup USING gin ((to_tsvector('simple', description)))",
+]
+
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS followup_search_idx",
+    "DROP INDEX IF EXISTS evangelism_name_trgm_idx",
+    "DROP INDEX IF EXISTS evangelism_search_idx",
+]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == "sqlite":
+        # The trigram tokenizer needs SQLite 3.34; without it tracker.search falls back to icontains
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+            if not cursor.fetchone()[0] or connection.Database.sqlite_version_info < (3, 34):
+                return
+    _run({"sqlite": SQLITE_FORWARD, "postgresql": POSTGRES_FORWARD})(apps, schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0004_evangelism_faith_date_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            create_search_index,
+            _run({"sqlite": SQLITE_BACKWARD, "postgresql": POSTGRES_BACKWARD}),
+        ),
+    ]
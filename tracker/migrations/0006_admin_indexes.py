@@ -0,0 +1,23 @@
+# Generated by Django 5.2.4 on 2026-10-18 13:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0005_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='evangelism',
+            index=models.Index(fields=['date', 'id'], name='evangelism_admin_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='evangelism',
+            index=models.Index(fields=['faith', 'date', 'id'], name='evangelism_admin_faith_idx'),
+        ),
+    ]
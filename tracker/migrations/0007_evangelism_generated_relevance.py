@@ -0,0 +1,63 @@
+# Generated by Django 5.2.4 on 2026-10-18 13:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+from ._search_sql import restore_triggers
+
+
+def restore_search_triggers(apps, schema_editor):
+    # Adding (or, backwards, removing) the generated column makes SQLite rebuild tracker_evangelism,
+    # which drops the triggers keeping the search index current. No rows change, so no refill.
+    if schema_editor.connection.vendor == "sqlite":
+        with schema_editor.connection.cursor() as cursor:
+            restore_triggers(cursor, refill=False)
+
+
+def fill_relevance(apps, schema_editor):
+    # Going back to the plain column: compute it once, as Evangelism.save() used to
+    Evangelism = apps.get_model("tracker", "Evangelism")
+    Evangelism.objects.update(relevance=models.Case(
+        models.When(faith="strong_faith", then=models.Value(1)),
+        models.When(faith="less_faith", then=models.Value(2)),
+        models.When(faith="unknown", then=models.Value(3)),
+        default=models.Value(4),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0006_admin_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(migrations.RunPython.noop, restore_search_triggers),
+        migrations.RemoveIndex(
+            model_name='evangelism',
+            name='evangelism_last_touch_idx',
+        ),
+        # A column cannot be altered into a generated one: it is dropped and added again. The default
+        # only matters when migrating backwards, where the plain column is re-added to existing rows.
+        migrations.AlterField(
+            model_name='evangelism',
+            name='relevance',
+            field=models.IntegerField(blank=True, default=4),
+        ),
+        migrations.RunPython(migrations.RunPython.noop, fill_relevance),
+        migrations.RemoveField(
+            model_name='evangelism',
+            name='relevance',
+        ),
+        migrations.AddField(
+            model_name='evangelism',
+            name='relevance',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(faith='strong_faith', then=models.Value(1)), models.When(faith='less_faith', then=models.Value(2)), models.When(faith='unknown', then=models.Value(3)), default=models.Value(4)), output_field=models.IntegerField()),
+        ),
+        migrations.AddIndex(
+            model_name='evangelism',
+            index=models.Index(condition=models.Q(('completed', False)), fields=['evangelist', 'last_touch_date', '-relevance'], name='evangelism_recommend_idx'),
+        ),
+        migrations.RunPython(restore_search_triggers, migrations.RunPython.noop),
+    ]
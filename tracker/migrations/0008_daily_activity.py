@@ -0,0 +1,60 @@
+# Generated by Django 5.2.4 on 2026-10-18 13:49
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, Value
+
+
+def backfill_daily_activity(apps, schema_editor):
+    Evangelism = apps.get_model('tracker', 'Evangelism')
+    FollowUp = apps.get_model('tracker', 'FollowUp')
+    DailyActivity = apps.get_model('tracker', 'DailyActivity')
+    zero = Value(0, output_field=IntegerField())
+    evangelisms = (
+        Evangelism.objects.order_by().values('evangelist_id', 'date')
+        .annotate(evangelisms=Count('id'), followups=zero)
+        .values_list('evangelist_id', 'date', 'evangelisms', 'followups')
+    )
+    followups = (
+        FollowUp.objects.order_by().values('evangelism__evangelist_id', 'date')
+        .annotate(evangelisms=zero, followups=Count('id'))
+        .values_list('evangelism__evangelist_id', 'date', 'evangelisms', 'followups')
+    )
+    counts = {}
+    for evangelist_id, date, evangelism_count, followup_count in evangelisms.union(followups, all=True):
+        day = counts.setdefault((evangelist_id, date), [0, 0])
+        day[0] += evangelism_count
+        day[1] += followup_count
+    DailyActivity.objects.bulk_create(
+        [
+            DailyActivity(evangelist_id=evangelist_id, date=date, evangelisms=e, followups=f)
+            for (evangelist_id, date), (e, f) in counts.items()
+        ],
+        batch_size=5000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0007_evangelism_generated_relevance'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('evangelisms', models.PositiveIntegerField(default=0)),
+                ('followups', models.PositiveIntegerField(default=0)),
+                ('evangelist', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_activity', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('evangelist', 'date'), name='unique_daily_activity')],
+            },
+        ),
+        migrations.RunPython(backfill_daily_activity, migrations.RunPython.noop),
+    ]
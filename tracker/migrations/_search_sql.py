@@ -0,0 +1,106 @@
+"""SQL for the SQLite search index (see tracker.search).
+
+Shared by the migrations that create the index or rebuild tracker_evangelism
+(which drops its triggers) and by the post_migrate check that puts back any
+trigger a later table rebuild lost. The leading underscore keeps the
+migration loader from reading this module as a migration.
+"""
+
+FTS_TABLE = "tracker_evangelism_fts"
+
+# tracker.search.owner_key(evangelist_id) in SQL
+OWNER_KEY = "char(57344 + {0} / 40960000 % 6400, 57344 + {0} / 6400 % 6400, 57344 + {0} % 6400)"
+
+# A trigram FTS5 table holding each evangelism's text and its follow-ups' descriptions
+CREATE_TABLE = f"""
+    CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        owner, person_name, location, course, description, followups, tokenize = 'trigram'
+    )
+"""
+
+FILL = f"""
+    INSERT INTO {FTS_TABLE} (rowid, owner, person_name, location, course, description, followups)
+    SELECT e.id, {OWNER_KEY.format("e.evangelist_id")},
+           e.person_name, coalesce(e.location, ''), coalesce(e.course, ''), e.description,
+           coalesce((SELECT group_concat(f.description, ' ') FROM tracker_followup f WHERE f.evangelism_id = e.id), '')
+    FROM tracker_evangelism e
+"""
+
+# Keep the index current on every write to tracker_evangelism and tracker_followup
+TRIGGERS = {
+    "tracker_evangelism_fts_insert": f"""
+        CREATE TRIGGER IF NOT EXISTS tracker_evangelism_fts_insert AFTER INSERT ON tracker_evangelism BEGIN
+            INSERT INTO {FTS_TABLE} (rowid, owner, person_name, location, course, description, followups)
+            VALUES (new.id, {OWNER_KEY.format("new.evangelist_id")},
+                    new.person_name, coalesce(new.location, ''), coalesce(new.course, ''), new.description, '');
+        END
+    """,
+    "tracker_evangelism_fts_update": f"""
+        CREATE TRIGGER IF NOT EXISTS tracker_evangelism_fts_update
+        AFTER UPDATE OF evangelist_id, person_name, location, course, description ON tracker_evangelism BEGIN
+            UPDATE {FTS_TABLE}
+            SET owner = {OWNER_KEY.format("new.evangelist_id")},
+                person_name = new.person_name, location = coalesce(new.location, ''),
+                course = coalesce(new.course, ''), description = new.description
+            WHERE rowid = new.id;
+        END
+    """,
+    "tracker_evangelism_fts_delete": f"""
+        CREATE TRIGGER IF NOT EXISTS tracker_evangelism_fts_delete AFTER DELETE ON tracker_evangelism BEGIN
+            DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+        END
+    """,
+    "tracker_followup_fts_insert": f"""
+        CREATE TRIGGER IF NOT EXISTS tracker_followup_fts_insert AFTER INSERT ON tracker_followup BEGIN
+            UPDATE {FTS_TABLE}
+            SET followups = coalesce((SELECT group_concat(description, ' ') FROM tracker_followup
+                                      WHERE evangelism_id = new.evangelism_id), '')
+            WHERE rowid = new.evangelism_id;
+        END
+    """,
+    "tracker_followup_fts_update": f"""
+        CREATE TRIGGER IF NOT EXISTS tracker_followup_fts_update
+        AFTER UPDATE OF evangelism_id, description ON tracker_followup BEGIN
+            UPDATE {FTS_TABLE}
+            SET followups = coalesce((SELECT group_concat(description, ' ') FROM tracker_followup
+                                      WHERE evangelism_id = {FTS_TABLE}.rowid), '')
+            WHERE rowid IN (old.evangelism_id, new.evangelism_id);
+        END
+    """,
+    "tracker_followup_fts_delete": f"""
+        CREATE TRIGGER IF NOT EXISTS tracker_followup_fts_delete AFTER DELETE ON tracker_followup BEGIN
+            UPDATE {FTS_TABLE}
+            SET followups = coalesce((SELECT group_concat(description, ' ') FROM tracker_followup
+                                      WHERE evangelism_id = old.evangelism_id), '')
+            WHERE rowid = old.evangelism_id;
+        END
+    """,
+}
+
+DROP = [f"DROP TRIGGER IF EXISTS {name}" for name in reversed(TRIGGERS)] + [f"DROP TABLE IF EXISTS {FTS_TABLE}"]
+
+
+def missing_triggers(cursor):
+    """Names of the index's triggers absent from the database; empty when there is no index."""
+    cursor.execute(
+        "SELECT type, name FROM sqlite_master WHERE (type = 'table' AND name = %s) OR type = 'trigger'", [FTS_TABLE]
+    )
+    existing = {name for _, name in cursor.fetchall()}
+    if FTS_TABLE not in existing:
+        return []
+    return [name for name in TRIGGERS if name not in existing]
+
+
+def restore_triggers(cursor, refill=True):
+    """Recreate any missing trigger; return their names.
+
+    Writes made while a trigger was missing never reached the index, so by
+    default it is filled again from the tables when anything was restored.
+    """
+    missing = missing_triggers(cursor)
+    for name in missing:
+        cursor.execute(TRIGGERS[name])
+    if missing and refill:
+        cursor.execute(f"DELETE FROM {FTS_TABLE}")
+        cursor.execute(FILL)
+    return missing
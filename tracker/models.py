@@ -1,7 +1,81 @@
-from django.db import models
+from django.db import connections, models, router
+from django.db.models import Case, Count, F, IntegerField, Max, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
+from collections import defaultdict
 import datetime
 
+from .cache import bump_data_version_on_commit
+
+
+FOLLOWUP_STATS_FIELDS = ["followup_count", "last_followup_date", "last_touch_date"]
+
+
+class EvangelismQuerySet(models.QuerySet):
+    def refresh_followup_stats(self):
+        """Recompute the denormalized follow-up columns for every row in the queryset."""
+        followups = FollowUp.objects.filter(evangelism=OuterRef("pk")).order_by().values("evangelism")
+        last_followup = Subquery(followups.annotate(last=Max("date")).values("last"))
+        # Plain QuerySet.update: callers are follow-up writes, which invalidate caches themselves
+        return super().update(
+            followup_count=Coalesce(Subquery(followups.annotate(n=Count("id")).values("n")), 0),
+            last_followup_date=last_followup,
+            last_touch_date=Coalesce(last_followup, F("date")),
+        )
+
+    def activity_days(self, followups=False):
+        """The (evangelist_id, date) days these rows, and optionally their follow-ups, count towards."""
+        days = set(self.order_by().values_list("evangelist_id", "date").distinct())
+        if followups:
+            days |= FollowUp.objects.filter(evangelism__in=self.values("pk")).activity_days()
+        return days
+
+    def bulk_create(self, objs, *args, **kwargs):
+        for obj in objs:
+            obj.last_touch_date = obj.last_followup_date or obj.date
+        days = set()
+        if kwargs.get("update_conflicts") and "date" in (kwargs.get("update_fields") or ()):
+            # Rows updated in place leave the day they were on
+            days = self.filter(
+                evangelist_id__in={obj.evangelist_id for obj in objs},
+                person_name__in={obj.person_name for obj in objs},
+            ).activity_days()
+        objs = super().bulk_create(objs, *args, **kwargs)
+        if kwargs.get("ignore_conflicts") or kwargs.get("update_conflicts"):
+            # Not every object was inserted: recount their days
+            DailyActivity.objects.refresh(days | {(obj.evangelist_id, obj.date) for obj in objs})
+        else:
+            DailyActivity.objects.add(((obj.evangelist_id, obj.date), (1, 0)) for obj in objs)
+        bump_data_version_on_commit(*{obj.evangelist_id for obj in objs})
+        return objs
+
+    def update(self, **kwargs):
+        moves = bool({"date", "evangelist", "evangelist_id"} & kwargs.keys())
+        moves_followups = bool({"evangelist", "evangelist_id"} & kwargs.keys())
+        rows = list(self.values_list("pk", "evangelist_id"))
+        pks = [pk for pk, _ in rows]
+        days = Evangelism.objects.filter(pk__in=pks).activity_days(moves_followups) if moves else set()
+        updated = super().update(**kwargs)
+        if "date" in kwargs:
+            Evangelism.objects.filter(pk__in=pks).refresh_followup_stats()
+        if moves:
+            days |= Evangelism.objects.filter(pk__in=pks).activity_days(moves_followups)
+            DailyActivity.objects.refresh(days)
+        new_owner = kwargs.get("evangelist", kwargs.get("evangelist_id"))
+        bump_data_version_on_commit(*{evangelist_id for _, evangelist_id in rows}, getattr(new_owner, "pk", new_owner))
+        return updated
+
+    def delete(self):
+        days = self.activity_days(followups=True)
+        result = super().delete()
+        DailyActivity.objects.refresh(days)
+        return result
+
+
+def _relevance_expression(relevance, other):
+    """relevance_for(faith) as a SQL expression, for the generated column."""
+    return Case(*[When(faith=faith, then=Value(value)) for faith, value in relevance.items()], default=Value(other))
+
 
 class Evangelism(models.Model):
     FAITH_STATUS = {
@@ -10,6 +84,13 @@ class Evangelism(models.Model):
         "unbeliever": "Unbeliever",
         "unknown": "Unknown",
     }
+    # Faith status -> relevance; anything else (unbeliever) is the most relevant
+    RELEVANCE = {
+        "strong_faith": 1,
+        "less_faith": 2,
+        "unknown": 3,
+    }
+    OTHER_RELEVANCE = 4
     evangelist = models.ForeignKey(User, on_delete=models.CASCADE)
     person_name = models.CharField(max_length=200)
     course = models.CharField(max_length=200, null=True, blank=True)
@@ -17,19 +98,67 @@ class Evangelism(models.Model):
     date = models.DateField()
     description = models.TextField(blank=True)
     faith = models.CharField(max_length=20, choices=FAITH_STATUS)
-    relevance = models.IntegerField(blank=True)
+    # Computed by the database from faith, so bulk_create, QuerySet.update and raw SQL keep it right too
+    relevance = models.GeneratedField(
+        expression=_relevance_expression(RELEVANCE, OTHER_RELEVANCE),
+        output_field=models.IntegerField(),
+        db_persist=True,
+    )
     completed = models.BooleanField(default=False)
 
+    # Denormalized follow-up stats, kept in sync by FollowUp writes (see refresh_followup_stats)
+    followup_count = models.PositiveIntegerField(default=0, editable=False, db_index=True)
+    last_followup_date = models.DateField(null=True, blank=True, editable=False)
+    last_touch_date = models.DateField(null=True, blank=True, editable=False)
+
+    objects = EvangelismQuerySet.as_manager()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Read from __dict__ so deferred fields are not loaded
+        self._loaded_day = (self.__dict__.get("evangelist_id"), self.__dict__.get("date"))
+
+    @classmethod
+    def relevance_for(cls, faith):
+        return cls.RELEVANCE.get(faith, cls.OTHER_RELEVANCE)
+
     def save(self, *args, **kwargs):
-        if self.faith == "strong_faith":
-            self.relevance = 1
-        elif self.faith == "less_faith":
-            self.relevance = 2
-        elif self.faith == "unknown":
-            self.relevance = 3
-        else:
-            self.relevance = 4
-        return super().save(*args, **kwargs)
+        # 'last_touch_date' = last followup date or original evangelism date
+        self.last_touch_date = self.last_followup_date or self.date
+        adding = self._state.adding
+        if not adding and not kwargs.get("force_insert"):
+            # The stats belong to FollowUp writes: an instance loaded before a follow-up was
+            # added must not write its stale copy back
+            update_fields = kwargs.get("update_fields")
+            if update_fields is None:
+                update_fields = [f.name for f in self._meta.concrete_fields if not f.primary_key and not f.generated]
+            kwargs["update_fields"] = [name for name in update_fields if name not in FOLLOWUP_STATS_FIELDS]
+        result = super().save(*args, **kwargs)
+        # The database computed relevance; mirror it so this instance is not stale after an update
+        self.relevance = self.relevance_for(self.faith)
+        if not adding and self.date != self._loaded_day[1]:
+            # last_touch_date falls back to the date
+            Evangelism.objects.filter(pk=self.pk).refresh_followup_stats()
+            self.refresh_from_db(fields=FOLLOWUP_STATS_FIELDS)
+        day = (self.evangelist_id, self.date)
+        if adding:
+            DailyActivity.objects.add([(day, (1, 0))])
+        elif day != self._loaded_day:
+            days = {self._loaded_day, day}
+            if self.evangelist_id != self._loaded_day[0]:
+                # The follow-ups moved to the new evangelist's days too
+                days |= {(evangelist_id, date) for _, date in self.followups.activity_days()
+                         for evangelist_id in (self._loaded_day[0], self.evangelist_id)}
+            DailyActivity.objects.refresh(days)
+        bump_data_version_on_commit(self._loaded_day[0], self.evangelist_id)
+        self._loaded_day = day
+        return result
+
+    def delete(self, *args, **kwargs):
+        days = {(self.evangelist_id, self.date)} | self.followups.activity_days()
+        result = super().delete(*args, **kwargs)
+        DailyActivity.objects.refresh(days)
+        return result
     
     def __str__(self):
         return self.person_name
@@ -42,8 +171,79 @@ class Evangelism(models.Model):
                 violation_error_message="An Evangelism with this user and person_name already exists."
             )
         ]
+        indexes = [
+            # Recommender: active evangelisms, longest waiting and most relevant first
+            models.Index(
+                fields=["evangelist", "last_touch_date", "-relevance"], condition=Q(completed=False),
+                name="evangelism_recommend_idx",
+            ),
+            # Calendar/activities date ranges and the newest-first listing (scanned backwards)
+            models.Index(fields=["evangelist", "date"], name="evangelism_evangelist_date_idx"),
+            # Listing filtered by faith, newest first
+            models.Index(fields=["evangelist", "faith", "date"], name="evangelism_faith_date_idx"),
+            # The listing's "ongoing" filter: active evangelisms by date
+            models.Index(
+                fields=["evangelist", "date"], condition=Q(completed=False), name="evangelism_active_idx"
+            ),
+            # Admin changelist across all users: newest first, optionally by date range or faith
+            models.Index(fields=["date", "id"], name="evangelism_admin_date_idx"),
+            models.Index(fields=["faith", "date", "id"], name="evangelism_admin_faith_idx"),
+        ]
+
+
+
+class FollowUpQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, refresh_stats=True, **kwargs):
+        """Insert follow-ups and refresh their evangelisms' stats.
+
+        Pass refresh_stats=False only when the caller has already written the
+        correct follow-up stats on the evangelisms (e.g. bulk seeding); the
+        daily activity rollup is updated either way.
+        """
+        objs = super().bulk_create(objs, *args, **kwargs)
+        evangelism_ids = {obj.evangelism_id for obj in objs}
+        if kwargs.get("ignore_conflicts") or kwargs.get("update_conflicts"):
+            DailyActivity.objects.refresh_followups({(obj.evangelism_id, obj.date) for obj in objs})
+        else:
+            DailyActivity.objects.add_followups(((obj.evangelism_id, obj.date), (0, 1)) for obj in objs)
+        if refresh_stats:
+            self._followups_changed(evangelism_ids)
+        else:
+            bump_data_version_on_commit(*set(
+                Evangelism.objects.filter(pk__in=evangelism_ids).values_list("evangelist_id", flat=True)
+            ))
+        return objs
+
+    def activity_days(self):
+        """The (evangelist_id, date) days these follow-ups count towards."""
+        return set(self.order_by().values_list("evangelism__evangelist_id", "date").distinct())
 
+    def update(self, **kwargs):
+        moves = bool({"date", "evangelism", "evangelism_id"} & kwargs.keys())
+        pks = list(self.values_list("pk", flat=True)) if moves else None
+        days = FollowUp.objects.filter(pk__in=pks).activity_days() if moves else set()
+        evangelism_ids = set(self.values_list("evangelism_id", flat=True))
+        rows = super().update(**kwargs)
+        if "evangelism" in kwargs or "evangelism_id" in kwargs:
+            new_evangelism = kwargs.get("evangelism", kwargs.get("evangelism_id"))
+            evangelism_ids.add(getattr(new_evangelism, "pk", new_evangelism))
+        if moves:
+            DailyActivity.objects.refresh(days | FollowUp.objects.filter(pk__in=pks).activity_days())
+        self._followups_changed(evangelism_ids)
+        return rows
 
+    def delete(self):
+        evangelism_ids = set(self.values_list("evangelism_id", flat=True))
+        days = self.activity_days()
+        result = super().delete()
+        DailyActivity.objects.refresh(days)
+        self._followups_changed(evangelism_ids)
+        return result
+
+    def _followups_changed(self, evangelism_ids):
+        evangelisms = Evangelism.objects.filter(pk__in=evangelism_ids)
+        evangelisms.refresh_followup_stats()
+        bump_data_version_on_commit(*set(evangelisms.values_list("evangelist_id", flat=True)))
 
 
 class FollowUp(models.Model):
@@ -51,5 +251,210 @@ class FollowUp(models.Model):
     description = models.TextField(blank=True)
     date = models.DateField()
 
+    objects = FollowUpQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Detail timeline and follow-up stats (per evangelism, by date)
+            models.Index(fields=["evangelism", "date"], name="followup_evangelism_date_idx"),
+            # Activities day view and calendar month counts
+            models.Index(fields=["date", "evangelism"], name="followup_date_evangelism_idx"),
+        ]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._loaded_evangelism_id = self.evangelism_id
+        self._loaded_date = self.__dict__.get("date")
+
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        result = super().save(*args, **kwargs)
+        self._refresh_evangelism_stats({self._loaded_evangelism_id, self.evangelism_id})
+        day = (self.evangelism_id, self.date)
+        if adding and FollowUp.evangelism.is_cached(self):
+            DailyActivity.objects.add([((self.evangelism.evangelist_id, self.date), (0, 1))])
+        elif adding:
+            DailyActivity.objects.add_followups([(day, (0, 1))])
+        elif day != (self._loaded_evangelism_id, self._loaded_date):
+            DailyActivity.objects.refresh_followups({(self._loaded_evangelism_id, self._loaded_date), day})
+        self._data_changed({self._loaded_evangelism_id, self.evangelism_id})
+        self._loaded_evangelism_id, self._loaded_date = day
+        return result
+
+    def delete(self, *args, **kwargs):
+        evangelism_id = self.evangelism_id
+        result = super().delete(*args, **kwargs)
+        self._refresh_evangelism_stats({evangelism_id})
+        DailyActivity.objects.refresh_followups({(evangelism_id, self.date)})
+        self._data_changed({evangelism_id})
+        return result
+
+    def _data_changed(self, evangelism_ids):
+        # After the stats refresh, so a reader seeing the new version also sees the new stats
+        evangelism_ids = evangelism_ids - {None}
+        if evangelism_ids == {self.evangelism_id} and FollowUp.evangelism.is_cached(self):
+            owners = {self.evangelism.evangelist_id}
+        else:
+            owners = set(Evangelism.objects.filter(pk__in=evangelism_ids).values_list("evangelist_id", flat=True))
+        bump_data_version_on_commit(*owners)
+
+    def _refresh_evangelism_stats(self, evangelism_ids):
+        Evangelism.objects.filter(pk__in=evangelism_ids - {None}).refresh_followup_stats()
+        # Keep an already loaded parent in step so a later evangelism.save() doesn't write stale stats
+        if FollowUp.evangelism.is_cached(self):
+            self.evangelism.refresh_from_db(fields=FOLLOWUP_STATS_FIELDS)
+
+    def __str__(self):
+        return f"Followup {self.pk} -> {self.evangelism}"
+
+
+def daily_activity_counts(evangelism_filter=Q(), followup_filter=Q()):
+    """(evangelist_id, date, evangelisms, followups) rows counted from the source tables.
+
+    Both tables are grouped by evangelist and date and combined with UNION
+    ALL, so a day can appear twice (once per table); sum the rows per day.
+    """
+    evangelisms = (
+        Evangelism.objects.filter(evangelism_filter)
+        .order_by()
+        .values("evangelist_id", "date")
+        .annotate(evangelisms=Count("id"), followups=Value(0, output_field=IntegerField()))
+        .values_list("evangelist_id", "date", "evangelisms", "followups")
+    )
+    followups = (
+        FollowUp.objects.filter(followup_filter)
+        .order_by()
+        .values("evangelism__evangelist_id", "date")
+        .annotate(evangelisms=Value(0, output_field=IntegerField()), followups=Count("id"))
+        .values_list("evangelism__evangelist_id", "date", "evangelisms", "followups")
+    )
+    return evangelisms.union(followups, all=True)
+
+
+class DailyActivityQuerySet(models.QuerySet):
+    # Evangelists recounted per query; keeps the OR-ed filters well inside SQLite's expression depth limit
+    REFRESH_CHUNK = 100
+    # Rows per INSERT in add(); 4 parameters each stays under SQLite's variable limit
+    ADD_BATCH = 500
+
+    def add(self, increments):
+        """Add ((evangelist_id, date), (evangelisms, followups)) increments to the rollup.
+
+        For rows that were just inserted: each day is incremented in place with
+        INSERT ... ON CONFLICT DO UPDATE (SQLite and PostgreSQL), so concurrent
+        writers never lose a count and nothing is recounted.
+        """
+        totals = defaultdict(lambda: [0, 0])
+        for (evangelist_id, date), (evangelisms, followups) in increments:
+            if evangelist_id is not None:
+                totals[evangelist_id, date][0] += evangelisms
+                totals[evangelist_id, date][1] += followups
+        if not totals:
+            return
+        connection = connections[router.db_for_write(self.model)]
+        quote = connection.ops.quote_name
+        table = quote(self.model._meta.db_table)
+        rows = [
+            (evangelist_id, connection.ops.adapt_datefield_value(date), evangelisms, followups)
+            for (evangelist_id, date), (evangelisms, followups) in totals.items()
+        ]
+        with connection.cursor() as cursor:
+            for start in range(0, len(rows), self.ADD_BATCH):
+                batch = rows[start:start + self.ADD_BATCH]
+                cursor.execute(
+                    f"INSERT INTO {table} ({quote('evangelist_id')}, {quote('date')}, {quote('evangelisms')}, "
+                    f"{quote('followups')}) VALUES {', '.join(['(%s, %s, %s, %s)'] * len(batch))} "
+                    f"ON CONFLICT ({quote('evangelist_id')}, {quote('date')}) DO UPDATE SET "
+                    f"{quote('evangelisms')} = {table}.{quote('evangelisms')} + excluded.{quote('evangelisms')}, "
+                    f"{quote('followups')} = {table}.{quote('followups')} + excluded.{quote('followups')}",
+                    [value for row in batch for value in row],
+                )
+
+    def add_followups(self, increments):
+        """add() for ((evangelism_id, date), counts) increments, e.g. of follow-ups that were just inserted."""
+        increments = list(increments)
+        evangelists = self._evangelists({evangelism_id for (evangelism_id, _), _ in increments})
+        self.add(((evangelists.get(evangelism_id), date), counts) for (evangelism_id, date), counts in increments)
+
+    def _evangelists(self, evangelism_ids):
+        evangelism_ids = evangelism_ids - {None}
+        if not evangelism_ids:
+            return {}
+        return dict(Evangelism.objects.filter(pk__in=evangelism_ids).values_list("pk", "evangelist_id"))
+
+    def refresh(self, days):
+        """Recount the given (evangelist_id, date) days from the source tables.
+
+        For updates and deletes, where the old counts can't simply be
+        incremented: days with activity are upserted and days left without any
+        are deleted, so only the rollup rows of the changed days are touched.
+        """
+        dates_by_evangelist = defaultdict(set)
+        for evangelist_id, date in days:
+            if evangelist_id is not None and date is not None:
+                dates_by_evangelist[evangelist_id].add(date)
+        evangelist_ids = list(dates_by_evangelist)
+        for start in range(0, len(evangelist_ids), self.REFRESH_CHUNK):
+            self._refresh({e: dates_by_evangelist[e] for e in evangelist_ids[start:start + self.REFRESH_CHUNK]})
+
+    def _refresh(self, dates_by_evangelist):
+        evangelism_filter, followup_filter = Q(), Q()
+        for evangelist_id, dates in dates_by_evangelist.items():
+            evangelism_filter |= Q(evangelist_id=evangelist_id, date__in=dates)
+            followup_filter |= Q(evangelism__evangelist_id=evangelist_id, date__in=dates)
+
+        counts = defaultdict(lambda: [0, 0])
+        for evangelist_id, date, evangelisms, followups in daily_activity_counts(evangelism_filter, followup_filter):
+            counts[evangelist_id, date][0] += evangelisms
+            counts[evangelist_id, date][1] += followups
+        if counts:
+            super().bulk_create(
+                [
+                    DailyActivity(evangelist_id=evangelist_id, date=date, evangelisms=evangelisms, followups=followups)
+                    for (evangelist_id, date), (evangelisms, followups) in counts.items()
+                ],
+                update_conflicts=True,
+                unique_fields=["evangelist", "date"],
+                update_fields=["evangelisms", "followups"],
+            )
+
+        idle = Q()
+        for evangelist_id, dates in dates_by_evangelist.items():
+            idle_dates = {date for date in dates if (evangelist_id, date) not in counts}
+            if idle_dates:
+                idle |= Q(evangelist_id=evangelist_id, date__in=idle_dates)
+        if idle:
+            self.model.objects.filter(idle).delete()
+
+    def refresh_followups(self, days):
+        """refresh() for (evangelism_id, date) days, e.g. of follow-ups that were just written."""
+        evangelists = self._evangelists({evangelism_id for evangelism_id, _ in days})
+        self.refresh({(evangelists.get(evangelism_id), date) for evangelism_id, date in days})
+
+
+class DailyActivity(models.Model):
+    """Per-user, per-day evangelism and follow-up counts (a rollup of both tables).
+
+    Kept current by the Evangelism and FollowUp write paths above; rebuild it
+    with ``manage.py rebuild_daily_activity``. Only days with activity have a row.
+    """
+
+    evangelist = models.ForeignKey(User, on_delete=models.CASCADE, related_name="daily_activity")
+    date = models.DateField()
+    evangelisms = models.PositiveIntegerField(default=0)
+    followups = models.PositiveIntegerField(default=0)
+
+    objects = DailyActivityQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            # Also the index the calendar, heatmap and streaks read through
+            models.UniqueConstraint(fields=["evangelist", "date"], name="unique_daily_activity"),
+        ]
+
+    @property
+    def total(self):
+        return self.evangelisms + self.followups
+
     def __str__(self):
-        return f"Followup {self.pk} -> {self.evangelism}"
\ No newline at end of file
+        return f"{self.evangelist_id} {self.date}: {self.evangelisms} evangelisms, {self.followups} followups"
@@ -0,0 +1,77 @@
+"""EXPLAIN helpers for checking that tracker queries are served by an index.
+
+``explain`` returns the plan of one SQL statement as text lines on SQLite
+(``EXPLAIN QUERY PLAN``) and PostgreSQL (``EXPLAIN``). ``table_scans`` picks out
+the steps that read a whole table, and ``capture_table_scans`` runs a callable
+(usually a test client request) and explains every SELECT it issued, so tests
+can assert that a view never falls back to a table scan.
+
+On PostgreSQL sequential scans are disabled while explaining: test tables are
+tiny, and the planner would otherwise prefer a seq scan even where an index
+exists. A "Seq Scan" left in the plan then means no index could be used.
+"""
+
+import re
+
+from django.db import connections, transaction
+from django.test.utils import CaptureQueriesContext
+
+
+SUPPORTED_VENDORS = {"sqlite", "postgresql"}
+
+# SQLite: "SCAN tracker_evangelism" (table) vs "SCAN tracker_evangelism USING INDEX ..." (index)
+_SQLITE_SCAN = re.compile(r"\bSCAN (?:TABLE )?(?P<table>[\w\"]+)(?P<rest>.*)$")
+_POSTGRES_SCAN = re.compile(r"\bSeq Scan on (?P<table>\w+)")
+
+
+def explain(sql, params=None, using="default"):
+    """Return the query plan of ``sql`` as a list of lines."""
+    connection = connections[using]
+    if connection.vendor not in SUPPORTED_VENDORS:
+        raise NotImplementedError(f"EXPLAIN checks are not implemented for {connection.vendor}")
+
+    with transaction.atomic(using=using), connection.cursor() as cursor:
+        if connection.vendor == "sqlite":
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            return [row[-1] for row in cursor.fetchall()]
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        cursor.execute(f"EXPLAIN {sql}", params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def table_scans(plan, vendor):
+    """Return the plan lines that read a whole table without an index."""
+    scans = []
+    for line in plan:
+        if vendor == "sqlite":
+            match = _SQLITE_SCAN.search(line)
+            if match and "USING" not in match["rest"] and match["table"] != "CONSTANT":
+                scans.append(line.strip())
+        elif _POSTGRES_SCAN.search(line):
+            scans.append(line.strip())
+    return scans
+
+
+def uses_index(plan, index_name):
+    """Whether any step of ``plan`` reads ``index_name``."""
+    return any(re.search(rf"\b{re.escape(index_name)}\b", line) for line in plan)
+
+
+def capture_table_scans(func, using="default"):
+    """Run ``func`` and explain each SELECT it issued.
+
+    Returns a dict mapping every SELECT that scans a table to its offending plan lines.
+    """
+    connection = connections[using]
+    with CaptureQueriesContext(connection) as queries:
+        func()
+
+    offenders = {}
+    for query in queries.captured_queries:
+        sql = query["sql"]
+        if not sql.lstrip().upper().startswith("SELECT"):
+            continue
+        scans = table_scans(explain(sql, using=using), connection.vendor)
+        if scans:
+            offenders[sql] = scans
+    return offenders
@@ -0,0 +1,88 @@
+"""Send the read-only pages' tracker queries to read replicas.
+
+``ReplicaRouter`` routes reads of tracker models to the replica chosen for
+the current request, and everything else (writes, sessions, users, any read
+outside such a request) to the primary ("default"). The choice is made by
+``tracker.middleware.ReplicaRoutingMiddleware`` for GET requests to views
+with ``replica_reads = True``, and only when settings.DATABASE_REPLICAS is
+not empty.
+
+Read-your-writes: when a request writes an Evangelism or a FollowUp, the
+middleware stores a deadline READ_YOUR_WRITES_SECONDS ahead in the session;
+until then that user's pages read from the primary, so they never see a
+replica that has not caught up with their own change. Every decision is
+logged to the ``tracker.routers`` logger.
+"""
+
+import contextlib
+import contextvars
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+PRIMARY = "default"
+# Writes to these pin the writer's session to the primary
+PINNING_MODELS = {"tracker.evangelism", "tracker.followup"}
+PINNED_UNTIL_SESSION_KEY = "_tracker_primary_until"
+
+
+@dataclass
+class RoutingState:
+    """Routing of the current request."""
+
+    # Alias tracker reads go to; None for the primary
+    replica: Optional[str] = None
+    # Whether the request wrote an Evangelism or a FollowUp
+    wrote: bool = False
+
+
+_state = contextvars.ContextVar("tracker_routing_state", default=None)
+
+
+def current_state() -> Optional[RoutingState]:
+    return _state.get()
+
+
+@contextlib.contextmanager
+def routing(replica=None):
+    """Route the enclosed code's tracker reads to ``replica``; yields the RoutingState."""
+    state = RoutingState(replica=replica)
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+
+
+def replicas():
+    return list(getattr(settings, "DATABASE_REPLICAS", []))
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is not None and state.replica and model._meta.app_label == "tracker":
+            return state.replica
+        return PRIMARY
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None and model._meta.label_lower in PINNING_MODELS:
+            state.wrote = True
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        databases = {PRIMARY, *replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get the schema from the primary through replication
+        return False if db in replicas() else None
@@ -0,0 +1,294 @@
+"""Indexed, typo-tolerant search over evangelisms.
+
+An evangelism is found by its person_name, location, course, description and
+the descriptions of its follow-ups. The index lives in the database and is
+kept current by the database itself, so every write path (forms, bulk
+imports, QuerySet.update, raw SQL) is covered:
+
+* SQLite: the ``tracker_evangelism_fts`` FTS5 table (trigram tokenizer),
+  maintained by triggers on tracker_evangelism and tracker_followup. Its
+  ``owner`` column holds a token per evangelist (see ``owner_key``).
+* PostgreSQL: GIN indexes on a ``tsvector`` of the evangelism's text, on the
+  follow-up descriptions and a pg_trgm index on person_name.
+
+Both are created by migration 0005_search; the SQLite statements live in
+migrations/_search_sql.py, and a post_migrate check recreates any trigger a
+later rebuild of tracker_evangelism dropped. ``search`` fetches up to
+``CANDIDATES`` of the user's rows from the index (on SQLite the ones holding
+every term, then, if those are too few, the ones holding a piece of every
+term that survives a typo; on PostgreSQL any word or a similar name) and
+ranks them in Python by edit distance, so "Jonh" still finds "John".
+``match_sql`` is the strict version (every term must appear) as a subquery of
+evangelism ids, for the admin.
+
+Any other database, or a SQLite build without FTS5, falls back to unindexed
+``icontains`` lookups.
+"""
+
+import re
+from typing import List, Optional, Tuple
+
+from django.db import connections
+from django.db.models import Q
+
+from .migrations._search_sql import FTS_TABLE
+from .models import Evangelism
+
+
+CANDIDATES = 200
+# One typo in a 4-letter word (0.75) passes, two do not
+SIMILARITY_THRESHOLD = 0.7
+# Fields compared with every query term, and how much a match in each counts.
+# Notes (description, follow-ups) only count whole substrings: comparing every word of a long note would be slow.
+FUZZY_FIELDS = (("person_name", 3.0), ("location", 2.0), ("course", 2.0))
+NOTE_FIELDS = (("description", 1.0), ("followups", 1.0))
+# The trigram tokenizer's token length: the shortest substring the index can find
+PIECE_LENGTH = 3
+
+# Must match the expression indexed by migration 0005_search
+POSTGRES_DOCUMENT = (
+    "to_tsvector('simple', coalesce(e.person_name, '') || ' ' || coalesce(e.location, '') || ' ' "
+    "|| coalesce(e.course, '') || ' ' || coalesce(e.description, ''))"
+)
+
+_WORD = re.compile(r"\w+")
+_fts_available = {}
+
+
+def terms(query) -> List[str]:
+    """The lower-cased words of a search query."""
+    return [term.lower() for term in _WORD.findall(query or "")]
+
+
+def edit_distance(a, b) -> int:
+    """Optimal string alignment distance: insertions, deletions, substitutions and adjacent swaps."""
+    previous2, previous = None, list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, char_b in enumerate(b, 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b),
+            )
+            if i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def similarity(a, b) -> float:
+    """1.0 for equal words, less the more edits it takes to turn one into the other."""
+    longest = max(len(a), len(b))
+    return 1 - edit_distance(a, b) / longest if longest else 1.0
+
+
+def _close_in_length(a, b) -> bool:
+    # Words whose lengths differ this much cannot reach SIMILARITY_THRESHOLD; skip the edit distance
+    return abs(len(a) - len(b)) <= max(len(a), len(b)) * (1 - SIMILARITY_THRESHOLD)
+
+
+def _fts_quote(text):
+    return '"' + text.replace('"', '""') + '"'
+
+
+def fts_available(using="default") -> bool:
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return False
+    key = connection.settings_dict["NAME"]
+    if key not in _fts_available:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+            _fts_available[key] = cursor.fetchone() is not None
+    return _fts_available[key]
+
+
+def _backend(using):
+    vendor = connections[using].vendor
+    if vendor == "postgresql":
+        return "postgresql"
+    if vendor == "sqlite" and fts_available(using):
+        return "sqlite"
+    return None
+
+
+def _score(query_terms, row) -> Optional[float]:
+    """Rank one candidate (a dict of its searchable text); None if some term matches nothing."""
+    fields = {name: (row.get(name) or "").lower() for name, _ in FUZZY_FIELDS + NOTE_FIELDS}
+    words = {}
+    total = 0.0
+    for term in query_terms:
+        best = max((weight for name, weight in FUZZY_FIELDS + NOTE_FIELDS if term in fields[name]), default=0.0)
+        for name, weight in FUZZY_FIELDS:
+            # Edit distances are the slow part: only work them out where they could beat the best match so far
+            if weight * SIMILARITY_THRESHOLD > best and term not in fields[name]:
+                if name not in words:
+                    words[name] = _WORD.findall(fields[name])
+                match = max((similarity(term, word) for word in words[name] if _close_in_length(term, word)),
+                            default=0.0)
+                if match >= SIMILARITY_THRESHOLD:
+                    best = max(best, match * weight)
+        if not best:
+            return None
+        total += best
+    return total
+
+
+def owner_key(user_id) -> str:
+    """The evangelist's token in the FTS table's ``owner`` column.
+
+    Three private-use characters, so the trigram tokenizer indexes it as a
+    single trigram no other user shares, and restricting a match to one user
+    happens inside the index. Must match OWNER_KEY in migrations/_search_sql.py.
+    """
+    return "".join(chr(0xE000 + digit) for digit in
+                   (user_id // 6400 // 6400 % 6400, user_id // 6400 % 6400, user_id % 6400))
+
+
+def _pieces(term) -> List[str]:
+    """Substrings of which a word with at most one typo of ``term`` contains at least one.
+
+    Long terms are split in two halves (a typo spoils only one of them). Short
+    ones give their trigrams and those of their spellings with a letter
+    dropped or two adjacent letters swapped, which covers every typo but some
+    wrong letters.
+    """
+    if len(term) >= 2 * PIECE_LENGTH:
+        middle = len(term) // 2
+        return [term[:middle], term[middle:]]
+    spellings = {term}
+    spellings.update(term[:i] + term[i + 1:] for i in range(len(term)))
+    spellings.update(term[:i] + term[i + 1] + term[i] + term[i + 2:] for i in range(len(term) - 1))
+    return sorted({spelling[i:i + PIECE_LENGTH] for spelling in spellings
+                   for i in range(len(spelling) - PIECE_LENGTH + 1)})
+
+
+def _sqlite_candidates(cursor, evangelist_id, query_terms, limit):
+    # The trigram index cannot match anything shorter than three characters; such terms only filter in _score
+    indexed = [term for term in query_terms if len(term) >= PIECE_LENGTH]
+    if not indexed:
+        return None
+    owner = f"owner : {_fts_quote(owner_key(evangelist_id))}"
+    sql = f"SELECT rowid, person_name, location, course, description, followups FROM {FTS_TABLE} " \
+          f"WHERE {FTS_TABLE} MATCH %s LIMIT %s"
+
+    # Rows containing every term as typed; bm25 is not used, ordering thousands of matches costs more than the search
+    cursor.execute(sql, [" AND ".join([owner] + [_fts_quote(term) for term in indexed]), CANDIDATES])
+    rows = cursor.fetchall()
+    if len(rows) >= limit:
+        return rows
+
+    # Too few: rows containing a piece of every term, for _score to rank by edit distance
+    fuzzy = " AND ".join(
+        [owner] + ["(" + " OR ".join(_fts_quote(piece) for piece in _pieces(term)) + ")" for term in indexed]
+    )
+    cursor.execute(sql, [fuzzy, CANDIDATES])
+    seen = {row[0] for row in rows}
+    return rows + [row for row in cursor.fetchall() if row[0] not in seen]
+
+
+def _postgres_candidates(cursor, evangelist_id, query):
+    cursor.execute(
+        f"""
+        SELECT e.id, e.person_name, e.location, e.course, e.description,
+               (SELECT string_agg(f.description, ' ') FROM tracker_followup f WHERE f.evangelism_id = e.id)
+        FROM tracker_evangelism e, plainto_tsquery('simple', %s) q
+        WHERE e.evangelist_id = %s AND (
+            {POSTGRES_DOCUMENT} @@ q
+            OR e.person_name %% %s
+            OR e.id IN (
+                SELECT f.evangelism_id FROM tracker_followup f WHERE to_tsvector('simple', f.description) @@ q
+            )
+        )
+        ORDER BY greatest(similarity(e.person_name, %s), ts_rank({POSTGRES_DOCUMENT}, q)) DESC
+        LIMIT %s
+        """,
+        [query, evangelist_id, query, query, CANDIDATES],
+    )
+    return cursor.fetchall()
+
+
+def _fallback_queryset(evangelist, query_terms):
+    queryset = Evangelism.objects.filter(evangelist=evangelist)
+    for term in query_terms:
+        queryset = queryset.filter(
+            Q(person_name__icontains=term) | Q(location__icontains=term) | Q(course__icontains=term)
+            | Q(description__icontains=term) | Q(followups__description__icontains=term)
+        )
+    return queryset.distinct().order_by("-date", "-pk")
+
+
+def search(evangelist, query, limit=20, using="default") -> List[Evangelism]:
+    """Return up to ``limit`` of the evangelist's evangelisms matching ``query``, best first.
+
+    Each result carries its rank as ``search_score``.
+    """
+    query_terms = terms(query)
+    if not query_terms:
+        return []
+
+    backend = _backend(using)
+    rows = None
+    with connections[using].cursor() as cursor:
+        if backend == "sqlite":
+            rows = _sqlite_candidates(cursor, evangelist.pk, query_terms, limit)
+        elif backend == "postgresql":
+            rows = _postgres_candidates(cursor, evangelist.pk, " ".join(query_terms))
+    if rows is None:
+        # No index to use, or only very short terms: plain substring matching on this user's rows
+        results = list(_fallback_queryset(evangelist, query_terms)[:limit])
+        for evangelism in results:
+            evangelism.search_score = None
+        return results
+
+    columns = ["pk", "person_name", "location", "course", "description", "followups"]
+    scored = []
+    for position, values in enumerate(rows):
+        row = dict(zip(columns, values))
+        score = _score(query_terms, row)
+        if score is not None:
+            scored.append((-score, position, row["pk"]))
+    scored.sort()
+    top = scored[:limit]
+    evangelisms = Evangelism.objects.in_bulk([pk for _, _, pk in top])
+    results = []
+    for negative_score, _, pk in top:
+        evangelism = evangelisms[pk]
+        evangelism.search_score = round(-negative_score, 3)
+        results.append(evangelism)
+    return results
+
+
+def match_sql(query, name_only=False, using="default") -> Optional[Tuple[str, list]]:
+    """SQL selecting the ids of evangelisms that contain every term of ``query``, or None.
+
+    With ``name_only`` only person_name is searched. None means there is no
+    index to use for this query (another database, or terms shorter than
+    three characters on SQLite), and callers should fall back to icontains.
+    """
+    query_terms = terms(query)
+    backend = _backend(using)
+    if not query_terms or backend is None:
+        return None
+
+    if backend == "sqlite":
+        if any(len(term) < 3 for term in query_terms):
+            return None
+        expression = " AND ".join(_fts_quote(term) for term in query_terms)
+        if name_only:
+            expression = f"person_name : ({expression})"
+        return f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [expression]
+
+    if name_only:
+        # Served by the pg_trgm index on person_name
+        patterns = ["%" + term.replace("\\", "\\\\").replace("_", "\\_") + "%" for term in query_terms]
+        conditions = " AND ".join(["e.person_name ILIKE %s"] * len(patterns))
+        return f"SELECT e.id FROM tracker_evangelism e WHERE {conditions}", patterns
+    query = " ".join(query_terms)
+    return (
+        f"SELECT e.id FROM tracker_evangelism e WHERE {POSTGRES_DOCUMENT} @@ plainto_tsquery('simple', %s) "
+        "UNION SELECT f.evangelism_id FROM tracker_followup f "
+        "WHERE to_tsvector('simple', f.description) @@ plainto_tsquery('simple', %s)",
+        [query, query],
+    )
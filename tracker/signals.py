@@ -0,0 +1,32 @@
+import logging
+
+from django.db import connections
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .cache import bump_data_version_on_commit
+from .migrations._search_sql import restore_triggers
+from .models import Evangelism
+
+
+logger = logging.getLogger(__name__)
+
+
+# Saves bump in the models, after the follow-up stats are refreshed. Deletes are caught here
+# so cascades (e.g. deleting a user) are covered; deleted follow-ups go with their evangelism
+@receiver(post_delete, sender=Evangelism)
+def evangelism_deleted(sender, instance, **kwargs):
+    bump_data_version_on_commit(instance.evangelist_id)
+
+
+# Connected to post_migrate in TrackerConfig.ready(). Any migration that makes SQLite rebuild
+# tracker_evangelism or tracker_followup drops the search triggers without an error; put them
+# back (and refill the index they stopped maintaining) rather than let search go stale.
+def restore_search_triggers(sender, using="default", **kwargs):
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        restored = restore_triggers(cursor)
+    if restored:
+        logger.warning("Recreated missing search triggers and refilled the index: %s", ", ".join(restored))
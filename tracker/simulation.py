@@ -0,0 +1,240 @@
+"""Vectorized re-implementation of the recommender for policy tuning.
+
+``recommend_indices`` makes exactly the decision ``recommend_activity`` makes
+(see ``utils._recommendation_querysets``), but for every evangelist at once over NumPy arrays, so
+a parameter set can be replayed over many simulated days for millions of
+contacts. ``simulate`` drives that loop and ``tracker.tests`` checks parity
+against the ORM path.
+
+Contacts are stored in flat arrays grouped by evangelist (``starts`` gives
+each group's offset) and, inside a group, ordered by (date, pk), so a
+contact's position breaks ties the way pk does in the recommender's queries.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from . import utils
+
+
+# Sort keys are packed into one int64:
+#   category (2 bits) | A (16) | B (16) | C (8) | rank within group (20)
+_RANK_BITS = 20
+_C_SHIFT = _RANK_BITS
+_B_SHIFT = _C_SHIFT + 8
+_A_SHIFT = _B_SHIFT + 16
+_CATEGORY_SHIFT = _A_SHIFT + 16
+_MAX_DAYS = (1 << 16) - 1
+_MAX_RELEVANCE = 8
+_INELIGIBLE = 3
+MAX_GROUP_SIZE = 1 << _RANK_BITS
+
+REASONS = list(utils.REASON_DETAILS)
+
+
+@dataclass(frozen=True)
+class Policy:
+    target: int = utils.FOLLOWUP_TARGET
+    interval_days: int = utils.FOLLOWUP_INTERVAL_DAYS
+    recent_window: int = utils.RECENT_TOUCH_WINDOW
+    min_days_before_second_touch: int = utils.MIN_DAYS_BEFORE_SECOND_TOUCH
+
+    @classmethod
+    def current(cls):
+        """Policy built from the constants recommend_activity uses right now."""
+        return cls(
+            utils.FOLLOWUP_TARGET,
+            utils.FOLLOWUP_INTERVAL_DAYS,
+            utils.RECENT_TOUCH_WINDOW,
+            utils.MIN_DAYS_BEFORE_SECOND_TOUCH,
+        )
+
+    def __post_init__(self):
+        if not 0 < self.target < 256:
+            raise ValueError("target must be between 1 and 255")
+
+    def __str__(self):
+        return (
+            f"target={self.target} interval={self.interval_days} "
+            f"recent={self.recent_window} min_gap={self.min_days_before_second_touch}"
+        )
+
+
+@dataclass
+class Contacts:
+    """Flat, group-ordered arrays describing every simulated contact."""
+    starts: np.ndarray          # offset of each evangelist's first contact
+    date: np.ndarray            # evangelism date as ordinal
+    relevance: np.ndarray
+    followup_count: np.ndarray
+    last_touch: np.ndarray      # last touch date as ordinal
+    active: np.ndarray          # not completed
+    pk: Optional[np.ndarray] = None
+
+    def __post_init__(self):
+        sizes = np.diff(np.append(self.starts, len(self.date)))
+        if len(sizes) and (sizes.min() < 1 or sizes.max() >= MAX_GROUP_SIZE):
+            raise ValueError(f"every evangelist needs between 1 and {MAX_GROUP_SIZE - 1} contacts")
+        self.group = np.repeat(np.arange(len(self.starts)), sizes)
+        self.position = np.arange(len(self.date)) - self.starts[self.group]
+        # Overdue ties prefer the newest record, so they need a second in-group ranking
+        by_newest = np.lexsort((self.position, -self.date, self.group))
+        self.newest_rank = np.empty_like(self.position)
+        self.newest_rank[by_newest] = np.arange(len(self.date)) - self.starts[self.group[by_newest]]
+        self.by_newest_rank = by_newest
+
+    @property
+    def size(self):
+        return len(self.date)
+
+
+def recommend_indices(policy: Policy, contacts: Contacts, today: int):
+    """Return (index, category) of the recommended contact for every evangelist.
+
+    ``index`` is -1 and ``category`` is 3 when the evangelist should start a new
+    evangelism; categories 0/1/2 match ``REASONS``.
+    """
+    c = contacts
+    if not len(c.starts):
+        return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+    days = np.clip(today - c.last_touch, -1, _MAX_DAYS).astype(np.int64)
+    count = c.followup_count.astype(np.int64)
+    inverted_relevance = _MAX_RELEVANCE - c.relevance.astype(np.int64)
+
+    eligible = c.active & (count < policy.target)
+    overdue = eligible & (days >= policy.interval_days)
+    waited = eligible & ~overdue & (days >= policy.min_days_before_second_touch)
+    cadence = waited & (days > policy.recent_window)
+    stagger = waited & ~cadence
+
+    category = np.full(c.size, _INELIGIBLE, dtype=np.int64)
+    category[overdue], category[cadence], category[stagger] = 0, 1, 2
+
+    # Per-category fields, laid out like the ORDER BY of utils._recommendation_querysets
+    a = np.where(overdue, _MAX_DAYS - days, count)
+    b = np.where(stagger, _MAX_DAYS - days, inverted_relevance)
+    c_field = np.where(stagger, inverted_relevance, np.where(overdue, count, 0))
+    rank = np.where(overdue, c.newest_rank, c.position)
+
+    key = (
+        (category << _CATEGORY_SHIFT)
+        | (a << _A_SHIFT)
+        | (b << _B_SHIFT)
+        | (c_field << _C_SHIFT)
+        | rank
+    )
+    key[category == _INELIGIBLE] = _INELIGIBLE << _CATEGORY_SHIFT
+    best = np.minimum.reduceat(key, c.starts)
+    best_category = best >> _CATEGORY_SHIFT
+    best_rank = best & (MAX_GROUP_SIZE - 1)
+    index = np.where(
+        best_category == 0,
+        c.by_newest_rank[np.minimum(c.starts + best_rank, c.size - 1)],
+        c.starts + best_rank,
+    )
+    index = np.where(best_category == _INELIGIBLE, -1, index)
+    return index, best_category
+
+
+def synthetic_contacts(evangelists, contacts_per_evangelist, today, past_days=90, target=7, seed=0):
+    """Random contacts shaped like real data, grouped and ordered as recommend_indices expects."""
+    rng = np.random.default_rng(seed)
+    sizes = np.maximum(1, rng.poisson(contacts_per_evangelist, evangelists))
+    total = int(sizes.sum())
+    group = np.repeat(np.arange(evangelists), sizes)
+    date = today - rng.integers(0, past_days + 1, total)
+    order = np.lexsort((date, group))
+    date = date[order]
+    last_touch = date + (rng.random(total) * (today - date + 1)).astype(np.int64)
+    return Contacts(
+        starts=np.concatenate(([0], np.cumsum(sizes)[:-1])),
+        date=date,
+        relevance=rng.integers(1, 5, total),
+        followup_count=rng.integers(0, target, total),
+        last_touch=np.minimum(last_touch, today),
+        active=np.ones(total, dtype=bool),
+    )
+
+
+def contacts_from_rows(rows):
+    """Build Contacts from (evangelist_id, pk, date, relevance, followup_count, last_touch_date) rows.
+
+    Rows must be ordered by (evangelist, date, pk) and contain active evangelisms only.
+    Returns the Contacts and the evangelist id of each group.
+    """
+    rows = list(rows)
+    evangelist_ids = np.array([row[0] for row in rows], dtype=np.int64)
+    starts = np.flatnonzero(np.diff(evangelist_ids, prepend=-1)) if rows else np.array([], dtype=np.int64)
+    return Contacts(
+        starts=starts,
+        pk=np.array([row[1] for row in rows], dtype=np.int64),
+        date=np.array([row[2].toordinal() for row in rows], dtype=np.int64),
+        relevance=np.array([row[3] for row in rows], dtype=np.int64),
+        followup_count=np.array([row[4] for row in rows], dtype=np.int64),
+        last_touch=np.array([(row[5] or row[2]).toordinal() for row in rows], dtype=np.int64),
+        active=np.ones(len(rows), dtype=bool),
+    ), evangelist_ids[starts]
+
+
+@dataclass
+class SimulationResult:
+    policy: Policy
+    days: int
+    contacts: int
+    followups: int
+    evangelize_days: int
+    coverage: float             # share of contacts that got at least one simulated follow-up
+    target_reached: float       # share of contacts at the follow-up target at the end
+    max_neglect_days: int       # longest gap seen for a contact still below target
+    distribution: list          # contacts per final follow-up count (0..target)
+
+    def as_dict(self):
+        return {
+            "policy": str(self.policy),
+            "days": self.days,
+            "contacts": self.contacts,
+            "followups": self.followups,
+            "evangelize_days": self.evangelize_days,
+            "coverage": round(self.coverage, 4),
+            "target_reached": round(self.target_reached, 4),
+            "max_neglect_days": self.max_neglect_days,
+            "distribution": self.distribution,
+        }
+
+
+def simulate(policy: Policy, contacts: Contacts, start: int, days: int, compliance=1.0, seed=0):
+    """Replay the recommender for ``days`` days; each evangelist follows the advice with probability ``compliance``."""
+    rng = np.random.default_rng(seed)
+    count = contacts.followup_count.copy()
+    last_touch = contacts.last_touch.copy()
+    state = Contacts(contacts.starts, contacts.date, contacts.relevance, count, last_touch, contacts.active)
+    touched = np.zeros(contacts.size, dtype=bool)
+    max_neglect = 0
+    followups = evangelize_days = 0
+
+    for today in range(start, start + days):
+        waiting = contacts.active & (count < policy.target)
+        if waiting.any():
+            max_neglect = max(max_neglect, int((today - last_touch[waiting]).max()))
+
+        index, _ = recommend_indices(policy, state, today)
+        evangelize_days += int((index < 0).sum())
+        acted = index[(index >= 0) & (rng.random(len(index)) < compliance)]
+        count[acted] += 1
+        last_touch[acted] = today
+        touched[acted] = True
+        followups += len(acted)
+
+    return SimulationResult(
+        policy=policy,
+        days=days,
+        contacts=contacts.size,
+        followups=followups,
+        evangelize_days=evangelize_days,
+        coverage=float(touched.mean()) if contacts.size else 0.0,
+        target_reached=float((count >= policy.target).mean()) if contacts.size else 0.0,
+        max_neglect_days=max_neglect,
+        distribution=np.bincount(np.minimum(count, policy.target), minlength=policy.target + 1).tolist(),
+    )
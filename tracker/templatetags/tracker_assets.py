@@ -0,0 +1,61 @@
+"""Self-hosted page assets: the built stylesheet bundle and avatar images.
+
+``npm run build`` writes the Tailwind stylesheet and the vendored flatpickr
+files under tracker/static/tracker/build/ (see README). Until it has been
+run, ``asset_bundle_built`` is False and base.html falls back to the CDNs,
+so a fresh checkout still renders.
+
+``avatar`` draws a user's initials as an inline SVG, so the header needs no
+image request at all; the markup is cached per name, size and colours.
+"""
+
+from functools import lru_cache
+
+from django import template
+from django.contrib.staticfiles import finders
+from django.utils.html import format_html
+
+
+register = template.Library()
+
+BUNDLE = "tracker/build/app.css"
+
+
+@lru_cache(maxsize=None)
+def bundle_built() -> bool:
+    # Checked once per process: restart the server after building
+    return finders.find(BUNDLE) is not None
+
+
+@register.simple_tag
+def asset_bundle_built():
+    return bundle_built()
+
+
+def initials(name) -> str:
+    """The first letters of the first two words, or the first two letters of a single word."""
+    words = name.replace("_", " ").replace(".", " ").split()
+    if not words:
+        return "?"
+    if len(words) == 1:
+        return words[0][:2].upper()
+    return (words[0][0] + words[1][0]).upper()
+
+
+@lru_cache(maxsize=1024)
+def avatar_svg(name, size, background, color, css_class):
+    return format_html(
+        '<svg xmlns="http://www.w3.org/2000/svg" width="{size}" height="{size}" viewBox="0 0 {size} {size}" '
+        'role="img" aria-label="{name}" class="{css_class}">'
+        '<circle cx="{half}" cy="{half}" r="{half}" fill="{background}"/>'
+        '<text x="50%" y="50%" dy=".35em" text-anchor="middle" fill="{color}" font-size="{font_size}" '
+        'font-family="ui-sans-serif, system-ui, sans-serif" font-weight="600">{initials}</text></svg>',
+        size=size, half=size / 2, name=name, css_class=css_class, background=background, color=color,
+        font_size=round(size * 0.42), initials=initials(name),
+    )
+
+
+@register.simple_tag
+def avatar(name, size=32, background="#0891b2", color="#ffffff", css_class=""):
+    """{% avatar user.username 40 background="#fff" color="#0891b2" css_class="rounded-full" %}"""
+    return avatar_svg(str(name), int(size), background, color, css_class)
@@ -0,0 +1,111 @@
+"""Test helpers that catch N+1 query patterns.
+
+``detect_n_plus_one`` watches every SQL statement run inside it (through
+``connection.execute_wrapper``) and raises ``NPlusOneError`` when the same
+statement shape repeats more than ``max_repeats`` times - the signature of a
+loop issuing one query per row. Statement shapes ignore parameter values and
+the length of ``IN (...)`` lists, so "SELECT ... WHERE id = %s" run for ten
+different ids counts as ten repeats. The error carries the application stack
+of the first repeat so the offending loop is easy to find.
+
+``SHARED_CACHE`` are settings for tests that count queries as a multi-worker
+deployment runs them: sessions and the logged-in user are only cached when
+the cache is shared between workers (see user.backends).
+"""
+
+import atexit
+import re
+import shutil
+import tempfile
+import traceback
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+
+DEFAULT_MAX_REPEATS = 2
+
+# A file cache stands in for a shared one (CACHE_BACKEND=file or database); use with override_settings
+_SHARED_CACHE_DIR = tempfile.mkdtemp(prefix="followup-buddy-cache-")
+atexit.register(shutil.rmtree, _SHARED_CACHE_DIR, ignore_errors=True)
+SHARED_CACHE = {
+    "CACHES": {
+        "default": {"BACKEND": "django.core.cache.backends.filebased.FileBasedCache", "LOCATION": _SHARED_CACHE_DIR},
+    },
+    "SESSION_ENGINE": "django.contrib.sessions.backends.cached_db",
+}
+
+_IN_LIST = re.compile(r"IN \((?:%s, )*%s\)")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+\b")
+
+
+class NPlusOneError(AssertionError):
+    pass
+
+
+def normalize_sql(sql):
+    """Reduce a statement to its shape: parameters, literals and IN-list lengths removed."""
+    sql = _IN_LIST.sub("IN (...)", sql)
+    return _LITERAL.sub("?", sql)
+
+
+def _application_stack():
+    """The current stack, limited to frames from this project (not Django or other packages)."""
+    base_dir = str(settings.BASE_DIR)
+    frames = [
+        frame for frame in traceback.extract_stack()[:-2]
+        if frame.filename.startswith(base_dir) and "site-packages" not in frame.filename
+    ]
+    return "".join(traceback.format_list(frames))
+
+
+class QueryRecorder:
+    def __init__(self, max_repeats):
+        self.max_repeats = max_repeats
+        self.counts = defaultdict(int)
+        self.stacks = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        shape = normalize_sql(sql)
+        self.counts[shape] += 1
+        if self.counts[shape] == 2:
+            self.stacks[shape] = _application_stack()
+        return execute(sql, params, many, context)
+
+    def repeated(self):
+        return {shape: n for shape, n in self.counts.items() if n > self.max_repeats}
+
+
+@contextmanager
+def detect_n_plus_one(max_repeats=DEFAULT_MAX_REPEATS, using=None):
+    """Fail with NPlusOneError if any statement shape runs more than ``max_repeats`` times."""
+    recorder = QueryRecorder(max_repeats)
+    aliases = [using] if using else list(connections)
+    with ExitStack() as stack:
+        for alias in aliases:
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+        yield recorder
+
+    repeated = recorder.repeated()
+    if repeated:
+        shape, count = max(repeated.items(), key=lambda item: item[1])
+        raise NPlusOneError(
+            f"Possible N+1: the same query ran {count} times (allowed {max_repeats}):\n"
+            f"  {shape}\n"
+            f"First repeated at:\n{recorder.stacks[shape] or '  (no application frames)'}"
+        )
+
+
+class NPlusOneTestMixin:
+    """TestCase mixin with query-count assertions that also reject N+1 patterns."""
+
+    def assertNoNPlusOne(self, max_repeats=DEFAULT_MAX_REPEATS):
+        return detect_n_plus_one(max_repeats=max_repeats)
+
+    @contextmanager
+    def assertQueryBudget(self, num, max_repeats=DEFAULT_MAX_REPEATS):
+        """assertNumQueries(num) plus the N+1 check."""
+        with self.assertNumQueries(num), detect_n_plus_one(max_repeats=max_repeats):
+            yield
@@ -1,3 +1,1431 @@
-from django.test import TestCase
+import csv
+import datetime
+import gzip
+import json
+import random
+import tempfile
+import unittest
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import iscoroutinefunction, sync_to_async
+
+from django.contrib.auth.models import User
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.core.management.sql import emit_post_migrate_signal
+from django.db import connection
+from django.test import LiveServerTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from . import cache as cache_module
+from .cache import cache_stats
+from . import exporter, loadtest, metrics, pagination, queryplan, routers, search, utils
+from .benchmarks import find_regressions, run_benchmarks
+from .forms import FollowUpForm
+from .importer import Importer
+from .middleware import PerformanceMiddleware
+from .migrations import _search_sql
+from .models import DailyActivity, Evangelism, FollowUp
+from .templatetags import tracker_assets
+from .testing import SHARED_CACHE, NPlusOneError, NPlusOneTestMixin, detect_n_plus_one
+from .utils import FOLLOWUP_INTERVAL_DAYS, activity_counts_by_day, activity_streaks, dashboard_stats, recommend_activity, recommend_queue, year_heatmap
+
+try:
+    from . import simulation
+except ImportError:  # NumPy is optional
+    simulation = None
+
+
+@override_settings(**SHARED_CACHE)
+class TrackerTestCase(TestCase):
+    """TestCase that starts every test with an empty shared cache (user ids are reused between tests)."""
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+
+
+def make_evangelism(user, name, date, faith="unknown", **extra):
+    return Evangelism.objects.create(
+        evangelist=user, person_name=name, location="Campus", date=date, faith=faith, **extra
+    )
+
+
+class CalendarViewTests(TrackerTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("evangelist", password="password123")
+        cls.other = User.objects.create_user("other", password="password123")
+        first = make_evangelism(cls.user, "Ada", datetime.date(2025, 3, 3))
+        make_evangelism(cls.user, "Bola", datetime.date(2025, 3, 3))
+        FollowUp.objects.create(evangelism=first, date=datetime.date(2025, 3, 3))
+        FollowUp.objects.create(evangelism=first, date=datetime.date(2025, 3, 10))
+        make_evangelism(cls.other, "Chidi", datetime.date(2025, 3, 10))
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def test_counts_are_split_by_activity_type(self):
+        counts = activity_counts_by_day(self.user, datetime.date(2025, 3, 1), datetime.date(2025, 3, 31))
+        self.assertEqual(counts, {
+            datetime.date(2025, 3, 3): {"evangelisms": 2, "followups": 1},
+            datetime.date(2025, 3, 10): {"evangelisms": 0, "followups": 1},
+        })
+
+    def test_month_grid_carries_counts(self):
+        response = self.client.get(reverse("activity_calendar", args=[2025, 3]))
+        days = {d["day"]: d for d in response.context["calendar_days"]}
+        self.assertEqual(len(days), 31)
+        self.assertEqual((days[3]["evangelism_count"], days[3]["followup_count"]), (2, 1))
+        self.assertEqual(days[3]["intensity"], 4)
+        self.assertTrue(days[10]["has_activity"])
+        self.assertFalse(days[11]["has_activity"])
+        self.assertEqual(days[11]["intensity"], 0)
+
+    def test_query_count_does_not_depend_on_month_length(self):
+        self.client.get(reverse("activity_calendar", args=[2025, 2]))  # warm session/user caches
+        with self.assertNumQueries(1):  # the month's counts; session and user come from the cache
+            self.client.get(reverse("activity_calendar", args=[2025, 2]))
+        with self.assertNumQueries(1):
+            self.client.get(reverse("activity_calendar", args=[2025, 3]))
+
+
+class FollowUpStatsTests(TrackerTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("evangelist", password="password123")
+
+    def setUp(self):
+        super().setUp()
+        self.evangelism = make_evangelism(self.user, "Ada", datetime.date(2025, 1, 1))
+        self.other = make_evangelism(self.user, "Bola", datetime.date(2025, 1, 5))
+
+    def assertStats(self, evangelism, count, last_followup, last_touch):
+        evangelism.refresh_from_db()
+        self.assertEqual(
+            (evangelism.followup_count, evangelism.last_followup_date, evangelism.last_touch_date),
+            (count, last_followup, last_touch),
+        )
+
+    def test_new_evangelism_touches_on_its_own_date(self):
+        self.assertStats(self.evangelism, 0, None, datetime.date(2025, 1, 1))
+
+    def test_create_edit_and_delete(self):
+        followup = FollowUp.objects.create(evangelism=self.evangelism, date=datetime.date(2025, 1, 8))
+        FollowUp.objects.create(evangelism=self.evangelism, date=datetime.date(2025, 1, 3))
+        self.assertStats(self.evangelism, 2, datetime.date(2025, 1, 8), datetime.date(2025, 1, 8))
+
+        followup.evangelism = self.other
+        followup.save()
+        self.assertStats(self.evangelism, 1, datetime.date(2025, 1, 3), datetime.date(2025, 1, 3))
+        self.assertStats(self.other, 1, datetime.date(2025, 1, 8), datetime.date(2025, 1, 8))
+
+        followup.delete()
+        self.assertStats(self.other, 0, None, datetime.date(2025, 1, 5))
+
+    def test_bulk_operations(self):
+        FollowUp.objects.bulk_create([
+            FollowUp(evangelism=self.evangelism, date=datetime.date(2025, 2, day)) for day in range(1, 4)
+        ])
+        self.assertStats(self.evangelism, 3, datetime.date(2025, 2, 3), datetime.date(2025, 2, 3))
+
+        FollowUp.objects.filter(evangelism=self.evangelism).update(date=datetime.date(2025, 2, 9))
+        self.assertStats(self.evangelism, 3, datetime.date(2025, 2, 9), datetime.date(2025, 2, 9))
+
+        FollowUp.objects.filter(evangelism=self.evangelism).delete()
+        self.assertStats(self.evangelism, 0, None, datetime.date(2025, 1, 1))
+
+        Evangelism.objects.filter(pk=self.evangelism.pk).update(date=datetime.date(2025, 1, 2))
+        self.assertStats(self.evangelism, 0, None, datetime.date(2025, 1, 2))
+
+    def test_saving_a_stale_instance_keeps_the_stats(self):
+        stale = Evangelism.objects.get(pk=self.evangelism.pk)
+        FollowUp.objects.create(evangelism_id=self.evangelism.pk, date=datetime.date(2025, 1, 8))
+        stale.description = "Met again"
+        stale.save()
+        self.assertStats(stale, 1, datetime.date(2025, 1, 8), datetime.date(2025, 1, 8))
+
+        stale.date = datetime.date(2025, 1, 2)
+        stale.save()
+        self.assertEqual(stale.followup_count, 1)
+        self.assertStats(stale, 1, datetime.date(2025, 1, 8), datetime.date(2025, 1, 8))
+
+    def test_form_save_does_not_overwrite_stats(self):
+        form = FollowUpForm(data={
+            "evangelism": self.evangelism.pk, "description": "Prayed together", "date": "2025-01-09", "completed": "on",
+        })
+        form.fields["evangelism"].queryset = Evangelism.objects.all()
+        self.assertTrue(form.is_valid(), form.errors)
+        form.save()
+        self.assertStats(self.evangelism, 1, datetime.date(2025, 1, 9), datetime.date(2025, 1, 9))
+        self.assertTrue(self.evangelism.completed)
+
+    def test_rebuild_command_repairs_stale_rows(self):
+        FollowUp.objects.create(evangelism=self.evangelism, date=datetime.date(2025, 1, 8))
+        Evangelism.objects.filter(pk=self.evangelism.pk).update(followup_count=5, last_followup_date=None)
+        with self.assertRaises(CommandError):
+            call_command("rebuild_followup_stats", verify=True, stdout=StringIO())
+        call_command("rebuild_followup_stats", stdout=StringIO())
+        call_command("rebuild_followup_stats", verify=True, stdout=StringIO())
+        self.assertStats(self.evangelism, 1, datetime.date(2025, 1, 8), datetime.date(2025, 1, 8))
+
+
+class DailyActivityTests(TrackerTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("evangelist", password="password123")
+        cls.other = User.objects.create_user("other", password="password123")
+
+    def assertRollup(self, user, expected):
+        rows = DailyActivity.objects.filter(evangelist=user).values_list("date", "evangelisms", "followups")
+        self.assertEqual({date: (e, f) for date, e, f in rows}, expected)
+        call_command("rebuild_daily_activity", verify=True, stdout=StringIO())
+
+    def test_instance_writes(self):
+        jan = lambda day: datetime.date(2025, 1, day)
+        ada = make_evangelism(self.user, "Ada", jan(1))
+        followup = FollowUp.objects.create(evangelism=ada, date=jan(1))
+        FollowUp.objects.create(evangelism=ada, date=jan(3))
+        self.assertRollup(self.user, {jan(1): (1, 1), jan(3): (0, 1)})
+
+        followup.date = jan(3)
+        followup.save()
+        ada.date = jan(2)
+        ada.save()
+        self.assertRollup(self.user, {jan(2): (1, 0), jan(3): (0, 2)})
+
+        ada.evangelist = self.other
+        ada.save()
+        self.assertRollup(self.user, {})
+        self.assertRollup(self.other, {jan(2): (1, 0), jan(3): (0, 2)})
+
+        followup.delete()
+        self.assertRollup(self.other, {jan(2): (1, 0), jan(3): (0, 1)})
+        ada.delete()
+        self.assertRollup(self.other, {})
+
+    def test_bulk_operations(self):
+        feb = lambda day: datetime.date(2025, 2, day)
+        ada, _, _ = Evangelism.objects.bulk_create([
+            Evangelism(evangelist=self.user, person_name=name, location="Campus", date=date, faith="unknown")
+            for name, date in [("Ada", feb(1)), ("Bola", feb(1)), ("Chidi", feb(2))]
+        ])
+        FollowUp.objects.bulk_create([FollowUp(evangelism=ada, date=feb(day)) for day in (2, 3, 3)])
+        self.assertRollup(self.user, {feb(1): (2, 0), feb(2): (1, 1), feb(3): (0, 2)})
+
+        FollowUp.objects.filter(date=feb(3)).update(date=feb(4))
+        Evangelism.objects.filter(person_name="Chidi").update(date=feb(4))
+        self.assertRollup(self.user, {feb(1): (2, 0), feb(2): (0, 1), feb(4): (1, 2)})
+
+        FollowUp.objects.filter(date=feb(2)).delete()
+        Evangelism.objects.filter(person_name="Ada").delete()  # takes its follow-ups along
+        self.assertRollup(self.user, {feb(1): (1, 0), feb(4): (1, 0)})
+
+    def test_rebuild_command_repairs_stale_rows(self):
+        make_evangelism(self.user, "Ada", datetime.date(2025, 3, 1))
+        DailyActivity.objects.update(evangelisms=5)
+        DailyActivity.objects.create(evangelist=self.other, date=datetime.date(2025, 3, 2), followups=1)
+        with self.assertRaises(CommandError):
+            call_command("rebuild_daily_activity", verify=True, stdout=StringIO())
+        call_command("rebuild_daily_activity", stdout=StringIO())
+        self.assertRollup(self.user, {datetime.date(2025, 3, 1): (1, 0)})
+        self.assertRollup(self.other, {})
+
+
+class YearHeatmapTests(TrackerTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("evangelist", password="password123")
+        ada = make_evangelism(cls.user, "Ada", datetime.date(2025, 1, 1))
+        for day in (2, 3, 4, 10, 11):
+            FollowUp.objects.create(evangelism=ada, date=datetime.date(2025, 1, day))
+        FollowUp.objects.create(evangelism=ada, date=datetime.date(2025, 1, 11))
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def test_year_is_laid_out_in_monday_first_weeks(self):
+        heatmap = year_heatmap(self.user, 2025)
+        cells = [cell for week in heatmap["weeks"] for cell in week if cell]
+        self.assertEqual(len(cells), 365)
+        self.assertTrue(all(len(week) == 7 for week in heatmap["weeks"]))
+        # 2025-01-01 is a Wednesday
+        self.assertEqual(heatmap["weeks"][0][:2], [None, None])
+        self.assertEqual(heatmap["weeks"][0][2]["date"], datetime.date(2025, 1, 1))
+        by_date = {cell["date"]: cell for cell in cells}
+        self.assertEqual((by_date[datetime.date(2025, 1, 11)]["total"], by_date[datetime.date(2025, 1, 11)]["level"]), (2, 4))
+        self.assertEqual(by_date[datetime.date(2025, 1, 2)]["level"], 2)
+        self.assertEqual((heatmap["active_days"], heatmap["evangelisms"], heatmap["followups"]), (6, 1, 6))
+
+    def test_streaks(self):
+        self.assertEqual(activity_streaks(self.user, datetime.date(2025, 1, 12)),
+                         {"current": 2, "longest": 4, "last_active": datetime.date(2025, 1, 11)})
+        self.assertEqual(activity_streaks(self.user, datetime.date(2025, 1, 13))["current"], 0)
+        # Days after "today" don't count yet
+        self.assertEqual(activity_streaks(self.user, datetime.date(2025, 1, 3))["current"], 3)
+
+    def test_page_reads_only_the_rollup(self):
+        self.client.get(reverse("activity_year", args=[2025]))
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(reverse("activity_year", args=[2025]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(captured), 2)  # the year's days, the streak dates; session and user are cached
+        self.assertTrue(all("tracker_dailyactivity" in query["sql"] for query in captured))
+        self.assertEqual(response.context["heatmap"]["active_days"], 6)
+        self.assertEqual(self.client.get(reverse("activity_year")).status_code, 200)
+
+    def test_years_outside_the_date_range_are_not_found(self):
+        self.assertEqual(self.client.get(reverse("activity_year", args=[0])).status_code, 404)
+        self.assertEqual(self.client.get(reverse("activity_year", args=[10000])).status_code, 404)
+        first = self.client.get(reverse("activity_year", args=[1]))
+        self.assertEqual((first.status_code, first.context["heatmap"]["year"], first.context["prev_year"]), (200, 1, None))
+        last = self.client.get(reverse("activity_year", args=[9999]))
+        self.assertEqual((last.status_code, last.context["heatmap"]["year"], last.context["next_year"]), (200, 9999, None))
+
+
+class RecommendQueueTests(TrackerTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("evangelist", password="password123")
+        today = datetime.date.today()
+        cls.overdue = make_evangelism(cls.user, "Overdue", today - datetime.timedelta(days=10), faith="less_faith")
+        cls.very_overdue = make_evangelism(cls.user, "Very overdue", today - datetime.timedelta(days=20))
+        cls.cadence = make_evangelism(cls.user, "Cadence", today - datetime.timedelta(days=4))
+        cls.recent = make_evangelism(cls.user, "Recent", today - datetime.timedelta(days=1))
+        make_evangelism(cls.user, "Today", today)
+        make_evangelism(cls.user, "Done", today - datetime.timedelta(days=30), completed=True)
+
+    def test_queue_is_ranked_by_category_then_tie_breaks(self):
+        queue = recommend_queue(self.user, k=10)
+        self.assertEqual(
+            [(r.evangelism, r.reason) for r in queue],
+            [
+                (self.very_overdue, "overdue_followup"),
+                (self.overdue, "overdue_followup"),
+                (self.cadence, "build_cadence"),
+                (self.recent, "stagger_recent"),
+            ],
+        )
+        self.assertEqual([r.evangelism for r in recommend_queue(self.user, k=2)], [self.very_overdue, self.overdue])
+
+    def test_only_the_shown_fields_are_loaded(self):
+        with CaptureQueriesContext(connection) as queries:
+            queue = recommend_queue(self.user, k=10)
+        self.assertNotIn('"description"', queries[0]["sql"].split(" FROM ")[0])
+        with self.assertNumQueries(0):
+            for r in queue:
+                (r.evangelism.pk, r.evangelism.person_name, r.evangelism.location, r.evangelism.get_faith_display(),
+                 r.evangelism.followup_count, r.evangelism.last_touch_date)
+
+    def test_days_are_counted_in_local_time(self):
+        # 23:30 UTC yesterday is already today in Lagos (UTC+1): a full interval since the last touch there, not in UTC
+        today = datetime.date.today()
+        late_evening_utc = datetime.datetime.combine(today - datetime.timedelta(days=1), datetime.time(23, 30),
+                                                     tzinfo=datetime.timezone.utc)
+        touched = today - datetime.timedelta(days=FOLLOWUP_INTERVAL_DAYS)
+        Evangelism.objects.filter(pk=self.overdue.pk).update(date=touched, last_touch_date=touched)
+        with override_settings(TIME_ZONE="Africa/Lagos"), mock.patch("django.utils.timezone.now",
+                                                                     return_value=late_evening_utc):
+            reasons = {r.evangelism: r.reason for r in recommend_queue(self.user, k=10)}
+        self.assertEqual(reasons[self.overdue], "overdue_followup")
+
+    def test_recommend_activity_is_the_head_of_the_queue(self):
+        recommended = recommend_activity(self.user)
+        self.assertEqual(recommended, self.very_overdue)
+        self.assertEqual(recommended.recommendation_reason, "overdue_followup")
+        self.assertIsNone(recommend_activity(None))
+
+    def test_today_plan_page(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("today-plan"), {"k": 3})
+        self.assertEqual(len(response.context["plan"]), 3)
+        self.assertContains(response, "Very overdue")
+
+
+class HomeCacheTests(TrackerTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("evangelist", password="password123")
+        cls.staff = User.objects.create_user("admin", password="password123", is_staff=True)
+        cls.evangelism = make_evangelism(cls.user, "Ada", datetime.date.today() - datetime.timedelta(days=9))
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def test_second_request_is_served_from_cache(self):
+        before = cache_stats()
+        first = self.client.get(reverse("home"))
+        with self.assertNumQueries(0):  # session and user are cached too
+            second = self.client.get(reverse("home"))
+        self.assertEqual(first.context["followup"], second.context["followup"])
+        self.assertEqual(second.context["total_evangelism"], 1)
+        after = cache_stats()
+        self.assertEqual(after["hits"] - before["hits"], 1)
+        self.assertEqual(after["misses"] - before["misses"], 1)
+
+    def test_writes_invalidate_the_cached_result(self):
+        self.assertEqual(self.client.get(reverse("home")).context["total_followup"], 0)
+        # Versions are bumped once the write commits
+        with self.captureOnCommitCallbacks(execute=True):
+            followup = FollowUp.objects.create(evangelism=self.evangelism, date=datetime.date.today())
+        self.assertEqual(self.client.get(reverse("home")).context["total_followup"], 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            FollowUp.objects.bulk_create([FollowUp(evangelism=self.evangelism, date=datetime.date.today())])
+        self.assertEqual(self.client.get(reverse("home")).context["total_followup"], 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            followup.delete()
+        self.assertEqual(self.client.get(reverse("home")).context["total_followup"], 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            Evangelism.objects.filter(pk=self.evangelism.pk).update(completed=True)
+        self.assertIsNone(self.client.get(reverse("home")).context["followup"])
+
+    def test_version_is_bumped_after_the_stats_are_refreshed(self):
+        self.assertEqual(self.client.get(reverse("home")).context["followup"], self.evangelism)  # overdue
+        real_bump = cache_module.bump_data_version
+
+        def bump_then_read(*user_ids):
+            # A concurrent home page request right after the bump caches what it sees
+            version = real_bump(*user_ids)
+            self.client.get(reverse("home"))
+            return version
+
+        today = datetime.date.today()
+        with mock.patch.object(cache_module, "bump_data_version", side_effect=bump_then_read):
+            with self.captureOnCommitCallbacks(execute=True):
+                FollowUp.objects.create(evangelism_id=self.evangelism.pk, date=today)
+        # Touched today: no longer recommended
+        self.assertIsNone(self.client.get(reverse("home")).context["followup"])
+
+    def test_stats_endpoint_is_staff_only(self):
+        self.assertEqual(self.client.get(reverse("cache-stats")).status_code, 403)
+        self.client.force_login(self.staff)
+        self.assertEqual(set(self.client.get(reverse("cache-stats")).json()), {"hits", "misses", "hit_rate"})
+
+
+class HomeDashboardTests(TrackerTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("evangelist", password="password123")
+        cls.today = datetime.date(2026, 10, 15)  # a Thursday
+        ada = make_evangelism(cls.user, "Ada", datetime.date(2026, 9, 20), faith="strong_faith")
+        make_evangelism(cls.user, "Bo", datetime.date(2026, 10, 1), faith="unbeliever", completed=True)
+        make_evangelism(cls.user, "Cy", datetime.date(2026, 10, 2), faith="unbeliever")
+        for date in [datetime.date(2026, 9, 25), datetime.date(2026, 10, 5), datetime.date(2026, 10, 13)]:
+            FollowUp.objects.create(evangelism=ada, date=date)
+        other = User.objects.create_user("other", password="password123")
+        FollowUp.objects.create(evangelism=make_evangelism(other, "Ada", cls.today), date=cls.today)
+
+    def test_dashboard_stats(self):
+        stats = dashboard_stats(self.user, today=self.today)
+        self.assertEqual(stats["total_evangelism"], 3)
+        self.assertEqual(stats["active_evangelism"], 2)
+        self.assertEqual(stats["completed_evangelism"], 1)
+        self.assertEqual(stats["total_followup"], 3)
+        self.assertEqual(stats["followups_this_week"], 1)
+        self.assertEqual(stats["followups_this_month"], 2)
+        self.assertEqual(
+            [(key, count) for key, _, count in stats["faith_counts"]],
+            [("strong_faith", 1), ("less_faith", 0), ("unbeliever", 2), ("unknown", 0)],
+        )
+
+    def test_home_query_count_does_not_grow_with_data(self):
+        self.client.force_login(self.user)
+        # user (the session is cached since login), overdue recommendations (enough to fill the queue),
+        # dashboard aggregate
+        with self.assertNumQueries(3):
+            self.client.get(reverse("home"))
+        with self.captureOnCommitCallbacks(execute=True):
+            for i in range(20):
+                evangelism = make_evangelism(self.user, f"Extra {i}", self.today, faith="less_faith")
+                FollowUp.objects.create(evangelism=evangelism, date=self.today)
+        with self.assertNumQueries(2):  # the user is cached now
+            response = self.client.get(reverse("home"))
+        self.assertEqual(response.context["total_evangelism"], 23)
+        self.assertContains(response, 'data-faith="less_faith"')
+
+
+class ListingPaginationTests(TrackerTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("evangelist", password="password123")
+        start = datetime.date(2026, 1, 1)
+        faiths = list(Evangelism.FAITH_STATUS)
+        for i in range(45):
+            # Three evangelisms per day, so pages have to break ties on pk
+            make_evangelism(
+                cls.user, f"Person {i}", start + datetime.timedelta(days=i // 3),
+                faith=faiths[i % 4], completed=i % 5 == 0,
+            )
+        other = User.objects.create_user("other", password="password123")
+        make_evangelism(other, "Someone else", start)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def walk(self, **params):
+        seen, cursor = [], None
+        while True:
+            query = dict(params, **({"cursor": cursor} if cursor else {}))
+            response = self.client.get(reverse("evangelism-listing"), query)
+            seen.extend(e.pk for e in response.context["evangelisms"])
+            cursor = response.context["next_cursor"]
+            if cursor is None:
+                return seen
+
+    def test_pages_cover_every_evangelism_once_newest_first(self):
+        expected = list(
+            Evangelism.objects.filter(evangelist=self.user).order_by("-date", "-pk").values_list("pk", flat=True)
+        )
+        self.assertEqual(self.walk(), expected)
+
+    def test_filters(self):
+        ongoing_strong = Evangelism.objects.filter(evangelist=self.user, faith="strong_faith", completed=False)
+        self.assertEqual(
+            sorted(self.walk(faith="strong_faith", status="ongoing")), sorted(e.pk for e in ongoing_strong)
+        )
+        in_range = Evangelism.objects.filter(
+            evangelist=self.user, date__range=(datetime.date(2026, 1, 3), datetime.date(2026, 1, 5))
+        )
+        self.assertEqual(sorted(self.walk(start="2026-01-03", end="2026-01-05")), sorted(e.pk for e in in_range))
+
+    def test_feed_returns_the_next_fragment(self):
+        first = self.client.get(reverse("evangelism-listing"))
+        feed = self.client.get(reverse("evangelism-feed"), {"cursor": first.context["next_cursor"]}).json()
+        self.assertEqual(feed["count"], 20)
+        self.assertIsNotNone(feed["next_cursor"])
+        self.assertIn(reverse("evangelism-detail", args=[first.context["evangelisms"][-1].pk - 1]), feed["html"])
+        self.assertEqual(self.client.get(reverse("evangelism-feed"), {"cursor": "2026-13-01_4"}).status_code, 400)
+
+    def test_deep_pages_cost_the_same_as_the_first(self):
+        with self.assertNumQueries(2):  # user, page
+            first = self.client.get(reverse("evangelism-feed")).json()
+        cursor = Evangelism.objects.filter(evangelist=self.user).order_by("date", "pk")[1]
+        with self.assertNumQueries(1):
+            last = self.client.get(reverse("evangelism-feed"), {"cursor": utils.encode_cursor(cursor)}).json()
+        self.assertEqual((first["count"], last["count"]), (20, 1))
+        self.assertIsNone(last["next_cursor"])
+
+        if connection.vendor in queryplan.SUPPORTED_VENDORS:
+            with CaptureQueriesContext(connection) as queries:
+                utils.keyset_page(Evangelism.objects.filter(evangelist=self.user), 20, utils.encode_cursor(cursor))
+            plan = queryplan.explain(queries.captured_queries[0]["sql"])
+            self.assertTrue(queryplan.uses_index(plan, "evangelism_evangelist_date_idx"), plan)
+
+
+class ActivitiesViewTests(TrackerTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("evangelist", password="password123")
+        cls.ada = make_evangelism(cls.user, "Ada", datetime.date(2026, 10, 1), faith="less_faith")
+        bo = make_evangelism(cls.user, "Bo", datetime.date(2026, 10, 3))
+        for day in (2, 3, 3, 20):
+            FollowUp.objects.create(evangelism=bo, date=datetime.date(2026, 10, day), description=f"Day {day}")
+        other = User.objects.create_user("other", password="password123")
+        make_evangelism(other, "Ada", datetime.date(2026, 10, 1))
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def test_range_is_grouped_by_date_in_two_queries(self):
+        with self.assertNumQueries(3):  # user, evangelisms, follow-ups with their evangelism
+            data = self.client.get(reverse("activities"), {"start": "2026-10-01", "end": "2026-10-31"}).json()
+        self.assertEqual(sorted(data["days"]), ["2026-10-01", "2026-10-02", "2026-10-03", "2026-10-20"])
+        self.assertEqual([e["person_name"] for e in data["days"]["2026-10-01"]["evangelisms"]], ["Ada"])
+        self.assertEqual(len(data["days"]["2026-10-03"]["followups"]), 2)
+        self.assertEqual(data["days"]["2026-10-03"]["followups"][0]["evangelism__person_name"], "Bo")
+
+    def test_single_date_keeps_its_shape(self):
+        data = self.client.get(reverse("activities"), {"date": "2026-10-01"}).json()
+        self.assertEqual(data["evangelisms"][0]["detail_link"], reverse("evangelism-detail", args=[self.ada.pk]))
+        self.assertEqual(data["followups"], [])
+        self.assertEqual(self.client.get(reverse("activities")).json(), {"evangelisms": [], "followups": []})
+
+    def test_invalid_ranges_are_rejected(self):
+        for params in ({"date": "yesterday"}, {"start": "2026-10-31", "end": "2026-10-01"},
+                       {"start": "2026-01-01", "end": "2026-12-31"}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(reverse("activities"), params).status_code, 400)
+
+    def test_not_modified_until_the_data_changes(self):
+        params = {"start": "2026-10-01", "end": "2026-10-31"}
+        first = self.client.get(reverse("activities"), params)
+        self.assertTrue(first.has_header("Last-Modified"))
+        self.assertIn("no-cache", first["Cache-Control"])
+
+        again = self.client.get(reverse("activities"), params, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(again.status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            FollowUp.objects.create(evangelism=self.ada, date=datetime.date(2026, 10, 5))
+        changed = self.client.get(reverse("activities"), params, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], first["ETag"])
+        self.assertIn("2026-10-05", changed.json()["days"])
+
+
+class AsyncViewTests(TrackerTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("evangelist", password="password123")
+        today = datetime.date.today()
+        ada = make_evangelism(cls.user, "Ada", today - datetime.timedelta(days=9), faith="less_faith")
+        make_evangelism(cls.user, "Bo", today - datetime.timedelta(days=2), completed=True)
+        FollowUp.objects.create(evangelism=ada, date=today)
+
+    async def test_async_helpers_match_the_sync_ones(self):
+        today = datetime.date.today()
+        start, end = today - datetime.timedelta(days=30), today
+        self.assertEqual(await utils.arecommend_queue(self.user, k=3), await sync_to_async(recommend_queue)(self.user, k=3))
+        self.assertEqual(await utils.adashboard_stats(self.user), await sync_to_async(dashboard_stats)(self.user))
+        self.assertEqual(
+            await utils.aactivity_counts_by_day(self.user, start, end),
+            await sync_to_async(activity_counts_by_day)(self.user, start, end),
+        )
+        days = await utils.aactivities_by_day(self.user, start, end)
+        self.assertEqual(days, await sync_to_async(utils.activities_by_day)(self.user, start, end))
+
+    async def test_views_under_the_async_client(self):
+        await self.async_client.aforce_login(self.user)
+        home = await self.async_client.get(reverse("home"))
+        self.assertEqual(home.context["total_evangelism"], 2)
+        self.assertEqual(home.context["followup"], await sync_to_async(recommend_activity)(self.user))
+
+        calendar = await self.async_client.get(reverse("activity_calendar"))
+        self.assertEqual(sum(day["followup_count"] for day in calendar.context["calendar_days"]), 1)
+
+        params = {"date": datetime.date.today().isoformat()}
+        activities = await self.async_client.get(reverse("activities"), params)
+        self.assertEqual(len(activities.json()["followups"]), 1)
+        again = await self.async_client.get(reverse("activities"), params, headers={"if-none-match": activities["ETag"]})
+        self.assertEqual(again.status_code, 304)
+
+    async def test_anonymous_users_are_redirected_to_login(self):
+        for name in ("home", "activity_calendar", "activities"):
+            with self.subTest(name=name):
+                response = await self.async_client.get(reverse(name))
+                self.assertEqual(response.status_code, 302)
+                self.assertIn(reverse("login"), response["Location"])
+
+
+class LoadTestTests(LiveServerTestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("evangelist", password="password123")
+        make_evangelism(self.user, "Ada", datetime.date.today())
+
+    def test_logs_in_and_reports_latency(self):
+        cookie = loadtest.login(self.live_server_url, "evangelist", "password123")
+        result = loadtest.run_load(self.live_server_url, ["/", "/activities/"], concurrency=2, duration=0.5, cookie=cookie)
+        self.assertGreater(result["requests"], 0)
+        self.assertEqual(result["errors"], 0)
+        self.assertEqual(set(result["statuses"]), {"200"})
+        self.assertLessEqual(result["p50_ms"], result["p99_ms"])
+
+        with self.assertRaises(RuntimeError):
+            loadtest.login(self.live_server_url, "evangelist", "wrong")
+
+    def test_percentiles_and_comparison(self):
+        self.assertEqual(loadtest.percentile(list(range(1, 101)), 0.99), 99)
+        self.assertIsNone(loadtest.percentile([], 0.5))
+        lines = loadtest.compare({"requests_per_second": 150, "p99_ms": 80}, {"requests_per_second": 100, "p99_ms": 100})
+        self.assertEqual(lines[0], "requests_per_second: 100 -> 150 (+50.0%, higher is better)")
+        self.assertEqual(lines[1], "p99_ms: 100 -> 80 (-20.0%, lower is better)")
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "SQLite connection options")
+class SQLiteOptionsTests(TestCase):
+    def test_connections_are_tuned_for_concurrent_writers(self):
+        self.assertEqual(connection.transaction_mode, "IMMEDIATE")
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA synchronous")
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+            cursor.execute("PRAGMA cache_size")
+            self.assertEqual(cursor.fetchone()[0], -20000)
+            cursor.execute("PRAGMA busy_timeout")
+            self.assertGreater(cursor.fetchone()[0], 0)
+
+
+class ReplicaRoutingTests(TrackerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user("evangelist", password="password123")
+        self.evangelism = make_evangelism(self.user, "Ada", datetime.date.today())
+        self.router = routers.ReplicaRouter()
+
+    def test_only_tracker_reads_go_to_the_replica(self):
+        with routers.routing("replica1") as state:
+            self.assertEqual(self.router.db_for_read(Evangelism), "replica1")
+            self.assertEqual(self.router.db_for_read(User), "default")
+            self.assertFalse(state.wrote)
+            self.assertEqual(self.router.db_for_write(FollowUp), "default")
+            self.assertTrue(state.wrote)
+        self.assertEqual(self.router.db_for_read(Evangelism), "default")
+        self.assertEqual(self.router.db_for_write(Evangelism), "default")
+
+    # The primary stands in for a replica: the test database has no second copy
+    @override_settings(DATABASE_REPLICAS=["default"], READ_YOUR_WRITES_SECONDS=60)
+    def test_read_only_pages_read_from_the_primary_after_a_write(self):
+        self.client.force_login(self.user)
+        with self.assertLogs("tracker.routers", "INFO") as logs:
+            self.client.get(reverse("home"))
+        self.assertEqual(logs.output, ["INFO:tracker.routers:home: reading from default"])
+
+        with self.assertNoLogs("tracker.routers", "INFO"):
+            self.client.get(reverse("add-followup"))
+        self.assertNotIn(routers.PINNED_UNTIL_SESSION_KEY, self.client.session)
+        response = self.client.post(reverse("add-followup"), {
+            "evangelism": self.evangelism.pk, "date": datetime.date.today().isoformat(), "description": "Visited",
+        })
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(routers.PINNED_UNTIL_SESSION_KEY, self.client.session)
+
+        with self.assertLogs("tracker.routers", "INFO") as logs:
+            self.client.get(reverse("evangelism-listing"))
+        self.assertIn("the user wrote", logs.output[0])
+
+    @override_settings(DATABASE_REPLICAS=["default"], READ_YOUR_WRITES_SECONDS=60)
+    async def test_async_requests_are_routed_too(self):
+        await self.async_client.aforce_login(self.user)
+        with self.assertLogs("tracker.routers", "INFO") as logs:
+            await self.async_client.get(reverse("home"))
+        self.assertEqual(logs.output, ["INFO:tracker.routers:home: reading from default"])
+
+        response = await self.async_client.post(reverse("add-followup"), {
+            "evangelism": self.evangelism.pk, "date": datetime.date.today().isoformat(), "description": "Visited",
+        })
+        self.assertEqual(response.status_code, 302)
+        with self.assertLogs("tracker.routers", "INFO") as logs:
+            await self.async_client.get(reverse("home"))
+        self.assertIn("the user wrote", logs.output[0])
+
+    def test_no_replicas_configured(self):
+        self.client.force_login(self.user)
+        with self.assertNoLogs("tracker.routers", "INFO"):
+            self.assertEqual(self.client.get(reverse("home")).status_code, 200)
+
+
+class StaticAssetsTests(TrackerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(User.objects.create_user("jane.doe", password="password123"))
+
+    def tearDown(self):
+        tracker_assets.bundle_built.cache_clear()
+        super().tearDown()
+
+    def test_avatar_is_an_inline_svg_of_the_initials(self):
+        svg = tracker_assets.avatar("jane.doe", 40, css_class="rounded-full")
+        self.assertTrue(svg.startswith("<svg "))
+        self.assertIn(">JD</text>", svg)
+        self.assertIn('width="40"', svg)
+        self.assertEqual(tracker_assets.initials("evangelist"), "EV")
+        self.assertIn("&lt;b&gt;", tracker_assets.avatar("<b>"))
+
+    def test_pages_load_nothing_from_other_hosts_once_built(self):
+        with mock.patch.object(tracker_assets, "bundle_built", return_value=True):
+            content = self.client.get(reverse("home")).content.decode()
+        self.assertIn("/static/tracker/build/app.css", content)
+        self.assertIn("/static/tracker/build/flatpickr/flatpickr.min.js", content)
+        self.assertNotRegex(content, r'(src|href)="https?://')
+
+    def test_cdn_fallback_until_built(self):
+        with mock.patch.object(tracker_assets, "bundle_built", return_value=False):
+            content = self.client.get(reverse("home")).content.decode()
+        self.assertIn("https://cdn.tailwindcss.com", content)
+        self.assertNotIn("ui-avatars.com", content)
+
+
+class EvangelismDetailTests(TrackerTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("evangelist", password="password123")
+        cls.short = make_evangelism(cls.user, "Ada", datetime.date(2026, 1, 1))
+        FollowUp.objects.create(evangelism=cls.short, date=datetime.date(2026, 1, 2))
+        cls.long = make_evangelism(cls.user, "Bo", datetime.date(2025, 1, 1))
+        FollowUp.objects.bulk_create([
+            FollowUp(evangelism=cls.long, date=datetime.date(2025, 1, 1) + datetime.timedelta(days=i // 2))
+            for i in range(150)
+        ])
+        cls.other = User.objects.create_user("other", password="password123")
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def test_other_users_get_a_404(self):
+        self.client.force_login(self.other)
+        self.assertEqual(self.client.get(reverse("evangelism-detail", args=[self.short.pk])).status_code, 404)
+        self.assertEqual(self.client.get(reverse("evangelism-followups", args=[self.short.pk])).status_code, 404)
+
+    def test_newest_followups_first_then_load_older(self):
+        response = self.client.get(reverse("evangelism-detail", args=[self.long.pk]))
+        total, cursor = len(response.context["followups"]), response.context["next_cursor"]
+        self.assertEqual(total, 10)
+        while cursor:
+            page = self.client.get(reverse("evangelism-followups", args=[self.long.pk]), {"cursor": cursor}).json()
+            total += page["count"]
+            cursor = page["next_cursor"]
+        self.assertEqual(total, 150)
+
+        expected = list(self.long.followups.order_by("-date", "-pk").values_list("pk", flat=True))
+        self.assertEqual([f.pk for f in response.context["followups"]], expected[:10])
+        older = self.client.get(reverse("evangelism-detail", args=[self.long.pk]), {"cursor": response.context["next_cursor"]})
+        self.assertEqual([f.pk for f in older.context["followups"]], expected[10:20])
+
+    def test_timeline_counts_by_month(self):
+        months = self.client.get(reverse("evangelism-detail", args=[self.long.pk])).context["followup_months"]
+        self.assertEqual([m["month"] for m in months], [datetime.date(2025, 1, 1), datetime.date(2025, 2, 1), datetime.date(2025, 3, 1)])
+        self.assertEqual([m["count"] for m in months], [62, 56, 32])
+
+    def test_long_history_costs_the_same_queries(self):
+        # user (cached after the first request), evangelism, follow-up page, timeline
+        with self.assertNumQueries(4):
+            self.client.get(reverse("evangelism-detail", args=[self.short.pk]))
+        with self.assertNumQueries(3):
+            self.client.get(reverse("evangelism-detail", args=[self.long.pk]))
+
+
+class PerformanceMiddlewareTests(TrackerTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("evangelist", password="password123")
+        cls.staff = User.objects.create_user("admin", password="password123", is_staff=True)
+        make_evangelism(cls.user, "Ada", datetime.date.today() - datetime.timedelta(days=9))
+
+    def setUp(self):
+        super().setUp()
+        metrics.reset()
+        self.client.force_login(self.user)
+
+    def test_server_timing_and_per_view_metrics(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("home"))
+        self.assertIn(f'desc="{len(queries.captured_queries)} queries"', response["Server-Timing"])
+        self.assertRegex(response["Server-Timing"], r"^total;dur=[\d.]+, db;dur=[\d.]+;desc=\"\d+ queries\", tpl;dur=[\d.]+$")
+
+        home = metrics.snapshot()["home"]
+        self.assertEqual(home.count, 1)
+        self.assertEqual(home.sql_queries, len(queries.captured_queries))
+        self.assertGreater(home.template_duration, 0)
+        self.assertLessEqual(home.template_duration + home.sql_duration, home.duration)
+
+    async def test_async_requests_stay_on_the_event_loop(self):
+        async def get_response(request):
+            return None
+
+        self.assertTrue(iscoroutinefunction(PerformanceMiddleware(get_response)))
+        self.assertTrue(iscoroutinefunction(PerformanceMiddleware(get_response).process_template_response))
+        self.assertFalse(iscoroutinefunction(PerformanceMiddleware(lambda request: None)))
+
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse("home"))
+        self.assertRegex(response["Server-Timing"], r'db;dur=[\d.]+;desc="[1-9]\d* queries"')
+        home = metrics.snapshot()["home"]
+        self.assertEqual(home.count, 1)
+        self.assertGreater(home.template_duration, 0)
+
+    @override_settings(PERFORMANCE_SAMPLE_RATE=0.0)
+    def test_unsampled_requests_are_not_recorded(self):
+        response = self.client.get(reverse("home"))
+        self.assertFalse(response.has_header("Server-Timing"))
+        self.assertEqual(metrics.snapshot(), {})
+
+    def test_prometheus_endpoint_is_staff_only(self):
+        self.client.get(reverse("home"))
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 403)
+        self.client.force_login(self.staff)
+        body = self.client.get(reverse("metrics")).content.decode()
+        self.assertIn('followup_request_duration_seconds_count{view="home"} 1', body)
+        self.assertIn('followup_request_duration_seconds_bucket{view="home",le="+Inf"} 1', body)
+        self.assertIn("# TYPE followup_sql_queries_total counter", body)
+
+
+class QueryBudgetTests(NPlusOneTestMixin, TrackerTestCase):
+    """Every page runs a fixed number of queries, whatever the amount of data, and none in a loop."""
+
+    # (url name, args, query string, queries) with a cold cache, logged in as a superuser
+    BUDGETS = [
+        # The recommender: overdue contacts, then (the queue not being full here) the others
+        ("home", [], "", 5),
+        ("today-plan", [], "", 4),
+        ("activity_calendar", [], "", 3),
+        ("activity_calendar", ["year", "month"], "", 3),
+        ("evangelism-listing", [], "", 3),
+        ("evangelism-feed", [], "", 3),
+        ("evangelism-detail", ["pk"], "", 5),
+        ("evangelism-followups", ["pk"], "", 4),
+        ("add-followup", [], "", 3),
+        ("add-evangelism", [], "", 2),
+        ("activities", [], "date", 4),
+        ("activities", [], "range", 4),
+        ("cache-stats", [], "", 2),
+        ("metrics", [], "", 2),
+        ("admin:index", [], "", 5),
+        ("admin:tracker_evangelism_changelist", [], "", 7),
+        ("admin:tracker_followup_changelist", [], "", 7),
+        ("admin:tracker_evangelism_change", ["pk"], "", 7),
+        ("admin:tracker_followup_change", ["followup"], "", 8),
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser("admin", "admin@example.com", "password123")
+
+    def build(self, size):
+        today = datetime.date.today()
+        Evangelism.objects.filter(evangelist=self.user).delete()
+        for i in range(size):
+            evangelism = make_evangelism(self.user, f"Person {i}", today - datetime.timedelta(days=i % 20))
+            for days_ago in range(2):
+                FollowUp.objects.create(evangelism=evangelism, date=today - datetime.timedelta(days=days_ago))
+
+    def url(self, name, args, query):
+        today = datetime.date.today()
+        evangelism = Evangelism.objects.filter(evangelist=self.user).earliest("pk")
+        values = {
+            "year": today.year,
+            "month": today.month,
+            "pk": evangelism.pk,
+            "followup": evangelism.followups.earliest("pk").pk,
+        }
+        url = reverse(name, args=[values[arg] for arg in args])
+        if query == "date":
+            return f"{url}?date={today.isoformat()}"
+        if query == "range":
+            return f"{url}?start={today.replace(day=1).isoformat()}&end={today.isoformat()}"
+        return url
+
+    def test_query_counts_do_not_grow_with_data(self):
+        self.client.force_login(self.user)
+        for size in (3, 40):
+            self.build(size)
+            for name, args, query, budget in self.BUDGETS:
+                url = self.url(name, args, query)
+                cache.clear()
+                ContentType.objects.clear_cache()
+                with self.subTest(size=size, url=url), self.assertQueryBudget(budget):
+                    self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_detector_reports_the_loop(self):
+        self.build(3)
+        with self.assertRaises(NPlusOneError) as raised, detect_n_plus_one():
+            for followup in FollowUp.objects.all():
+                followup.evangelism.date
+        self.assertIn("tracker_evangelism", str(raised.exception))
+        self.assertIn("tests.py", str(raised.exception))
+
+        with detect_n_plus_one():
+            for followup in FollowUp.objects.select_related("evangelism"):
+                followup.evangelism.date
+
+
+@unittest.skipIf(simulation is None, "NumPy is not installed")
+class PolicySimulatorParityTests(TrackerTestCase):
+    """The vectorized simulator must pick exactly what recommend_activity picks."""
+
+    @classmethod
+    def setUpTestData(cls):
+        rnd = random.Random(7)
+        today = datetime.date.today()
+        faiths = list(Evangelism.FAITH_STATUS)
+        cls.users = []
+        for n in range(25):
+            user = User.objects.create_user(f"evangelist{n}")
+            cls.users.append(user)
+            for i in range(rnd.randint(0, 20)):
+                evangelism = make_evangelism(
+                    user, f"Person {i}", today - datetime.timedelta(days=rnd.randint(0, 15)),
+                    faith=rnd.choice(faiths), completed=rnd.random() < 0.1,
+                )
+                FollowUp.objects.bulk_create([
+                    FollowUp(evangelism=evangelism, date=today - datetime.timedelta(days=rnd.randint(0, 12)))
+                    for _ in range(rnd.randint(0, 9))
+                ])
+
+    def assertParity(self, policy):
+        rows = (
+            Evangelism.objects.filter(completed=False)
+            .order_by("evangelist", "date", "pk")
+            .values_list("evangelist_id", "pk", "date", "relevance", "followup_count", "last_touch_date")
+        )
+        contacts, evangelist_ids = simulation.contacts_from_rows(rows)
+        index, category = simulation.recommend_indices(policy, contacts, datetime.date.today().toordinal())
+        vectorized = {
+            int(evangelist_id): (int(contacts.pk[i]), simulation.REASONS[c]) if i >= 0 else None
+            for evangelist_id, i, c in zip(evangelist_ids, index, category)
+        }
+        for user in self.users:
+            recommended = recommend_activity(user)
+            expected = (recommended.pk, recommended.recommendation_reason) if recommended else None
+            self.assertEqual(vectorized.get(user.pk), expected, f"{policy} / {user}")
+
+    def test_parity_with_current_policy(self):
+        self.assertParity(simulation.Policy.current())
+
+    def test_parity_with_other_policies(self):
+        for target, interval, recent, min_gap in [(3, 5, 1, 1), (9, 10, 4, 2), (7, 3, 0, 0)]:
+            with mock.patch.multiple(
+                utils, FOLLOWUP_TARGET=target, FOLLOWUP_INTERVAL_DAYS=interval,
+                RECENT_TOUCH_WINDOW=recent, MIN_DAYS_BEFORE_SECOND_TOUCH=min_gap,
+            ):
+                self.assertParity(simulation.Policy(target, interval, recent, min_gap))
+
+    def test_simulation_reports_metrics(self):
+        today = datetime.date.today().toordinal()
+        contacts = simulation.synthetic_contacts(50, 20, today, seed=1)
+        result = simulation.simulate(simulation.Policy(), contacts, today, days=30)
+        self.assertEqual(sum(result.distribution), contacts.size)
+        self.assertEqual(result.followups + result.evangelize_days, 50 * 30)
+        self.assertGreater(result.coverage, 0)
+
+
+class BenchmarkSuiteTests(TrackerTestCase):
+    def test_small_run_covers_every_target(self):
+        results = run_benchmarks(sizes=[10], repeat=1)
+        self.assertEqual(
+            {r["target"] for r in results},
+            {"recommend_activity", "home", "home_cached", "calendar", "listing", "activities", "search", "search_page",
+             "detail"},
+        )
+        by_target = {r["target"]: r for r in results}
+        self.assertGreater(by_target["home"]["queries"], by_target["home_cached"]["queries"])
+        for result in results:
+            self.assertGreaterEqual(result["median_ms"], result["min_ms"])
+
+    def test_regressions_against_baseline(self):
+        baseline = [{"size": 10, "target": "home", "median_ms": 10.0, "queries": 4}]
+        self.assertEqual(find_regressions([{"size": 10, "target": "home", "median_ms": 12.0, "queries": 4}], baseline), [])
+        self.assertEqual(len(find_regressions([{"size": 10, "target": "home", "median_ms": 15.0, "queries": 4}], baseline)), 1)
+        self.assertEqual(len(find_regressions([{"size": 10, "target": "home", "median_ms": 9.0, "queries": 5}], baseline)), 1)
+
+
+class SearchTests(TrackerTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("evangelist", password="password123")
+        cls.staff = User.objects.create_superuser("admin", "admin@example.com", "password123")
+        cls.john = make_evangelism(cls.user, "John Smith", datetime.date(2026, 1, 5), course="Chemistry")
+        cls.mary = make_evangelism(cls.user, "Mary Jones", datetime.date(2026, 1, 6),
+                                   description="Introduced by John at the library")
+        cls.bo = Evangelism.objects.create(
+            evangelist=cls.user, person_name="Bo", location="Sports hall", date=datetime.date(2026, 1, 7), faith="unknown"
+        )
+        make_evangelism(cls.staff, "John Other", datetime.date(2026, 1, 5))
+
+    def setUp(self):
+        super().setUp()
+        if not (search.fts_available() or connection.vendor == "postgresql"):
+            self.skipTest("needs SQLite with FTS5 or PostgreSQL")
+
+    def names(self, query):
+        return [evangelism.person_name for evangelism in search.search(self.user, query)]
+
+    def test_ranked_and_typo_tolerant(self):
+        self.assertEqual(self.names("john"), ["John Smith", "Mary Jones"])
+        self.assertEqual(self.names("Jonh"), ["John Smith"])
+        self.assertEqual(self.names("chemistyr"), ["John Smith"])
+        self.assertEqual(self.names("sports hal"), ["Bo"])
+        self.assertEqual(self.names("library john"), ["Mary Jones"])
+        self.assertEqual(self.names("zebra"), [])
+        self.assertEqual(self.names("Bo"), ["Bo"])  # too short for trigrams: plain substring match
+
+    def test_index_follows_writes(self):
+        followup = FollowUp.objects.create(evangelism=self.bo, date=datetime.date(2026, 1, 8), description="Gave a Bible")
+        self.assertEqual(self.names("bible"), ["Bo"])
+        FollowUp.objects.filter(pk=followup.pk).update(evangelism=self.john)
+        self.assertEqual(self.names("bible"), ["John Smith"])
+        followup.delete()
+        self.assertEqual(self.names("bible"), [])
+
+        Evangelism.objects.filter(pk=self.bo.pk).update(person_name="Bartholomew")
+        self.assertEqual(self.names("bartholomew"), ["Bartholomew"])
+        self.bo.delete()
+        self.assertEqual(self.names("bartholomew"), [])
+
+    def test_lost_triggers_are_recreated_after_migrate(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("the triggers are SQLite only")
+        with connection.cursor() as cursor:
+            # What a migration rebuilding tracker_evangelism leaves behind
+            cursor.execute("DROP TRIGGER tracker_evangelism_fts_insert")
+            cursor.execute("DROP TRIGGER tracker_evangelism_fts_update")
+        Evangelism.objects.filter(pk=self.bo.pk).update(person_name="Bartholomew")
+        make_evangelism(self.user, "Zacchaeus", datetime.date(2026, 1, 8))
+        self.assertEqual(self.names("zacchaeus"), [])
+
+        with self.assertLogs("tracker.signals", "WARNING"):
+            emit_post_migrate_signal(verbosity=0, interactive=False, db="default")
+        with connection.cursor() as cursor:
+            self.assertEqual(_search_sql.missing_triggers(cursor), [])
+        self.assertEqual(self.names("zacchaeus"), ["Zacchaeus"])
+        self.assertEqual(self.names("bartholomew"), ["Bartholomew"])
+        Evangelism.objects.filter(pk=self.bo.pk).update(person_name="Bo")
+        self.assertEqual(self.names("bartholomew"), [])
+
+    def test_search_page(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("search"), {"q": "jonh"})
+        self.assertEqual([e.person_name for e in response.context["evangelisms"]], ["John Smith"])
+        self.assertContains(response, reverse("evangelism-detail", args=[self.john.pk]))
+        self.assertEqual(self.client.get(reverse("search")).context["evangelisms"], [])
+
+    def test_admin_search_uses_the_index(self):
+        self.client.force_login(self.staff)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("admin:tracker_evangelism_changelist"), {"q": "library"})
+        self.assertEqual([e.person_name for e in response.context["cl"].result_list], ["Mary Jones"])
+        self.assertTrue(any(search.FTS_TABLE in q["sql"] or "tsvector" in q["sql"] for q in queries.captured_queries))
+
+        FollowUp.objects.create(evangelism=self.mary, date=datetime.date(2026, 1, 9))
+        response = self.client.get(reverse("admin:tracker_followup_changelist"), {"q": "mary"})
+        self.assertEqual(response.context["cl"].result_count, 1)
+        response = self.client.get(reverse("admin:tracker_followup_changelist"), {"q": "library"})
+        self.assertEqual(response.context["cl"].result_count, 0)  # follow-ups match by person name only
+
+    def test_similarity(self):
+        self.assertEqual(search.similarity("word", "word"), 1.0)
+        self.assertEqual(search.edit_distance("jonh", "john"), 1)
+        self.assertEqual(search.edit_distance("kitten", "sitting"), 3)
+        self.assertEqual(search.similarity("jonh", "john"), 0.75)
+
+
+class AdminChangelistTests(TrackerTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("evangelist", password="password123")
+        cls.staff = User.objects.create_superuser("admin", "admin@example.com", "password123")
+        for day in range(1, 4):
+            evangelism = make_evangelism(cls.user, f"Person {day}", datetime.date(2026, 1, day),
+                                         faith="less_faith" if day == 1 else "unknown")
+            FollowUp.objects.create(evangelism=evangelism, date=datetime.date(2026, 2, day))
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def test_estimated_row_count_reads_table_statistics(self):
+        self.analyze()
+        self.assertEqual(pagination.estimated_row_count(Evangelism), 3)
+        self.assertEqual(pagination.estimated_row_count(FollowUp), 3)
+
+    def test_paginator_trusts_the_estimate_only_for_large_unfiltered_tables(self):
+        self.analyze()
+        make_evangelism(self.user, "Person 4", datetime.date(2026, 1, 4))
+
+        paginator = pagination.EstimatedCountPaginator(Evangelism.objects.order_by("pk"), 2)
+        paginator.estimate_threshold = 3
+        self.assertEqual(paginator.count, 3)  # the statistics predate Person 4
+        self.assertEqual(paginator.num_pages, 2)
+
+        paginator = pagination.EstimatedCountPaginator(Evangelism.objects.order_by("pk"), 2)
+        paginator.estimate_threshold = 10
+        self.assertEqual(paginator.count, 4)
+
+        if connection.vendor == "sqlite":
+            paginator = pagination.EstimatedCountPaginator(Evangelism.objects.filter(faith="unknown").order_by("pk"), 2)
+            paginator.estimate_threshold = 1
+            self.assertEqual(paginator.count, 3)
+
+    def test_changelists_filter_through_indexes(self):
+        self.client.force_login(self.staff)
+        urls = [
+            (reverse("admin:tracker_evangelism_changelist"), {}, 3),
+            (reverse("admin:tracker_evangelism_changelist"), {"faith__exact": "less_faith"}, 1),
+            (reverse("admin:tracker_evangelism_changelist"), {"date__gte": "2026-01-02", "date__lt": "2026-01-04"}, 2),
+            (reverse("admin:tracker_followup_changelist"), {}, 3),
+            (reverse("admin:tracker_followup_changelist"), {"date__gte": "2026-02-03"}, 1),
+        ]
+        for url, params, expected in urls:
+            with self.subTest(url=url, params=params):
+                with detect_n_plus_one():
+                    response = self.client.get(url, params)
+                self.assertEqual(response.context["cl"].result_count, expected)
+                self.assertNotContains(response, "total")  # show_full_result_count is off
+                if "evangelism" in url:
+                    # (The follow-up list walks the primary key backwards, which SQLite reports as a SCAN)
+                    scans = queryplan.capture_table_scans(lambda: self.client.get(url, params))
+                    self.assertEqual({sql: lines for sql, lines in scans.items() if "tracker_" in sql}, {})
+
+        response = self.client.get(reverse("admin:tracker_evangelism_changelist"))
+        self.assertEqual([e.person_name for e in response.context["cl"].result_list],
+                         ["Person 3", "Person 2", "Person 1"])
+
+
+class ImportTrackerTests(TrackerTestCase):
+    CSV = (
+        "type,evangelist,person_name,location,date,faith,completed,description\n"
+        "evangelism,evangelist,Ada,Campus,2026-01-05,less_faith,False,\n"
+        "evangelism,evangelist,Bo,Library,2026-01-06,unbeliever,,\n"
+        "followup,evangelist,Ada,,2026-01-10,,,Prayed together\n"
+        "followup,evangelist,Ada,,2026-01-12,,,Bible study\n"
+        "evangelism,evangelist,Chidi,Campus,not-a-date,unknown,,\n"
+        "evangelism,nobody,Dayo,Campus,2026-01-07,unknown,,\n"
+        "followup,evangelist,Nobody Known,,2026-01-12,,,\n"
+        "evangelism,evangelist,Ada,Campus,2026-01-05,less_faith,,\n"
+        "evangelism,evangelist,Bo,Campus,2026-01-06,unbeliever,,\n"
+    )
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("evangelist", password="password123")
+
+    def write(self, name, content):
+        path = self.tmp / name
+        path.write_text(content)
+        return str(path)
+
+    def setUp(self):
+        super().setUp()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+
+    def test_csv_rows_are_imported_and_bad_rows_reported(self):
+        out, err = StringIO(), StringIO()
+        errors = self.tmp / "errors.jsonl"
+        call_command("import_tracker", self.write("rows.csv", self.CSV), "--batch-size", "3",
+                     "--errors", str(errors), stdout=out, stderr=err)
+
+        ada = Evangelism.objects.get(evangelist=self.user, person_name="Ada")
+        self.assertEqual(ada.followup_count, 2)
+        self.assertEqual(ada.last_touch_date, datetime.date(2026, 1, 12))
+        self.assertEqual(ada.relevance, Evangelism.relevance_for("less_faith"))
+        self.assertEqual(Evangelism.objects.count(), 2)
+        self.assertIn("imported 2 evangelisms (2 existing skipped) and 2 follow-ups from 9 rows", out.getvalue())
+        self.assertIn("3 rows rejected", out.getvalue())
+
+        rejected = [json.loads(line) for line in errors.read_text().splitlines()]
+        self.assertEqual([error["line"] for error in rejected], [6, 7, 8])
+        self.assertIn("date", rejected[0]["error"])
+        self.assertIn("Unknown evangelist", rejected[1]["error"])
+        self.assertIn("No evangelism of 'Nobody Known'", rejected[2]["error"])
+
+    def test_existing_evangelisms_are_skipped_or_updated(self):
+        make_evangelism(self.user, "Ada", datetime.date(2025, 12, 1), faith="unknown")
+        rows = '{"person_name": "Ada", "date": "2026-01-05", "faith": "strong_faith", "location": "Hall"}\n'
+        path = self.write("rows.jsonl", rows + '{"person_name": "Bo", "date": "2026-01-06", "faith": "unknown", "location": "Hall"}\n')
+
+        out = StringIO()
+        call_command("import_tracker", path, "--user", "evangelist", "--kind", "evangelism", stdout=out)
+        self.assertEqual(Evangelism.objects.get(person_name="Ada").faith, "unknown")
+        self.assertIn("(1 existing skipped)", out.getvalue())
+
+        call_command("import_tracker", path, "--user", "evangelist", "--kind", "evangelism",
+                     "--on-conflict", "update", stdout=StringIO())
+        ada = Evangelism.objects.get(person_name="Ada")
+        self.assertEqual((ada.faith, ada.location, ada.relevance), ("strong_faith", "Hall", 1))
+        self.assertEqual(ada.last_touch_date, datetime.date(2026, 1, 5))
+        self.assertEqual(Evangelism.objects.count(), 2)
+
+    def test_rows_another_writer_inserted_are_not_counted_as_inserted(self):
+        make_evangelism(self.user, "Ada", datetime.date(2025, 12, 1))
+        rows = [(line, {"person_name": name, "date": "2026-01-05", "faith": "unknown", "location": "Campus"})
+                for line, name in [(1, "Ada"), (2, "Bo")]]
+        importer = Importer(default_user=self.user, default_kind="evangelism")
+        # As if Ada was inserted between the lookup and the INSERT
+        with mock.patch.object(Importer, "_lookup"):
+            result = importer.run(rows)
+        self.assertEqual((result.evangelisms, result.existing), (1, 1))
+        self.assertEqual(Evangelism.objects.count(), 2)
+
+    def test_update_only_writes_the_given_columns(self):
+        make_evangelism(self.user, "Ada", datetime.date(2025, 12, 1), faith="unknown", course="Chemistry",
+                        description="Met at the library", completed=True)
+        # No course or completed column and an empty description: all three are kept
+        path = self.write("rows.csv", "person_name,date,faith,location,description\nAda,2026-01-05,strong_faith,Hall,\n")
+        call_command("import_tracker", path, "--user", "evangelist", "--kind", "evangelism",
+                     "--on-conflict", "update", stdout=StringIO())
+        ada = Evangelism.objects.get(person_name="Ada")
+        self.assertEqual((ada.faith, ada.location, ada.date), ("strong_faith", "Hall", datetime.date(2026, 1, 5)))
+        self.assertEqual((ada.course, ada.description, ada.completed), ("Chemistry", "Met at the library", True))
+
+    def test_common_boolean_spellings(self):
+        rows = [(i, {"person_name": f"Person {i}", "date": "2026-01-05", "faith": "unknown", "location": "Campus",
+                     "completed": value})
+                for i, value in enumerate(["true", "Yes", "1", "on", "false", "no", "0", "F", True, "maybe"], 1)]
+        errors = []
+        Importer(default_user=self.user, default_kind="evangelism", on_error=errors.append).run(rows)
+        self.assertEqual(
+            list(Evangelism.objects.order_by("pk").values_list("completed", flat=True)),
+            [True, True, True, True, False, False, False, False, True],
+        )
+        self.assertEqual([error.line for error in errors], [10])
+        self.assertIn("completed", errors[0].message)
+
+    def test_queries_are_per_batch_not_per_row(self):
+        def rows(n):
+            for i in range(n):
+                yield i * 2 + 1, {"type": "evangelism", "person_name": f"Person {i}", "date": "2026-01-01",
+                                  "faith": "unknown", "location": "Campus"}
+                yield i * 2 + 2, {"type": "followup", "person_name": f"Person {i}", "date": "2026-01-02"}
+
+        def queries(n):
+            importer = Importer(batch_size=1000, default_user=self.user)
+            with CaptureQueriesContext(connection) as captured:
+                result = importer.run(rows(n))
+            self.assertEqual((result.evangelisms, result.followups, result.errors), (n, n, 0))
+            Evangelism.objects.all().delete()
+            return len(captured)
+
+        # Only the INSERTs grow, as the database splits them by its parameter limit; the daily
+        # activity rollup adds 2 per bulk_create (a recount for the ignore_conflicts evangelisms,
+        # the follow-ups' evangelists and one increment for the follow-ups), and counting the
+        # evangelisms actually inserted 2 more
+        self.assertEqual(queries(5), 14)
+        self.assertLess(queries(400), 25)
+
+    def test_invalid_jsonl_lines_do_not_abort_the_file(self):
+        path = self.write("rows.jsonl", 'not json\n[1, 2]\n\n{"person_name": "Ada", "date": "2026-01-05", "faith": "unknown", "location": "Campus"}\n')
+        err = StringIO()
+        call_command("import_tracker", path, "--user", "evangelist", "--kind", "evangelism",
+                     stdout=StringIO(), stderr=err)
+        self.assertTrue(Evangelism.objects.filter(person_name="Ada").exists())
+        self.assertIn("rows.jsonl:1: Invalid JSON", err.getvalue())
+        self.assertIn("rows.jsonl:2: Expected a JSON object.", err.getvalue())
+
+
+class ExportTests(TrackerTestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("evangelist", password="password123")
+        ada = make_evangelism(cls.user, "Ada", datetime.date(2026, 1, 5), faith="less_faith", description="Met, at lunch")
+        make_evangelism(cls.user, "Bo", datetime.date(2026, 1, 6), completed=True)
+        FollowUp.objects.create(evangelism=ada, date=datetime.date(2026, 1, 12), description="Bible study")
+        FollowUp.objects.create(evangelism=ada, date=datetime.date(2026, 1, 10), description="Prayed")
+        make_evangelism(User.objects.create_user("other"), "Chidi", datetime.date(2026, 1, 5))
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def test_csv_lists_each_evangelism_before_its_followups_in_one_query(self):
+        with self.assertNumQueries(2):  # user, the export
+            response = self.client.get(reverse("export"))
+            content = b"".join(response.streaming_content).decode()
+        self.assertIn('attachment; filename="followup-buddy-evangelist-', response["Content-Disposition"])
+        rows = list(csv.reader(StringIO(content)))
+        self.assertEqual(rows[0], exporter.COLUMNS)
+        self.assertEqual([(row[0], row[2], row[5]) for row in rows[1:]], [
+            ("evangelism", "Ada", "2026-01-05"),
+            ("followup", "Ada", "2026-01-10"),
+            ("followup", "Ada", "2026-01-12"),
+            ("evangelism", "Bo", "2026-01-06"),
+        ])
+        self.assertEqual(rows[1][-1], "Met, at lunch")
+
+    def test_jsonl_and_gzip(self):
+        plain = b"".join(self.client.get(reverse("export"), {"format": "jsonl"}).streaming_content)
+        rows = [json.loads(line) for line in plain.decode().splitlines()]
+        self.assertEqual(rows[3], {
+            "type": "evangelism", "evangelist": "evangelist", "person_name": "Bo", "course": None,
+            "location": "Campus", "date": "2026-01-06", "faith": "unknown", "completed": True, "description": "",
+        })
+
+        response = self.client.get(reverse("export"), {"format": "jsonl", "gzip": "1"})
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertTrue(response["Content-Disposition"].endswith('.jsonl.gz"'))
+        self.assertEqual(gzip.decompress(b"".join(response.streaming_content)), plain)
+        self.assertEqual(self.client.get(reverse("export"), {"format": "xml"}).status_code, 400)
+
+    def test_encoder_emits_bounded_chunks(self):
+        encoder = exporter.StreamEncoder("csv", chunk_size=100)
+        chunks = [encoder.encode(["evangelism", "u", f"Person {i}", None, None, "2026-01-01", "unknown", False, ""])
+                  for i in range(50)]
+        self.assertTrue(all(len(chunk) < 200 for chunk in chunks))
+        self.assertGreater(sum(1 for chunk in chunks if chunk), 5)
+
+    async def test_async_handler_streams_an_async_iterator(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse("export"))
+        self.assertTrue(response.is_async)
+        content = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(content.decode().count("\n"), 5)
+
+    def test_export_can_be_imported_again(self):
+        path = Path(tempfile.mkdtemp()) / "export.csv.gz"
+        self.addCleanup(path.unlink)
+        call_command("export_tracker", "--user", "evangelist", "--gzip", "--output", str(path), stdout=StringIO())
+
+        Evangelism.objects.filter(evangelist=self.user).delete()
+        csv_path = path.with_suffix("")
+        csv_path.write_bytes(gzip.decompress(path.read_bytes()))
+        self.addCleanup(csv_path.unlink)
+        call_command("import_tracker", str(csv_path), stdout=StringIO())
+
+        ada = Evangelism.objects.get(evangelist=self.user, person_name="Ada")
+        self.assertEqual((ada.faith, ada.description, ada.followup_count), ("less_faith", "Met, at lunch", 2))
+        self.assertTrue(Evangelism.objects.get(evangelist=self.user, person_name="Bo").completed)
+
+
+@unittest.skipUnless(connection.vendor in queryplan.SUPPORTED_VENDORS, "EXPLAIN checks need SQLite or PostgreSQL")
+class QueryPlanTests(TrackerTestCase):
+    """Every tracker page must be served by indexes, never by a full table scan."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("evangelist", password="password123")
+        today = datetime.date.today()
+        cls.evangelism = make_evangelism(cls.user, "Ada", today - datetime.timedelta(days=9))
+        FollowUp.objects.create(evangelism=cls.evangelism, date=today)
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def explain(self, queryset):
+        sql, params = queryset.query.sql_with_params()
+        return queryplan.explain(sql, params)
+
+    def test_tracker_views_do_not_scan_tables(self):
+        today = datetime.date.today()
+        urls = [
+            reverse("home"),
+            reverse("today-plan"),
+            reverse("activity_calendar", args=[today.year, today.month]),
+            reverse("activity_year"),
+            reverse("evangelism-listing"),
+            f"{reverse('activities')}?date={today.isoformat()}",
+            f"{reverse('activities')}?start={today.replace(day=1).isoformat()}&end={today.isoformat()}",
+            reverse("evangelism-detail", args=[self.evangelism.pk]),
+            reverse("export"),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                cache.clear()
+                # b"".join(): streamed responses only query while their content is consumed
+                self.assertEqual(queryplan.capture_table_scans(lambda: b"".join(self.client.get(url))), {})
+
+    def test_hot_queries_use_the_composite_indexes(self):
+        self.assertTrue(queryplan.uses_index(
+            self.explain(Evangelism.objects.filter(evangelist=self.user, completed=False).order_by("-date")),
+            "evangelism_active_idx",
+        ))
+        overdue, _ = utils._recommendation_querysets(self.user, datetime.date.today())
+        self.assertTrue(queryplan.uses_index(self.explain(overdue[:5]), "evangelism_recommend_idx"))
+        self.assertTrue(queryplan.uses_index(
+            self.explain(Evangelism.objects.filter(evangelist=self.user).order_by("-date")),
+            "evangelism_evangelist_date_idx",
+        ))
+        self.assertTrue(queryplan.uses_index(
+            self.explain(FollowUp.objects.filter(date=datetime.date.today(), evangelism__evangelist=self.user)),
+            "followup_date_evangelism_idx",
+        ))
+        # The rollup is read through its (evangelist, date) unique constraint, which SQLite
+        # creates inline with the table (so the index gets an automatic name)
+        unique_index = "sqlite_autoindex_tracker_dailyactivity_1" if connection.vendor == "sqlite" else "unique_daily_activity"
+        year = utils._activity_counts_query(self.user, datetime.date(2025, 1, 1), datetime.date(2025, 12, 31))
+        self.assertTrue(queryplan.uses_index(self.explain(year), unique_index))
+        self.assertTrue(queryplan.uses_index(self.explain(utils._active_dates_query(self.user, datetime.date.today())), unique_index))
+
+    def test_table_scans_are_reported(self):
+        scans = queryplan.capture_table_scans(lambda: list(Evangelism.objects.filter(location="Campus")))
+        self.assertEqual(len(scans), 1)
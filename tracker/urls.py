@@ -4,11 +4,20 @@ from . import views
 
 urlpatterns = [
     path("", views.HomeView.as_view(), name="home"),
+    path("plan/", views.TodayPlanView.as_view(), name="today-plan"),
     path("activity/calendar/", views.CalendarView.as_view(), name="activity_calendar"),
     path('activity/calendar/<int:year>/<int:month>/', views.CalendarView.as_view(), name='activity_calendar'),
+    path("activity/year/", views.YearHeatmapView.as_view(), name="activity_year"),
+    path("activity/year/<int:year>/", views.YearHeatmapView.as_view(), name="activity_year"),
     path('evangelism/listing/', views.EvangelismListing.as_view(), name="evangelism-listing"),
+    path('evangelism/feed/', views.EvangelismFeedView.as_view(), name="evangelism-feed"),
+    path('search/', views.SearchView.as_view(), name="search"),
     path('evangelism/detail/<int:pk>/', views.EvangelismDetail.as_view(), name="evangelism-detail"),
+    path('evangelism/detail/<int:pk>/followups/', views.EvangelismFollowUpsFeed.as_view(), name="evangelism-followups"),
     path("add/followup/", views.AddFollowUp.as_view(), name="add-followup"),
     path("add/evangelism/", views.AddEvangelism.as_view(), name="add-evangelism"),
     path("activities/", views.ActivitiesView.as_view(), name="activities"),
+    path("export/", views.ExportView.as_view(), name="export"),
+    path("stats/cache/", views.CacheStatsView.as_view(), name="cache-stats"),
+    path("stats/metrics/", views.MetricsView.as_view(), name="metrics"),
 ]
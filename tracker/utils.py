@@ -1,13 +1,15 @@
 """Utility helpers for recommendation logic."""
 
+import asyncio
+import datetime
 from dataclasses import dataclass
-from typing import Optional, Iterable
+from typing import Dict, List, Optional, Tuple
 
-from django.db.models import Count, Max
-from django.db.models.functions import Coalesce
+from django.db.models import Case, Count, Q, Value, When
+from django.db.models.functions import TruncMonth
 from django.utils import timezone
 
-from .models import Evangelism
+from .models import DailyActivity, Evangelism, FollowUp
 
 
 # Tunable constants (can later be moved to settings.py)
@@ -47,20 +49,98 @@ class Recommendation:
         return None  # Causes template to show evangelism (new) encouragement
 
 
-def _annotated_evangelisms(evangelist) -> Iterable[Evangelism]:
-    """Return evangelisms with aggregated followup info to avoid N+1 queries."""
-    return (
-        Evangelism.objects.filter(evangelist=evangelist, completed=False)
-        .annotate(
-            followup_count=Count("followups"),
-            last_followup_date=Max("followups__date"),
-        )
-        .annotate(
-            # 'last_touch_date' = last followup date or original evangelism date
-            last_touch_date=Coalesce("last_followup_date", "date"),
+# Reason codes in priority order, with the explanation shown to the user
+REASON_DETAILS = {
+    "overdue_followup": "This person has waited more than the target interval and has not yet reached the followup goal.",
+    "build_cadence": "Continue steady followup cadence toward the target count.",
+    "stagger_recent": "Advancing a recent contact to maintain momentum without waiting full interval.",
+}
+_REASONS = list(REASON_DETAILS)
+
+# What the home page and Today's Plan show of a recommended evangelism; the ranking itself needs no columns
+RECOMMENDATION_FIELDS = ("pk", "person_name", "location", "faith", "followup_count", "last_touch_date")
+
+
+def _recommendation_querysets(evangelist, today):
+    """The overdue and the waited (cadence or stagger) candidates, each ordered best first.
+
+    Every row carries its ``category`` (0 = overdue, 1 = cadence, 2 = stagger).
+    A contact's category depends on the days since it was last touched, which
+    is a range of last_touch_date; within a category the ORDER BY applies the
+    tie-break rules described in recommend_activity, ending with pk for stable
+    ties. The overdue query, which usually fills the queue on its own, walks
+    evangelism_recommend_idx in order; the waited one sorts the few days'
+    worth of contacts in its window. Only RECOMMENDATION_FIELDS are loaded.
+    """
+    def days_ago(days):
+        return today - datetime.timedelta(days=days)
+
+    candidates = Evangelism.objects.filter(
+        evangelist=evangelist, completed=False, followup_count__lt=FOLLOWUP_TARGET,
+        last_touch_date__lte=days_ago(MIN_DAYS_BEFORE_SECOND_TOUCH),
+    ).only(*RECOMMENDATION_FIELDS)
+    # Most overdue, highest relevance, fewest followups, newest record
+    overdue = (
+        candidates.filter(last_touch_date__lte=days_ago(FOLLOWUP_INTERVAL_DAYS))
+        .annotate(category=Value(0))
+        .order_by("last_touch_date", "-relevance", "followup_count", "-date", "pk")
+    )
+    # Cadence: fewest followups, highest relevance, oldest record.
+    # Stagger: fewest followups, longest (still recent) wait, highest relevance, oldest record.
+    stagger = Q(last_touch_date__gte=days_ago(RECENT_TOUCH_WINDOW))
+    waited = (
+        candidates.filter(last_touch_date__gt=days_ago(FOLLOWUP_INTERVAL_DAYS))
+        .annotate(category=Case(When(stagger, then=Value(2)), default=Value(1)))
+        .order_by(
+            "category", "followup_count", Case(When(stagger, then="last_touch_date")), "-relevance", "date", "pk"
         )
-        .order_by("date")
     )
+    return [overdue, waited]
+
+
+def _recommendations(evangelisms) -> List[Recommendation]:
+    return [
+        Recommendation(
+            action="followup",
+            evangelism=evangelism,
+            reason=_REASONS[evangelism.category],
+            details=REASON_DETAILS[_REASONS[evangelism.category]],
+        )
+        for evangelism in evangelisms
+    ]
+
+
+def recommend_queue(evangelist=None, k=5, today=None) -> List[Recommendation]:
+    """Return up to ``k`` ranked follow-up recommendations for an evangelist.
+
+    The database does the ranking: overdue contacts come first, then the
+    others, each fetched with ``LIMIT`` set to the places still free, so a
+    queue costs one query when enough contacts are overdue and two otherwise.
+    ``today`` defaults to the local date (TIME_ZONE), the same date the
+    per-user cache is keyed on, so a contact becomes overdue at local midnight.
+    """
+    if evangelist is None or k <= 0:
+        return []
+
+    queue = []
+    for queryset in _recommendation_querysets(evangelist, today or timezone.localdate()):
+        queue += _recommendations(queryset[:k - len(queue)])
+        if len(queue) >= k:
+            break
+    return queue
+
+
+async def arecommend_queue(evangelist=None, k=5, today=None) -> List[Recommendation]:
+    """Async version of recommend_queue."""
+    if evangelist is None or k <= 0:
+        return []
+
+    queue = []
+    for queryset in _recommendation_querysets(evangelist, today or timezone.localdate()):
+        queue += _recommendations([evangelism async for evangelism in queryset[:k - len(queue)]])
+        if len(queue) >= k:
+            break
+    return queue
 
 
 def recommend_activity(evangelist=None):
@@ -77,111 +157,257 @@ def recommend_activity(evangelist=None):
          in daily) we still gently advance the lowest‑progress evangelism that was
          last touched at least MIN_DAYS_BEFORE_SECOND_TOUCH days ago (staggering
          progress) instead of always suggesting only new evangelism.
-     4. If all active evangelisms have reached the followup target OR (after the
-         stagger step) we judge distribution healthy (average followups >= half target)
-         we encourage a new evangelism (returning None keeps existing template
-         behavior).
+     4. If all active evangelisms have reached the followup target OR no follow-up
+         qualifies we encourage a new evangelism (returning None keeps existing
+         template behavior).
+
+     This is the head of recommend_queue(); see _recommendation_querysets for the exact ranking.
     """
-    if evangelist is None:
-        # Without an authenticated user we cannot tailor; encourage evangelism.
+    queue = recommend_queue(evangelist, k=1)
+    if not queue:
+        return None  # Start evangelizing
+    return queue[0].to_context_object()
+
+
+async def arecommend_activity(evangelist=None):
+    """Async version of recommend_activity."""
+    queue = await arecommend_queue(evangelist, k=1)
+    if not queue:
         return None
+    return queue[0].to_context_object()
 
-    today = timezone.now().date()
-    evangelisms = list(_annotated_evangelisms(evangelist))
 
-    if not evangelisms:
-        return None  # Start evangelizing
+def _activity_counts_query(evangelist, start, end):
+    return DailyActivity.objects.filter(evangelist=evangelist, date__range=(start, end)).values_list(
+        "date", "evangelisms", "followups"
+    )
 
-    # Build priority lists
-    overdue_candidates = []
-    cadence_candidates = []
-    fresh_recent_candidates = []  # NEW: within RECENT_TOUCH_WINDOW but eligible to gently stagger
-
-    total_followups = 0
-    for e in evangelisms:
-        followup_count = getattr(e, "followup_count", 0) or 0
-        total_followups += followup_count
-        last_touch = getattr(e, "last_touch_date", e.date)
-        days_since_last_touch = (today - last_touch).days
-
-        # Skip recommending followups for evangelisms already at or above target
-        if followup_count >= FOLLOWUP_TARGET:
-            continue
-
-        # Determine categories
-        if days_since_last_touch >= FOLLOWUP_INTERVAL_DAYS:
-            overdue_candidates.append((e, days_since_last_touch, followup_count))
-        elif (
-            days_since_last_touch >= MIN_DAYS_BEFORE_SECOND_TOUCH
-            and days_since_last_touch > RECENT_TOUCH_WINDOW
-        ):
-            cadence_candidates.append((e, days_since_last_touch, followup_count))
-        elif days_since_last_touch >= MIN_DAYS_BEFORE_SECOND_TOUCH:
-            # Inside RECENT_TOUCH_WINDOW: keep as possible stagger candidate (not touched today)
-            fresh_recent_candidates.append((e, days_since_last_touch, followup_count))
-
-    # 1. Overdue priority: sort by (days overdue desc, relevance desc, followup_count asc, oldest evangelism first)
-    if overdue_candidates:
-        overdue_candidates.sort(
-            key=lambda t: (
-                t[1],                    # days since last touch (larger first after reverse)
-                t[0].relevance,          # higher relevance first
-                -t[2],                   # fewer followups first => invert sign later or adjust ordering
-                t[0].date.toordinal(),
-            ),
-            reverse=True,
-        )
-        chosen = overdue_candidates[0][0]
-        return Recommendation(
-            action="followup",
-            evangelism=chosen,
-            reason="overdue_followup",
-            details="This person has waited more than the target interval and has not yet reached the followup goal.",
-        ).to_context_object()
-
-    # 2. Cadence maintenance: choose the one with fewest followups, then highest relevance, then oldest
-    if cadence_candidates:
-        cadence_candidates.sort(
-            key=lambda t: (
-                t[2],             # followup_count (want smallest)
-                -t[0].relevance,  # relevance high first -> negate
-                t[0].date.toordinal(),
-            )
-        )
-        chosen = cadence_candidates[0][0]
-        return Recommendation(
-            action="followup",
-            evangelism=chosen,
-            reason="build_cadence",
-            details="Continue steady followup cadence toward the target count.",
-        ).to_context_object()
-
-    # 3. Stagger within recent window: if no other candidates, pick lowest progress
-    #    even though last touch is still "recent" (>=1 day but <= RECENT_TOUCH_WINDOW)
-    if fresh_recent_candidates:
-        # Sort: fewest followups, then older (larger days_since_last_touch), then higher relevance, then oldest creation
-        fresh_recent_candidates.sort(
-            key=lambda t: (
-                t[2],              # fewest followups first
-                -t[1],             # larger days_since_last_touch next
-                -t[0].relevance,   # higher relevance
-                t[0].date.toordinal(),
-            )
-        )
-        chosen = fresh_recent_candidates[0][0]
-        return Recommendation(
-            action="followup",
-            evangelism=chosen,
-            reason="stagger_recent",
-            details="Advancing a recent contact to maintain momentum without waiting full interval.",
-        ).to_context_object()
-
-    # 4. Encourage new evangelism if distribution already healthy (avg >= half target)
-    #    or nothing else to recommend.
-    avg_followups = total_followups / len(evangelisms) if evangelisms else 0
-    if avg_followups >= FOLLOWUP_TARGET / 2:
-        return None
 
-    return None
+def _activity_counts(rows) -> Dict[datetime.date, dict]:
+    return {date: {"evangelisms": evangelisms, "followups": followups} for date, evangelisms, followups in rows}
+
+
+def activity_counts_by_day(evangelist, start: datetime.date, end: datetime.date) -> Dict[datetime.date, dict]:
+    """Return per-day evangelism / follow-up counts between start and end (inclusive).
+
+    Read from the DailyActivity rollup: one indexed range scan over at most
+    one row per day, however many evangelisms and follow-ups those days hold.
+    Days without activity are absent from the result.
+    """
+    return _activity_counts(_activity_counts_query(evangelist, start, end))
+
+
+async def aactivity_counts_by_day(evangelist, start: datetime.date, end: datetime.date) -> Dict[datetime.date, dict]:
+    """Async version of activity_counts_by_day."""
+    return _activity_counts([row async for row in _activity_counts_query(evangelist, start, end)])
+
+
+def _year_heatmap(year, activity) -> dict:
+    first, last = datetime.date(year, 1, 1), datetime.date(year, 12, 31)
+    busiest = max((c["evangelisms"] + c["followups"] for c in activity.values()), default=0)
+    # Columns are weeks (Monday first); days outside the year are None
+    weeks, week = [], [None] * first.weekday()
+    for offset in range((last - first).days + 1):
+        day = first + datetime.timedelta(days=offset)
+        counts = activity.get(day, {"evangelisms": 0, "followups": 0})
+        total = counts["evangelisms"] + counts["followups"]
+        week.append({
+            "date": day,
+            "evangelisms": counts["evangelisms"],
+            "followups": counts["followups"],
+            "total": total,
+            # 0 = idle, 1..4 = share of the busiest day this year (for shading)
+            "level": -(-total * 4 // busiest) if busiest else 0,
+        })
+        if len(week) == 7:
+            weeks.append(week)
+            week = []
+    if week:
+        weeks.append(week + [None] * (7 - len(week)))
+    return {
+        "year": year,
+        "weeks": weeks,
+        "active_days": len(activity),
+        "evangelisms": sum(c["evangelisms"] for c in activity.values()),
+        "followups": sum(c["followups"] for c in activity.values()),
+        "busiest": busiest,
+    }
+
+
+def year_heatmap(evangelist, year: int) -> dict:
+    """Return a year of daily activity laid out as a heatmap, from one rollup query.
+
+    Keys: year, weeks (a list of Monday-first weeks, each seven cells that are
+    None outside the year or a dict with date, evangelisms, followups, total
+    and level, 0 for idle and 1..4 relative to the busiest day), active_days,
+    evangelisms, followups and busiest.
+    """
+    start, end = datetime.date(year, 1, 1), datetime.date(year, 12, 31)
+    return _year_heatmap(year, activity_counts_by_day(evangelist, start, end))
+
 
+async def ayear_heatmap(evangelist, year: int) -> dict:
+    """Async version of year_heatmap."""
+    start, end = datetime.date(year, 1, 1), datetime.date(year, 12, 31)
+    return _year_heatmap(year, await aactivity_counts_by_day(evangelist, start, end))
 
+
+def _active_dates_query(evangelist, today):
+    # Covered by the (evangelist, date) unique index: the table itself is never read
+    return DailyActivity.objects.filter(evangelist=evangelist, date__lte=today).order_by("date").values_list(
+        "date", flat=True
+    )
+
+
+def _streaks(dates, today) -> dict:
+    longest = run = 0
+    previous = None
+    for date in dates:
+        run = run + 1 if previous is not None and (date - previous).days == 1 else 1
+        longest = max(longest, run)
+        previous = date
+    # A streak is still alive until a whole day has passed without activity
+    current = run if previous is not None and (today - previous).days <= 1 else 0
+    return {"current": current, "longest": longest, "last_active": previous}
+
+
+def activity_streaks(evangelist, today: Optional[datetime.date] = None) -> dict:
+    """Return the current and longest runs of consecutive active days.
+
+    The current streak counts up to today, or up to yesterday while today has
+    no activity yet. Keys: current, longest and last_active (a date or None).
+    One query over the rollup's dates.
+    """
+    today = today or timezone.localdate()
+    return _streaks(_active_dates_query(evangelist, today), today)
+
+
+async def aactivity_streaks(evangelist, today: Optional[datetime.date] = None) -> dict:
+    """Async version of activity_streaks."""
+    today = today or timezone.localdate()
+    return _streaks([date async for date in _active_dates_query(evangelist, today)], today)
+
+
+def _dashboard_aggregates(today) -> dict:
+    week_start = today - datetime.timedelta(days=today.weekday())
+    month_start = today.replace(day=1)
+    faiths = {f"faith_{key}": Count("pk", distinct=True, filter=Q(faith=key)) for key in Evangelism.FAITH_STATUS}
+    return dict(
+        total_evangelism=Count("pk", distinct=True),
+        active_evangelism=Count("pk", distinct=True, filter=Q(completed=False)),
+        total_followup=Count("followups"),
+        followups_this_week=Count("followups", filter=Q(followups__date__range=(week_start, today))),
+        followups_this_month=Count("followups", filter=Q(followups__date__range=(month_start, today))),
+        **faiths,
+    )
+
+
+def _dashboard_totals(totals) -> dict:
+    totals["completed_evangelism"] = totals["total_evangelism"] - totals["active_evangelism"]
+    totals["faith_counts"] = [
+        (key, label, totals.pop(f"faith_{key}")) for key, label in Evangelism.FAITH_STATUS.items()
+    ]
+    return totals
+
+
+def dashboard_stats(evangelist, today: Optional[datetime.date] = None) -> dict:
+    """Return every home dashboard counter for an evangelist in one aggregate query.
+
+    Evangelisms are LEFT JOINed to their follow-ups, so evangelism counts are
+    distinct and follow-up counts are filtered by date. Keys: total_evangelism,
+    active_evangelism, completed_evangelism, total_followup, followups_this_week
+    (since Monday), followups_this_month and faith_counts, a list of
+    (faith key, label, count) in Evangelism.FAITH_STATUS order.
+    """
+    aggregates = _dashboard_aggregates(today or timezone.localdate())
+    return _dashboard_totals(Evangelism.objects.filter(evangelist=evangelist).aggregate(**aggregates))
+
+
+async def adashboard_stats(evangelist, today: Optional[datetime.date] = None) -> dict:
+    """Async version of dashboard_stats."""
+    aggregates = _dashboard_aggregates(today or timezone.localdate())
+    return _dashboard_totals(await Evangelism.objects.filter(evangelist=evangelist).aaggregate(**aggregates))
+
+
+def _activities_querysets(evangelist, start, end):
+    evangelisms = (
+        Evangelism.objects.filter(evangelist=evangelist, date__range=(start, end))
+        .only("pk", "person_name", "faith", "completed", "date")
+        .order_by("date", "pk")
+    )
+    followups = (
+        FollowUp.objects.filter(evangelism__evangelist=evangelist, date__range=(start, end))
+        .select_related("evangelism")
+        .only("pk", "description", "date", "evangelism__person_name", "evangelism__completed")
+        .order_by("date", "pk")
+    )
+    return evangelisms, followups
+
+
+def _group_activities(evangelisms, followups) -> Dict[datetime.date, dict]:
+    days: Dict[datetime.date, dict] = {}
+    for evangelism in evangelisms:
+        days.setdefault(evangelism.date, {"evangelisms": [], "followups": []})["evangelisms"].append(evangelism)
+    for followup in followups:
+        days.setdefault(followup.date, {"evangelisms": [], "followups": []})["followups"].append(followup)
+    return days
+
+
+def activities_by_day(evangelist, start: datetime.date, end: datetime.date) -> Dict[datetime.date, dict]:
+    """Return the evangelisms and follow-ups logged each day between start and end (inclusive).
+
+    Two queries for the whole range; follow-ups come with their evangelism
+    joined in. Values are {"evangelisms": [...], "followups": [...]} and days
+    without activity are absent.
+    """
+    return _group_activities(*_activities_querysets(evangelist, start, end))
+
+
+async def aactivities_by_day(evangelist, start: datetime.date, end: datetime.date) -> Dict[datetime.date, dict]:
+    """Async version of activities_by_day; the two queries are awaited together."""
+    evangelisms, followups = _activities_querysets(evangelist, start, end)
+    return _group_activities(*await asyncio.gather(_alist(evangelisms), _alist(followups)))
+
+
+async def _alist(queryset) -> list:
+    return [obj async for obj in queryset]
+
+
+def encode_cursor(obj) -> str:
+    """Cursor pointing just past ``obj`` (an evangelism or follow-up) in newest-first (date, pk) order."""
+    return f"{obj.date.isoformat()}_{obj.pk}"
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime.date, int]:
+    """Parse a cursor made by encode_cursor; raises ValueError when it is malformed."""
+    date, _, pk = cursor.partition("_")
+    return datetime.date.fromisoformat(date), int(pk)
+
+
+def keyset_page(queryset, size: int, cursor: Optional[str] = None):
+    """Return (rows, next_cursor) for one newest-first page of an Evangelism or FollowUp ``queryset``.
+
+    Pages are keyed on (date, pk) instead of OFFSET, so a deep page reads the
+    same few index entries as the first one. ``next_cursor`` is None on the
+    last page.
+    """
+    queryset = queryset.order_by("-date", "-pk")
+    if cursor:
+        date, pk = decode_cursor(cursor)
+        # date__lte bounds the index range; the OR breaks ties within a day
+        queryset = queryset.filter(Q(date__lte=date) & (Q(date__lt=date) | Q(pk__lt=pk)))
+    page = list(queryset[:size + 1])
+    if len(page) > size:
+        return page[:size], encode_cursor(page[size - 1])
+    return page, None
+
+
+def followups_by_month(evangelism) -> List[dict]:
+    """Return [{"month": date, "count": n}, ...] for an evangelism's follow-ups, oldest month first."""
+    return list(
+        FollowUp.objects.filter(evangelism=evangelism)
+        .annotate(month=TruncMonth("date"))
+        .order_by("month")
+        .values("month")
+        .annotate(count=Count("id"))
+    )
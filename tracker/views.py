@@ -1,40 +1,90 @@
-from django.shortcuts import render, redirect
-from django.http.response import JsonResponse
-from django.views.generic import CreateView, ListView, TemplateView, DetailView, View
-from django.contrib.auth.mixins import LoginRequiredMixin
+from django.shortcuts import get_object_or_404, render, redirect
+from django.template.loader import render_to_string
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404
+from django.http.response import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.views.generic import CreateView, TemplateView, DetailView, View
+from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.urls import reverse, reverse_lazy
-from datetime import datetime
-from calendar import monthrange
-from .utils import recommend_activity
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.http import http_date
+from django.utils import timezone
+from asyncio import gather
+from datetime import MAXYEAR, MINYEAR, datetime
+from calendar import month_abbr, monthrange
+from .utils import arecommend_activity, recommend_queue, aactivity_counts_by_day, aactivity_streaks, ayear_heatmap, aactivities_by_day, adashboard_stats, followups_by_month, keyset_page, FOLLOWUP_TARGET
 from .models import Evangelism, FollowUp
-from .forms import EvangelismForm, FollowUpForm
-from django.db.models import Count
+from .forms import EvangelismFilterForm, EvangelismForm, FollowUpForm
+from .cache import acached_for_user, adata_validators, cache_stats
+from .metrics import render_prometheus
+from .exporter import FORMATS as EXPORT_FORMATS, astream_export, stream_export
+from . import search
 
 
 
 
-class HomeView(LoginRequiredMixin, TemplateView):
+class AsyncLoginRequiredMixin(LoginRequiredMixin):
+    """LoginRequiredMixin for views whose handlers are coroutines.
+
+    The user is loaded with request.auser() and stored on request.user, so
+    handlers and templates never trigger the lazy (synchronous) user lookup.
+    """
+
+    async def dispatch(self, request, *args, **kwargs):
+        request.user = await request.auser()
+        if not request.user.is_authenticated:
+            return self.handle_no_permission()
+        return await super(LoginRequiredMixin, self).dispatch(request, *args, **kwargs)
+
+
+class HomeView(AsyncLoginRequiredMixin, TemplateView):
+    replica_reads = True  # see tracker.routers
     template_name = "tracker/home.html"
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        user = self.request.user
-    
-        context["followup"] = recommend_activity(evangelist=user)
+    async def get(self, request, *args, **kwargs):
+        context = self.get_context_data(**kwargs)
+        user = request.user
 
-        context["total_evangelism"] = Evangelism.objects.filter(evangelist=user).count()
-        context["total_followup"] = FollowUp.objects.filter(evangelism__evangelist=user).count()
-        return context
+        async def dashboard():
+            followup, stats = await gather(arecommend_activity(evangelist=user), adashboard_stats(user))
+            return {"followup": followup, **stats}
+
+        # Only changes when the user's data changes or the date rolls over (see tracker.cache)
+        context.update(await acached_for_user(user, "dashboard", dashboard))
+        return self.render_to_response(context)
     
 
 
 
-class CalendarView(LoginRequiredMixin, TemplateView):
-    template_name = 'tracker/calendar.html'
+class TodayPlanView(LoginRequiredMixin, TemplateView):
+    replica_reads = True
+    template_name = "tracker/today_plan.html"
+    default_size = 10
+    max_size = 50
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        
+        try:
+            size = int(self.request.GET.get("k", self.default_size))
+        except ValueError:
+            size = self.default_size
+        size = min(max(size, 1), self.max_size)
+
+        context["plan"] = recommend_queue(evangelist=self.request.user, k=size)
+        context["followup_target"] = FOLLOWUP_TARGET
+        return context
+
+
+
+
+class CalendarView(AsyncLoginRequiredMixin, TemplateView):
+    replica_reads = True
+    template_name = 'tracker/calendar.html'
+
+    async def get(self, request, *args, **kwargs):
         # Get year and month from URL parameters or use current date
         year = kwargs.get('year')
         month = kwargs.get('month')
@@ -47,6 +97,17 @@ class CalendarView(LoginRequiredMixin, TemplateView):
             year = int(year)
             month = int(month)
 
+        # Activity for the whole month comes from one grouped query
+        num_days = monthrange(year, month)[1]
+        first_date = datetime(year, month, 1).date()
+        last_date = datetime(year, month, num_days).date()
+        activity = await aactivity_counts_by_day(request.user, first_date, last_date)
+
+        context = self.get_context_data(**kwargs)
+        context.update(self.get_month_context(year, month, activity))
+        return self.render_to_response(context)
+
+    def get_month_context(self, year, month, activity):
         # Number of days in the current month
         num_days = monthrange(year, month)[1]
 
@@ -56,18 +117,22 @@ class CalendarView(LoginRequiredMixin, TemplateView):
         # Placeholder for empty slots in the calendar
         placeholders = list(range(first_day_of_week))
 
-        # Calendar days
+        busiest = max((c["evangelisms"] + c["followups"] for c in activity.values()), default=0)
+
         calendar_days = []
         for day in range(1, num_days + 1):
             date = datetime(year, month, day)
-            if Evangelism.objects.filter(date=date, evangelist=self.request.user).exists() or FollowUp.objects.filter(date=date, evangelism__evangelist=self.request.user).exists():
-                has_activity = True
-            else:
-                has_activity = False
+            counts = activity.get(date.date(), {"evangelisms": 0, "followups": 0})
+            activity_count = counts["evangelisms"] + counts["followups"]
             calendar_days.append({
                 'day': day,
                 'date': date.strftime('%Y-%m-%d'),
-                'has_activity': has_activity
+                'has_activity': activity_count > 0,
+                'evangelism_count': counts["evangelisms"],
+                'followup_count': counts["followups"],
+                'activity_count': activity_count,
+                # 0 = idle, 1..4 = share of the busiest day this month (for shading)
+                'intensity': -(-activity_count * 4 // busiest) if busiest else 0,
             })
 
         # Calculate previous and next months
@@ -77,7 +142,7 @@ class CalendarView(LoginRequiredMixin, TemplateView):
         next_month = (month + 1) if month < 12 else 1
         next_year = year if month < 12 else year + 1
 
-        context.update({
+        return {
             'month': datetime(year, month, 1).strftime('%B'),
             'year': year,
             'calendar_days': calendar_days,
@@ -85,26 +150,106 @@ class CalendarView(LoginRequiredMixin, TemplateView):
             'prev_month': prev_month,
             'prev_year': prev_year,
             'next_month': next_month,
-            'next_year': next_year
+            'next_year': next_year,
+            'first_date': datetime(year, month, 1).date().isoformat(),
+            'last_date': datetime(year, month, num_days).date().isoformat(),
+        }
+
+
+class YearHeatmapView(AsyncLoginRequiredMixin, TemplateView):
+    """A year of activity as a heatmap, with the current and longest streaks.
+
+    Both read only the DailyActivity rollup: one query for the year's days,
+    one for the dates the streaks are counted from.
+    """
+    replica_reads = True
+    template_name = 'tracker/year_heatmap.html'
+
+    async def get(self, request, *args, **kwargs):
+        today = timezone.localdate()
+        year = kwargs.get('year')
+        if year is None:
+            year = today.year
+        if not MINYEAR <= year <= MAXYEAR:
+            raise Http404("Year out of range")
+        heatmap, streaks = await gather(ayear_heatmap(request.user, year), aactivity_streaks(request.user, today))
+        context = self.get_context_data(**kwargs)
+        context.update(
+            heatmap=heatmap, streaks=streaks, today=today,
+            prev_year=year - 1 if year > MINYEAR else None,
+            next_year=year + 1 if year < MAXYEAR else None,
+            months=[{'number': number, 'name': month_abbr[number]} for number in range(1, 13)],
+        )
+        return self.render_to_response(context)
+
+
+
+
+
+class EvangelismPageMixin:
+    """Keyset-paginated, filtered evangelisms of the current user (see utils.keyset_page)."""
+    page_size = 20
+
+    def get_filter_form(self):
+        return EvangelismFilterForm(self.request.GET)
+
+    def get_page(self, form):
+        queryset = form.filter(Evangelism.objects.filter(evangelist=self.request.user))
+        return keyset_page(queryset, self.page_size, form.cleaned_data.get("cursor"))
+
+
+class EvangelismListing(LoginRequiredMixin, EvangelismPageMixin, TemplateView):
+    replica_reads = True
+    template_name = "tracker/evangelism_list.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        form = self.get_filter_form()
+        evangelisms, next_cursor = self.get_page(form)
+
+        query = self.request.GET.copy()
+        query.pop("cursor", None)
+        context.update({
+            "evangelisms": evangelisms,
+            "next_cursor": next_cursor,
+            "filter_form": form,
+            "filter_query": query.urlencode(),
         })
         return context
 
 
+class EvangelismFeedView(LoginRequiredMixin, EvangelismPageMixin, View):
+    """Next page of the listing as an HTML fragment, for infinite scroll."""
+    replica_reads = True
 
+    def get(self, request, *args, **kwargs):
+        form = self.get_filter_form()
+        if not form.is_valid():
+            return JsonResponse({"errors": form.errors}, status=400)
+        evangelisms, next_cursor = self.get_page(form)
+        return JsonResponse({
+            "html": render_to_string(
+                "tracker/partials/evangelism_cards.html", {"evangelisms": evangelisms}, request=request
+            ),
+            "count": len(evangelisms),
+            "next_cursor": next_cursor,
+        })
 
 
-class EvangelismListing(LoginRequiredMixin, ListView):
-    template_name = "tracker/evangelism_listing.html"
-    context_object_name = "evangelisms"
 
-    def get_queryset(self):
-        # Annotate with number of followups for display in listing
-        return (
-            Evangelism.objects.filter(evangelist=self.request.user)
-            .annotate(followup_count=Count("followups"))
-            .order_by("-date")
-        )
-    
+
+class SearchView(LoginRequiredMixin, TemplateView):
+    """Typo-tolerant, ranked search over the user's evangelisms (see tracker.search)."""
+    template_name = "tracker/search.html"
+    max_results = 30
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        query = self.request.GET.get("q", "").strip()[:200]
+        context["query"] = query
+        context["evangelisms"] = search.search(self.request.user, query, limit=self.max_results) if query else []
+        return context
+
 
 
 
@@ -136,39 +281,172 @@ class AddFollowUp(LoginRequiredMixin, CreateView):
 
 
 
-class EvangelismDetail(LoginRequiredMixin, DetailView):
+class FollowUpPageMixin:
+    """Newest-first, keyset-paginated follow-ups of one evangelism (see utils.keyset_page)."""
+    followup_page_size = 10
+
+    def get_followup_page(self, evangelism, cursor=None):
+        followups = FollowUp.objects.filter(evangelism=evangelism)
+        return keyset_page(followups, self.followup_page_size, cursor)
+
+
+class EvangelismDetail(LoginRequiredMixin, FollowUpPageMixin, DetailView):
+    replica_reads = True
     model = Evangelism
     template_name = "tracker/evangelism_detail.html"
     context_object_name = "evangelism"
 
+    def get_queryset(self):
+        # Someone else's evangelism is a 404, not a page
+        return Evangelism.objects.filter(evangelist=self.request.user)
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context["followups"] = FollowUp.objects.filter(evangelism=self.object)
+        cursor = self.request.GET.get("cursor")
+        try:
+            followups, next_cursor = self.get_followup_page(self.object, cursor)
+        except ValueError:  # malformed cursor: start from the newest
+            followups, next_cursor = self.get_followup_page(self.object)
+        months = followups_by_month(self.object)
+        context.update({
+            "followups": followups,
+            "next_cursor": next_cursor,
+            "followup_months": months,
+            "busiest_month": max((month["count"] for month in months), default=0),
+        })
         return context
-    
-    
-    
 
-class ActivitiesView(LoginRequiredMixin, View):
-    def get(self, request, *args, **kwargs):
+
+class EvangelismFollowUpsFeed(LoginRequiredMixin, FollowUpPageMixin, View):
+    """Older follow-ups of an evangelism as an HTML fragment, for "load older"."""
+    replica_reads = True
+
+    def get(self, request, pk, *args, **kwargs):
+        evangelism = get_object_or_404(Evangelism, pk=pk, evangelist=request.user)
+        try:
+            followups, next_cursor = self.get_followup_page(evangelism, request.GET.get("cursor"))
+        except ValueError:
+            return JsonResponse({"error": "Invalid cursor."}, status=400)
+        return JsonResponse({
+            "html": render_to_string(
+                "tracker/partials/followup_items.html", {"followups": followups}, request=request
+            ),
+            "count": len(followups),
+            "next_cursor": next_cursor,
+        })
+
+
+
+
+# Browsers revalidate on every use and get a 304 until the user's data changes (see tracker.cache)
+@method_decorator(cache_control(private=True, no_cache=True), name="get")
+class ActivitiesView(AsyncLoginRequiredMixin, View):
+    """Activities of one day (?date=) or, grouped by date, of a range (?start=&end=)."""
+    replica_reads = True
+    max_range_days = 62
+
+    async def get(self, request, *args, **kwargs):
+        # The condition() decorator would read the data version synchronously,
+        # so the conditional GET is answered here instead
+        etag, last_modified = await adata_validators(request.user.pk, request.GET.urlencode())
+        etag, last_modified = quote_etag(etag), int(last_modified.timestamp())
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = await self.get_activities(request)
+        response.headers.setdefault("ETag", etag)
+        response.headers.setdefault("Last-Modified", http_date(last_modified))
+        return response
+
+    async def get_activities(self, request):
         date = request.GET.get("date")
+        start = request.GET.get("start", date)
+        end = request.GET.get("end", date)
+        if not start or not end:
+            return JsonResponse({"evangelisms": [], "followups": []})
+
+        try:
+            start = datetime.strptime(start, "%Y-%m-%d").date()
+            end = datetime.strptime(end, "%Y-%m-%d").date()
+        except ValueError:
+            return JsonResponse({"error": "Dates must be in YYYY-MM-DD format."}, status=400)
+        if not 0 <= (end - start).days < self.max_range_days:
+            return JsonResponse(
+                {"error": f"end must be on or after start and at most {self.max_range_days} days later."},
+                status=400,
+            )
+
+        days = {
+            day.isoformat(): {
+                "evangelisms": [self.serialize_evangelism(e) for e in activity["evangelisms"]],
+                "followups": [self.serialize_followup(f) for f in activity["followups"]],
+            }
+            for day, activity in (await aactivities_by_day(request.user, start, end)).items()
+        }
         if date:
-            evangelisms = [
-                {
-                    "person_name": e.person_name,
-                    "faith": e.faith,
-                    "detail_link": reverse("evangelism-detail", args=[e.pk])
-                }
-                for e in Evangelism.objects.filter(date=date, evangelist=request.user)
-            ]
-
-            followups = list(FollowUp.objects.filter(date=date, evangelism__evangelist=request.user).values(
-                "evangelism__person_name", "description"
-            ))
-
-            return JsonResponse({
-                "evangelisms": evangelisms,
-                "followups": followups
-            })
-        
-        return JsonResponse({"evangelisms": [], "followups": []})
\ No newline at end of file
+            return JsonResponse(days.get(start.isoformat(), {"evangelisms": [], "followups": []}))
+        return JsonResponse({"start": start.isoformat(), "end": end.isoformat(), "days": days})
+
+    @staticmethod
+    def serialize_evangelism(evangelism):
+        return {
+            "person_name": evangelism.person_name,
+            "faith": evangelism.faith,
+            "completed": evangelism.completed,
+            "detail_link": reverse("evangelism-detail", args=[evangelism.pk]),
+        }
+
+    @staticmethod
+    def serialize_followup(followup):
+        return {
+            "evangelism__person_name": followup.evangelism.person_name,
+            "description": followup.description,
+            "completed": followup.evangelism.completed,
+            "detail_link": reverse("evangelism-detail", args=[followup.evangelism_id]),
+        }
+
+
+
+class ExportView(LoginRequiredMixin, View):
+    """Download all of the user's evangelisms and follow-ups (?format=csv|jsonl, ?gzip=1), streamed."""
+    content_types = {"csv": "text/csv; charset=utf-8", "jsonl": "application/x-ndjson; charset=utf-8"}
+
+    def get(self, request, *args, **kwargs):
+        format = request.GET.get("format", "csv")
+        if format not in EXPORT_FORMATS:
+            return JsonResponse({"error": f"format must be one of {', '.join(EXPORT_FORMATS)}."}, status=400)
+        compress = request.GET.get("gzip") in ("1", "true")
+
+        # Each handler needs its own kind of iterator, or it buffers the whole export first
+        stream = astream_export if isinstance(request, ASGIRequest) else stream_export
+        filename = f"followup-buddy-{request.user.get_username()}-{datetime.now():%Y-%m-%d}.{format}"
+        response = StreamingHttpResponse(
+            stream(request.user, format, compress),
+            content_type="application/gzip" if compress else self.content_types[format],
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}{".gz" if compress else ""}"'
+        response["Cache-Control"] = "private, no-store"
+        return response
+
+
+
+class CacheStatsView(LoginRequiredMixin, UserPassesTestMixin, View):
+    """Recommendation cache hit/miss counters for the serving process (staff only)."""
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request, *args, **kwargs):
+        return JsonResponse(cache_stats())
+
+
+class MetricsView(LoginRequiredMixin, UserPassesTestMixin, View):
+    """Per-view request metrics of the serving process in Prometheus text format (staff only)."""
+
+    def test_func(self):
+        return self.request.user.is_staff
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponse(
+            render_prometheus(sample_rate=settings.PERFORMANCE_SAMPLE_RATE),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
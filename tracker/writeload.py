@@ -0,0 +1,105 @@
+"""Concurrent write benchmark: many workers adding follow-ups at once.
+
+Each worker is a separate process with its own database connection, like a
+gunicorn worker, logged in as the same evangelist and posting the
+AddFollowUp form through the Django test client for ``duration`` seconds.
+``run_writes`` reports the writes per second, latency percentiles and how
+many writes failed, counting "database is locked" errors separately: that is
+what SQLite's default (rollback journal, deferred transactions) settings
+produce under concurrent writers and what the WAL/IMMEDIATE OPTIONS in
+settings avoid. The result has the keys of tracker.loadtest.run_load, so
+``loadtest.compare`` reads it too.
+
+Workers are forked, so this needs a platform with ``fork`` (Linux, macOS).
+"""
+
+import multiprocessing
+import time
+
+from django.db import OperationalError, connections
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from .loadtest import percentile
+from .models import Evangelism
+
+
+def _worker(user_id, evangelism_ids, offset, deadline, results):
+    # A forked child must not reuse the parent's connection; Django opens its own on first use
+    for connection in connections.all(initialized_only=True):
+        connection.close()
+
+    from django.contrib.auth import get_user_model
+
+    client = Client()
+    client.force_login(get_user_model().objects.get(pk=user_id))
+    url = reverse("add-followup")
+    today = timezone.localdate().isoformat()
+    latencies, errors, locked = [], 0, 0
+    i = offset
+    while time.perf_counter() < deadline:
+        data = {"evangelism": evangelism_ids[i % len(evangelism_ids)], "date": today,
+                "description": f"Benchmark write {i}"}
+        i += 1
+        started = time.perf_counter()
+        try:
+            response = client.post(url, data)
+        except OperationalError as e:
+            errors += 1
+            locked += "locked" in str(e)
+            continue
+        latencies.append(time.perf_counter() - started)
+        if response.status_code != 302:
+            errors += 1
+    connections.close_all()
+    results.put((latencies, errors, locked))
+
+
+def run_writes(user, concurrency=4, duration=10.0):
+    """Run ``concurrency`` processes adding follow-ups to ``user``'s evangelisms for ``duration`` seconds.
+
+    Returns a dict with the number of successful writes, errors (of which
+    ``locked`` were "database is locked"), writes per second and p50/p90/p99/max
+    latency in milliseconds.
+    """
+    evangelism_ids = list(Evangelism.objects.filter(evangelist=user).order_by("pk").values_list("pk", flat=True))
+    if not evangelism_ids:
+        raise ValueError(f"{user} has no evangelisms to add follow-ups to")
+
+    # Children get copies of the open connections (and connection pools) otherwise
+    connections.close_all()
+    for connection in connections.all(initialized_only=True):
+        if hasattr(connection, "close_pool"):
+            connection.close_pool()
+
+    context = multiprocessing.get_context("fork")
+    results = context.Queue()
+    started = time.perf_counter()
+    workers = [
+        context.Process(target=_worker, args=(user.pk, evangelism_ids, offset, started + duration, results))
+        for offset in range(concurrency)
+    ]
+    for worker in workers:
+        worker.start()
+    outcomes = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for worker_latencies, _, _ in outcomes for latency in worker_latencies)
+
+    def ms(value):
+        return round(value * 1000, 2) if value is not None else None
+
+    return {
+        "requests": len(latencies),
+        "errors": sum(errors for _, errors, _ in outcomes),
+        "locked": sum(locked for _, _, locked in outcomes),
+        "duration": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": ms(percentile(latencies, 0.50)),
+        "p90_ms": ms(percentile(latencies, 0.90)),
+        "p99_ms": ms(percentile(latencies, 0.99)),
+        "max_ms": ms(latencies[-1] if latencies else None),
+    }
@@ -0,0 +1,59 @@
+"""An authentication backend that caches the logged-in user between requests.
+
+ModelBackend fetches the user from the database on every authenticated
+request. ``CachedModelBackend`` keeps it in the default cache for
+USER_CACHE_TIMEOUT seconds instead; saving or deleting a user drops the entry
+(see signals.py), so password, profile and is_active changes take effect on
+the next request. The only writes it misses are QuerySet.update() calls on
+users, which last at most the timeout.
+
+Dropping the entry only helps if every worker reads the same cache. With the
+per-process locmem cache the other workers would keep authenticating the old
+user until the timeout, so there the backend behaves exactly like
+ModelBackend.
+"""
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+
+
+USER_KEY = "user:auth:{user_id}"
+
+
+def user_cache_key(user_id):
+    return USER_KEY.format(user_id=user_id)
+
+
+def _timeout():
+    return getattr(settings, "USER_CACHE_TIMEOUT", 300)
+
+
+def cache_is_shared() -> bool:
+    """Whether the default cache is seen by every worker (anything but locmem)."""
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], LocMemCache)
+
+
+class CachedModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        if not cache_is_shared():
+            return super().get_user(user_id)
+        user = cache.get(user_cache_key(user_id))
+        if user is None:
+            user = super().get_user(user_id)
+            if user is None:
+                return None
+            cache.set(user_cache_key(user_id), user, _timeout())
+        return user if self.user_can_authenticate(user) else None
+
+    async def aget_user(self, user_id):
+        if not cache_is_shared():
+            return await super().aget_user(user_id)
+        user = await cache.aget(user_cache_key(user_id))
+        if user is None:
+            user = await super().aget_user(user_id)
+            if user is None:
+                return None
+            await cache.aset(user_cache_key(user_id), user, _timeout())
+        return user if self.user_can_authenticate(user) else None
@@ -1,3 +1,97 @@
-from django.test import TestCase
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache, caches
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from tracker.testing import SHARED_CACHE, NPlusOneTestMixin
+
+from .backends import CachedModelBackend, user_cache_key
+
+
+class UserViewQueryBudgetTests(NPlusOneTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user("evangelist", password="password123")
+
+    def test_pages_need_no_queries(self):
+        for name in ("login", "signup"):
+            with self.subTest(name=name), self.assertQueryBudget(0):
+                self.assertEqual(self.client.get(reverse(name)).status_code, 200)
+
+    def test_login(self):
+        # user lookup, session exists check, session insert and update (each in a savepoint), last_login
+        with self.assertQueryBudget(9):
+            response = self.client.post(reverse("login"), {"username": "evangelist", "password": "password123"})
+        self.assertRedirects(response, reverse("home"), fetch_redirect_response=False)
+
+    def test_signup(self):
+        data = {"username": "new", "email": "new@example.com", "password1": "c0mplex-Pass", "password2": "c0mplex-Pass"}
+        # two username uniqueness checks, insert
+        with self.assertQueryBudget(3):
+            response = self.client.post(reverse("signup"), data)
+        self.assertRedirects(response, reverse("home"), fetch_redirect_response=False)
+
+
+@override_settings(**SHARED_CACHE)
+class CachedModelBackendTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("evangelist", password="password123")
+        self.client.force_login(self.user)
+
+    def auth_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        tables = ('"auth_user"', '"django_session"')
+        return response, [q["sql"] for q in queries if any(table in q["sql"] for table in tables)]
+
+    def test_warm_pages_need_no_auth_queries(self):
+        url = reverse("activities")
+        _, cold = self.auth_queries(url)
+        self.assertEqual(len(cold), 1)  # the user; login already cached the session
+        response, warm = self.auth_queries(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(warm, [])
+
+    def test_sessions_from_the_plain_model_backend_stay_logged_in(self):
+        self.client.force_login(self.user, backend="django.contrib.auth.backends.ModelBackend")
+        self.assertEqual(self.client.get(reverse("activities")).status_code, 200)
+
+    def test_password_change_logs_out_other_sessions(self):
+        self.auth_queries(reverse("activities"))
+        self.user.set_password("n3w-password")
+        self.user.save()
+        response, queries = self.auth_queries(reverse("activities"))
+        self.assertIn('"auth_user"', queries[0])  # fetched again, with the new password hash
+        self.assertEqual(response.status_code, 302)
+
+    def test_deactivated_user_is_logged_out(self):
+        self.auth_queries(reverse("activities"))
+        User.objects.get(pk=self.user.pk).save()  # any save drops the cached copy
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+        self.user.is_active = False
+        self.user.save()
+        self.assertEqual(self.client.get(reverse("activities")).status_code, 302)
+
+    def other_worker_user(self):
+        # Another process: its own cache instance, reading the same storage as this one's
+        with mock.patch("user.backends.cache", caches.create_connection("default")):
+            return CachedModelBackend().get_user(self.user.pk)
+
+    def test_password_change_reaches_other_workers(self):
+        self.assertTrue(self.other_worker_user().check_password("password123"))
+        self.user.set_password("n3w-password")
+        self.user.save()
+        self.assertTrue(self.other_worker_user().check_password("n3w-password"))
+
+    @override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_per_process_cache_is_not_used(self):
+        self.assertTrue(self.other_worker_user().check_password("password123"))
+        self.user.set_password("n3w-password")
+        self.user.save()  # only clears this process's locmem cache
+        self.assertTrue(self.other_worker_user().check_password("n3w-password"))
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))